@@ -7,7 +7,7 @@ orchestrator-to-agent communication via gRPC.
 
 import asyncio
 import json
-from typing import Dict, Any, Optional, AsyncIterator
+from typing import Dict, Any, Optional, AsyncIterator, List
 from datetime import datetime
 import grpc
 from google.protobuf import struct_pb2, any_pb2, timestamp_pb2
@@ -102,7 +102,8 @@ class AgentServiceClient:
                           context: Dict[str, str] = None,
                           dependencies: list = None,
                           priority: int = 3,
-                          deadline: Optional[datetime] = None) -> Dict[str, Any]:
+                          deadline: Optional[datetime] = None,
+                          checkpoint_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute a task on the agent.
         
@@ -114,6 +115,7 @@ class AgentServiceClient:
             dependencies: List of dependent task IDs
             priority: Task priority (1-5)
             deadline: Task deadline
+            checkpoint_data: State from an earlier attempt to resume from
             
         Returns:
             Task execution result
@@ -121,17 +123,8 @@ class AgentServiceClient:
         if not self._connected:
             raise RuntimeError("Not connected to agent service")
         
-        request = agent_pb2.TaskRequest(
-            task_id=task_id,
-            task_type=task_type,
-            payload=dict_to_struct(payload),
-            context=context or {},
-            dependencies=dependencies or [],
-            priority=priority
-        )
-        
-        if deadline:
-            request.deadline.CopyFrom(datetime_to_timestamp(deadline))
+        request = self._build_task_request(task_id, task_type, payload, context,
+                                           dependencies, priority, deadline, checkpoint_data)
         
         try:
             response = await self.stub.ExecuteTask(
@@ -139,15 +132,7 @@ class AgentServiceClient:
                 timeout=self.timeout
             )
             
-            result = {
-                'task_id': response.task_id,
-                'success': response.success,
-                'result': struct_to_dict(response.result) if response.result else {},
-                'error_message': response.error_message,
-                'artifacts': [self._artifact_to_dict(a) for a in response.artifacts],
-                'output_context': dict(response.output_context),
-                'metrics': self._metrics_to_dict(response.metrics) if response.metrics else {}
-            }
+            result = self._task_response_to_dict(response)
             
             if response.success:
                 logger.info("Task executed successfully", 
@@ -167,6 +152,85 @@ class AgentServiceClient:
                         details=e.details())
             raise
     
+    async def execute_task_batch(self,
+                                 tasks: List[Dict[str, Any]],
+                                 timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Execute several tasks on the agent in a single RPC.
+        
+        Args:
+            tasks: Keyword arguments for each task, as accepted by execute_task
+            timeout: RPC timeout (defaults to the client timeout)
+            
+        Returns:
+            One result per task, in the same shape as execute_task; callers
+            should match results by task_id
+        """
+        if not self._connected:
+            raise RuntimeError("Not connected to agent service")
+        
+        request = agent_pb2.TaskBatchRequest(
+            tasks=[self._build_task_request(**task) for task in tasks]
+        )
+        
+        try:
+            response = await self.stub.ExecuteTaskBatch(
+                request,
+                timeout=timeout or self.timeout
+            )
+            
+            results = [self._task_response_to_dict(r) for r in response.responses]
+            logger.info("Task batch executed",
+                       batch_size=len(tasks),
+                       failed=sum(1 for r in results if not r['success']),
+                       endpoint=self.endpoint)
+            return results
+            
+        except grpc.RpcError as e:
+            logger.error("gRPC error during batch task execution",
+                        batch_size=len(tasks),
+                        code=e.code(),
+                        details=e.details())
+            raise
+    
+    def _build_task_request(self,
+                            task_id: str,
+                            task_type: str,
+                            payload: Dict[str, Any],
+                            context: Dict[str, str] = None,
+                            dependencies: list = None,
+                            priority: int = 3,
+                            deadline: Optional[datetime] = None,
+                            checkpoint_data: Optional[Dict[str, Any]] = None) -> agent_pb2.TaskRequest:
+        """Build a TaskRequest message"""
+        request = agent_pb2.TaskRequest(
+            task_id=task_id,
+            task_type=task_type,
+            payload=dict_to_struct(payload),
+            context=context or {},
+            dependencies=dependencies or [],
+            priority=priority
+        )
+        
+        if deadline:
+            request.deadline.CopyFrom(datetime_to_timestamp(deadline))
+        if checkpoint_data:
+            request.checkpoint_data.CopyFrom(dict_to_struct(checkpoint_data))
+        
+        return request
+    
+    def _task_response_to_dict(self, response) -> Dict[str, Any]:
+        """Convert a TaskResponse message to a result dictionary"""
+        return {
+            'task_id': response.task_id,
+            'success': response.success,
+            'result': struct_to_dict(response.result) if response.result else {},
+            'error_message': response.error_message,
+            'artifacts': [self._artifact_to_dict(a) for a in response.artifacts],
+            'output_context': dict(response.output_context),
+            'metrics': self._metrics_to_dict(response.metrics) if response.metrics else {}
+        }
+    
     async def stream_task_progress(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
         """
         Stream real-time progress updates for a task.
@@ -237,6 +301,56 @@ class AgentServiceClient:
         except grpc.RpcError:
             return False
     
+    async def check_health(self, agent_id: str, timeout: float = 5.0) -> bool:
+        """
+        Probe whether the agent is responsive.
+        
+        Args:
+            agent_id: Agent identifier
+            timeout: Probe deadline in seconds
+            
+        Returns:
+            True if the agent acknowledged in time
+        """
+        if not self._connected:
+            return False
+        
+        request = agent_pb2.HeartbeatRequest(agent_id=agent_id)
+        
+        try:
+            response = await self.stub.Heartbeat(request, timeout=timeout)
+            return response.acknowledged
+        except grpc.RpcError:
+            return False
+    
+    async def stream_heartbeats(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Receive heartbeats pushed by the agent over one bidirectional stream.
+        
+        Each heartbeat is acknowledged on the same stream. The iterator ends
+        or raises when the stream closes.
+        
+        Yields:
+            Heartbeat with agent_id, status and resource_usage
+        """
+        if not self._connected:
+            raise RuntimeError("Not connected to agent service")
+        
+        call = self.stub.StreamHeartbeats()
+        try:
+            async for heartbeat in call:
+                ack = agent_pb2.HeartbeatResponse(acknowledged=True)
+                ack.server_time.GetCurrentTime()
+                await call.write(ack)
+                
+                yield {
+                    'agent_id': heartbeat.agent_id,
+                    'status': agent_pb2.AgentStatus.Name(heartbeat.status),
+                    'resource_usage': dict(heartbeat.resource_usage)
+                }
+        finally:
+            call.cancel()
+    
     async def get_capabilities(self, agent_id: str) -> Dict[str, Any]:
         """
         Get agent capabilities and metadata.
@@ -419,6 +533,33 @@ class AgentServiceClient:
                         code=e.code())
             return False
     
+    async def get_task_checkpoints(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the latest checkpoint of several running tasks in one call.
+        
+        Args:
+            task_ids: Tasks running on this agent
+            
+        Returns:
+            Checkpoint state by task_id; tasks without one are omitted
+        """
+        if not self._connected:
+            raise RuntimeError("Not connected to agent service")
+        
+        request = agent_pb2.TaskCheckpointRequest(task_ids=task_ids)
+        
+        try:
+            response = await self.stub.GetTaskCheckpoints(request, timeout=self.timeout)
+            return {
+                task_id: struct_to_dict(checkpoint)
+                for task_id, checkpoint in response.checkpoints.items()
+            }
+        except grpc.RpcError as e:
+            logger.error("Error fetching task checkpoints",
+                        tasks=len(task_ids),
+                        code=e.code())
+            raise
+    
     def _artifact_to_dict(self, artifact: agent_pb2.Artifact) -> Dict[str, Any]:
         """Convert Artifact protobuf to dict"""
         return {
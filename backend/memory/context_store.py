@@ -8,7 +8,9 @@ context, intermediate results, and collaborative data.
 import json
 import pickle
 import asyncio
-from typing import Any, Optional, Dict, List, Set
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Dict, List, Set, Tuple
 from datetime import datetime, timedelta
 import hashlib
 
@@ -20,6 +22,11 @@ import msgpack
 
 logger = structlog.get_logger()
 
+# Sentinel for keys absent from the store
+_MISSING = object()
+# Sentinel for keys whose shared fetch was cancelled; waiting readers fetch them again
+_ABANDONED = object()
+
 
 class SharedMemoryStore:
     """
@@ -179,8 +186,14 @@ class SharedMemoryStore:
         full_key = self._make_key(key)
         return await self.redis_client.exists(full_key) > 0
     
-    async def get_multiple(self, keys: List[str]) -> Dict[str, Any]:
-        """Get multiple values at once"""
+    async def get_multiple(self, keys: List[str],
+                           sizes: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Get multiple values at once with a single MGET.
+        
+        If ``sizes`` is given, it receives the stored size in bytes of each
+        key found.
+        """
         full_keys = [self._make_key(k) for k in keys]
         values = await self.redis_client.mget(full_keys)
         
@@ -188,27 +201,38 @@ class SharedMemoryStore:
         for key, value in zip(keys, values):
             if value is not None:
                 result[key] = self._deserialize(value)
+                if sizes is not None:
+                    sizes[key] = len(value)
         
         return result
     
-    async def set_multiple(self, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
-        """Set multiple values at once"""
+    async def set_multiple(self, data: Dict[str, Any], ttl: Optional[int] = None,
+                           sizes: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Set multiple values at once in one pipelined round-trip.
+        
+        If ``sizes`` is given, it receives the serialized size in bytes of
+        each key written.
+        """
+        if not data:
+            return True
         try:
             # Prepare data
             mapping = {}
             for key, value in data.items():
-                full_key = self._make_key(key)
-                mapping[full_key] = self._serialize(value)
-            
-            # Set all values
-            await self.redis_client.mset(mapping)
+                serialized = self._serialize(value)
+                mapping[self._make_key(key)] = serialized
+                if sizes is not None:
+                    sizes[key] = len(serialized)
             
-            # Apply TTL if specified
+            # Set all values, with their TTL, in one round-trip
             if ttl:
-                pipe = self.redis_client.pipeline()
-                for full_key in mapping.keys():
-                    pipe.expire(full_key, ttl)
+                pipe = self.redis_client.pipeline(transaction=False)
+                for full_key, serialized in mapping.items():
+                    pipe.set(full_key, serialized, ex=ttl)
                 await pipe.execute()
+            else:
+                await self.redis_client.mset(mapping)
             
             return True
         except Exception as e:
@@ -369,6 +393,103 @@ class SharedMemoryStore:
         return deleted_count
 
 
+class LocalContextCache:
+    """
+    Short-TTL, in-process read cache in front of a SharedMemoryStore.
+    
+    Intended for context keys read by many sibling tasks in quick succession.
+    Misses are fetched with a single MGET, concurrent readers of the same key
+    share one fetch, and missing keys are never cached. Staleness is bounded
+    by the TTL; writes made through ``set`` invalidate the local entry.
+    """
+    
+    def __init__(self, store: SharedMemoryStore, ttl_seconds: float = 2.0,
+                 max_entries: int = 10000):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    async def get_multiple(self, keys: List[str]) -> Dict[str, Any]:
+        """Get multiple values, fetching only uncached keys from Redis"""
+        result = {}
+        to_fetch = []
+        waiting = {}
+        now = time.monotonic()
+        
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                result[key] = entry[0]
+                self.hits += 1
+            elif key in self._in_flight:
+                waiting[key] = self._in_flight[key]
+                self.hits += 1
+            else:
+                to_fetch.append(key)
+                self.misses += 1
+        
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in to_fetch}
+            self._in_flight.update(futures)
+            try:
+                fetched = await self.store.get_multiple(to_fetch)
+            except Exception as e:
+                for key, future in futures.items():
+                    self._in_flight.pop(key, None)
+                    future.set_exception(e)
+                    # Mark retrieved in case no concurrent reader awaits it
+                    future.exception()
+                raise
+            except BaseException:
+                # Cancelled; readers sharing this fetch must not wait on it forever
+                for key, future in futures.items():
+                    self._in_flight.pop(key, None)
+                    future.set_result(_ABANDONED)
+                raise
+            
+            expires_at = time.monotonic() + self.ttl_seconds
+            for key, future in futures.items():
+                self._in_flight.pop(key, None)
+                if key in fetched:
+                    self._entries[key] = (fetched[key], expires_at)
+                    self._entries.move_to_end(key)
+                    result[key] = fetched[key]
+                future.set_result(fetched.get(key, _MISSING))
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        abandoned = []
+        for key, future in waiting.items():
+            value = await asyncio.shield(future)
+            if value is _ABANDONED:
+                abandoned.append(key)
+            elif value is not _MISSING:
+                result[key] = value
+        
+        if abandoned:
+            result.update(await self.get_multiple(abandoned))
+        
+        return result
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Write through to the store and drop the local copy"""
+        self.invalidate(key)
+        return await self.store.set(key, value, ttl=ttl)
+    
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+    
+    def clear(self):
+        self._entries.clear()
+
+
 class ContextSubscriber:
     """Helper class for managing subscriptions"""
     
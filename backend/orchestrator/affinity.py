@@ -0,0 +1,157 @@
+"""
+Affinity placement and work stealing for agent dispatch
+
+Remembers which agent last worked with a context key, a parent task or an
+upstream task's output, so related tasks can be steered to the agent that
+already has their context warm. When that agent is busy a task may wait in
+its bounded local queue rather than go to a cold agent; agents that free up
+serve their own local queue first and otherwise steal from the longest one.
+"""
+
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from prometheus_client import Counter
+
+
+# Metrics
+affinity_placement_counter = Counter(
+    'task_affinity_placements_total',
+    'Task placements by affinity outcome (warm, deferred, cold)',
+    ['outcome']
+)
+work_steal_counter = Counter(
+    'task_work_steals_total',
+    "Tasks taken from another agent's local queue"
+)
+
+
+def affinity_keys(task) -> List[Tuple[str, Hashable]]:
+    """Keys whose warm agent a task would benefit from"""
+    keys: List[Tuple[str, Hashable]] = [("ctx", key) for key in getattr(task, 'context_keys', None) or ()]
+    parent_task_id = getattr(task, 'parent_task_id', None)
+    if parent_task_id:
+        keys.append(("task", parent_task_id))
+    keys.extend(("task", dep_id) for dep_id in getattr(task, 'dependencies', None) or ())
+    return keys
+
+
+class AffinityScheduler:
+    """
+    Warm-context tracking plus per-agent local queues.
+
+    Pure bookkeeping: the caller decides when an agent has capacity and
+    whether it can serve a task.
+    """
+
+    def __init__(self, max_local_queue: int = 4, max_tracked_keys: int = 100000):
+        self.max_local_queue = max_local_queue
+        self.max_tracked_keys = max_tracked_keys
+
+        # affinity key -> agent_id that last ran a task touching it
+        self._warm: "OrderedDict[Tuple[str, Hashable], str]" = OrderedDict()
+        self._local: Dict[str, Deque[Any]] = defaultdict(deque)
+        self._queued: Set[str] = set()
+
+    def record_placement(self, task, agent_id: str):
+        """Remember that ``agent_id`` now holds this task's context and output"""
+        for key in affinity_keys(task) + [("task", task.task_id)]:
+            self._warm[key] = agent_id
+            self._warm.move_to_end(key)
+        while len(self._warm) > self.max_tracked_keys:
+            self._warm.popitem(last=False)
+
+    def pin(self, task, agent_id: str):
+        """Hint that a not-yet-started task should run on ``agent_id``"""
+        key = ("pin", task.task_id)
+        self._warm[key] = agent_id
+        self._warm.move_to_end(key)
+
+    def unpin(self, task_id: str):
+        """Drop a task's pin once it is placed or no longer pending"""
+        self._warm.pop(("pin", task_id), None)
+
+    def preferred_agent(self, task) -> Optional[str]:
+        """
+        Agent holding most of the task's affinity keys, if any.
+
+        A pin stays in place across refused admission attempts until the
+        caller ``unpin``s the task.
+        """
+        pinned = self._warm.get(("pin", task.task_id))
+        if pinned:
+            return pinned
+
+        votes: Dict[str, int] = defaultdict(int)
+        for key in affinity_keys(task):
+            agent_id = self._warm.get(key)
+            if agent_id:
+                votes[agent_id] += 1
+        if not votes:
+            return None
+        return max(votes, key=votes.get)
+
+    def defer(self, agent_id: str, task) -> bool:
+        """Queue a task locally on its warm agent; False if that queue is full"""
+        queue = self._local[agent_id]
+        if len(queue) >= self.max_local_queue:
+            return False
+        queue.append(task)
+        self._queued.add(task.task_id)
+        return True
+
+    def next_task(self, agent_id: str, can_serve: Callable[[Any], bool]) -> Optional[Any]:
+        """
+        Next task for an agent with a free slot: its own local queue first,
+        otherwise the newest servable task from the longest other queue.
+        """
+        own = self._local.get(agent_id)
+        if own:
+            task = own.popleft()
+            self._queued.discard(task.task_id)
+            return task
+
+        victims = sorted(
+            ((len(queue), victim_id) for victim_id, queue in self._local.items()
+             if queue and victim_id != agent_id),
+            reverse=True
+        )
+        for _, victim_id in victims:
+            queue = self._local[victim_id]
+            # Steal from the back; the owner keeps its oldest work
+            for index in range(len(queue) - 1, -1, -1):
+                if can_serve(queue[index]):
+                    task = queue[index]
+                    del queue[index]
+                    self._queued.discard(task.task_id)
+                    work_steal_counter.inc()
+                    return task
+        return None
+
+    def remove(self, task) -> bool:
+        """Drop a task waiting in any local queue"""
+        if task.task_id not in self._queued:
+            return False
+        for queue in self._local.values():
+            if task in queue:
+                queue.remove(task)
+                self._queued.discard(task.task_id)
+                return True
+        return False
+
+    def drain_agent(self, agent_id: str) -> List[Any]:
+        """Empty an agent's local queue, keeping its warm keys; returns the tasks for requeueing"""
+        queue = self._local.pop(agent_id, deque())
+        for task in queue:
+            self._queued.discard(task.task_id)
+        return list(queue)
+
+    def remove_agent(self, agent_id: str) -> List[Any]:
+        """Forget an agent; returns the tasks waiting on it for requeueing"""
+        tasks = self.drain_agent(agent_id)
+        for key in [key for key, owner in self._warm.items() if owner == agent_id]:
+            del self._warm[key]
+        return tasks
+
+    def local_queue_lengths(self) -> Dict[str, int]:
+        return {agent_id: len(queue) for agent_id, queue in self._local.items() if queue}
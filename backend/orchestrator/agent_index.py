@@ -0,0 +1,178 @@
+"""
+Indexed agent registry for dispatch-time agent selection
+
+Agents are indexed by the task types they can serve. Each task type keeps a
+heap ordered by the active scheduling key (utilization, performance score,
+tasks completed); entries are versioned so an agent update pushes a fresh
+entry and stale ones are discarded lazily on selection. Picking an agent is
+O(log n) instead of a scan over every registered agent.
+"""
+
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+# Ordering keys; the smallest key is selected
+def least_busy_key(agent) -> Tuple:
+    return (len(agent.active_tasks) / agent.max_concurrent_tasks,)
+
+
+def performance_key(agent) -> Tuple:
+    return (-(agent.performance_score * agent.current_capacity),
+            agent.error_rate,
+            len(agent.active_tasks))
+
+
+def round_robin_key(agent) -> Tuple:
+    return (agent.tasks_completed,)
+
+
+class AgentIndex:
+    """
+    Per-task-type heaps of schedulable agents.
+
+    Callers must call ``update`` whenever an agent's status, load or score
+    changes. Circuit breakers are checked at selection time since they
+    recover on their own, so the per-type idle counts ignore them. An optional ``observer`` is told of every change
+    through ``agent_changed(agent)`` and ``agent_removed(agent_id)``.
+    """
+
+    def __init__(self,
+                 routing_rules: Dict[str, List[Any]],
+                 is_schedulable: Callable[[Any], bool],
+                 key: Callable[[Any], Tuple] = least_busy_key,
+                 observer: Optional[Any] = None):
+        self.routing_rules = routing_rules
+        self.is_schedulable = is_schedulable
+        self.key = key
+        self.observer = observer
+
+        self._agents: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
+        self._task_types: Dict[str, Set[str]] = {}
+        self._members: Dict[str, Set[str]] = defaultdict(set)
+        self._heaps: Dict[str, List[Tuple]] = defaultdict(list)
+        self._idle: Set[str] = set()
+        self._idle_counts: Dict[str, int] = defaultdict(int)
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def add(self, agent):
+        """Index a newly registered agent"""
+        task_types = {
+            task_type for task_type in agent.capabilities
+            if agent.agent_type in self.routing_rules.get(task_type, [])
+        }
+        self._agents[agent.agent_id] = agent
+        self._versions[agent.agent_id] = 0
+        self._task_types[agent.agent_id] = task_types
+        for task_type in task_types:
+            self._members[task_type].add(agent.agent_id)
+        self.update(agent)
+
+    def remove(self, agent_id: str):
+        """Drop an agent; its heap entries become stale"""
+        self._agents.pop(agent_id, None)
+        self._versions.pop(agent_id, None)
+        idle = agent_id in self._idle
+        self._idle.discard(agent_id)
+        for task_type in self._task_types.pop(agent_id, set()):
+            self._members[task_type].discard(agent_id)
+            if idle:
+                self._idle_counts[task_type] -= 1
+        if self.observer:
+            self.observer.agent_removed(agent_id)
+
+    def update(self, agent):
+        """Re-rank an agent after its status, load or score changed"""
+        if agent.agent_id not in self._agents:
+            return
+
+        version = self._versions[agent.agent_id] + 1
+        self._versions[agent.agent_id] = version
+        if self.observer:
+            self.observer.agent_changed(agent)
+        self._track_idle(agent)
+        if not self.is_schedulable(agent):
+            return
+
+        entry_key = self.key(agent)
+        for task_type in self._task_types[agent.agent_id]:
+            heap = self._heaps[task_type]
+            heapq.heappush(heap, (entry_key, next(self._sequence), version, agent.agent_id))
+            if len(heap) > 2 * len(self._members[task_type]) + 16:
+                self._compact(task_type)
+
+    def select(self, task_type: str) -> Optional[Any]:
+        """Return the best schedulable agent for a task type, or None"""
+        heap = self._heaps.get(task_type)
+        if not heap:
+            return None
+
+        selected = None
+        tripped = []
+        while heap:
+            _, _, version, agent_id = heap[0]
+            agent = self._agents.get(agent_id)
+            if agent is None or self._versions[agent_id] != version:
+                heapq.heappop(heap)
+                continue
+            if agent.circuit_breaker and agent.circuit_breaker.is_open:
+                # Keep the entry; the breaker may close without an update
+                tripped.append(heapq.heappop(heap))
+                continue
+            selected = agent
+            break
+
+        for entry in tripped:
+            heapq.heappush(heap, entry)
+        return selected
+
+    def has_idle(self, task_type: str) -> bool:
+        """Whether some schedulable agent for a task type has no active tasks"""
+        return self._idle_counts.get(task_type, 0) > 0
+
+    def eligible(self, task_type: str) -> List[Any]:
+        """All schedulable agents for a task type, for strategies scoring per task"""
+        return [
+            self._agents[agent_id] for agent_id in self._members.get(task_type, ())
+            if self.can_serve(self._agents[agent_id], task_type)
+        ]
+
+    def serves(self, agent_id: str, task_type: str) -> bool:
+        """Whether an agent handles a task type at all, ignoring its state"""
+        return agent_id in self._members.get(task_type, ())
+
+    def can_serve(self, agent, task_type: str) -> bool:
+        """Whether a specific agent could take a task of this type right now"""
+        if not self.serves(agent.agent_id, task_type):
+            return False
+        if not self.is_schedulable(agent):
+            return False
+        return not (agent.circuit_breaker and agent.circuit_breaker.is_open)
+
+    def _track_idle(self, agent):
+        idle = self.is_schedulable(agent) and not agent.active_tasks
+        if idle == (agent.agent_id in self._idle):
+            return
+        delta = 1 if idle else -1
+        if idle:
+            self._idle.add(agent.agent_id)
+        else:
+            self._idle.discard(agent.agent_id)
+        for task_type in self._task_types[agent.agent_id]:
+            self._idle_counts[task_type] += delta
+
+    def _compact(self, task_type: str):
+        """Rebuild a heap from live entries once stale ones dominate"""
+        live = []
+        for agent_id in self._members[task_type]:
+            agent = self._agents[agent_id]
+            if self.is_schedulable(agent):
+                live.append((self.key(agent), next(self._sequence), self._versions[agent_id], agent_id))
+        heapq.heapify(live)
+        self._heaps[task_type] = live
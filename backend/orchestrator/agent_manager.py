@@ -24,6 +24,7 @@ from backend.models.models import AgentType, JobStatus
 from backend.memory.context_store import SharedMemoryStore
 from backend.grpc.agent_client import AgentServiceClient
 from backend.database.db import db_manager
+from .completion import TaskCompletions, completion_outcome
 
 
 logger = structlog.get_logger()
@@ -94,6 +95,7 @@ class AgentManager:
         self.pending_tasks: Dict[str, AgentTask] = {}
         self.completed_tasks: Dict[str, Any] = {}
         self.task_dependencies: Dict[str, Set[str]] = defaultdict(set)
+        self.completions = TaskCompletions()
         
         # Shared memory and communication
         self.memory_store = SharedMemoryStore(redis_url)
@@ -144,6 +146,7 @@ class AgentManager:
             self._task_processor_task.cancel()
         if self._heartbeat_monitor_task:
             self._heartbeat_monitor_task.cancel()
+        self.completions.cancel_all()
             
         await self.memory_store.disconnect()
         
@@ -250,6 +253,29 @@ class AgentManager:
         else:
             return None
     
+    async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a task to complete or fail, without polling.
+        
+        Returns:
+            Terminal status, result and error, or None for an unknown task
+        """
+        if task_id in self.completed_tasks:
+            return completion_outcome(self.completed_tasks[task_id])
+        if task_id not in self.pending_tasks:
+            return None
+        return await self.completions.wait(task_id, timeout)
+    
+    def is_task_queued(self, task_id: str) -> bool:
+        """Whether a task is pending without having been dispatched to an agent"""
+        task = self.pending_tasks.get(task_id)
+        return task is not None and not task.assigned_to
+    
+    async def wait_for_dispatch(self, task_id: str, timeout: Optional[float] = None):
+        """Wait, without polling, until a queued task is dispatched to an agent or finishes"""
+        if self.is_task_queued(task_id):
+            await self.completions.wait_dispatched(task_id, timeout)
+    
     def get_least_busy_agent(self, task_type: str) -> Optional[AgentInstance]:
         """Find the least busy agent capable of handling the task type"""
         eligible_agent_types = self.task_routing_rules.get(task_type, [])
@@ -299,6 +325,7 @@ class AgentManager:
         """Assign a task to a specific agent"""
         task.assigned_to = agent.agent_id
         agent.current_task = task.task_id
+        self.completions.dispatched(task.task_id)
         agent.status = AgentStatus.BUSY
         
         # Update metrics
@@ -358,6 +385,7 @@ class AgentManager:
         # Store result
         self.completed_tasks[task.task_id] = result
         del self.pending_tasks[task.task_id]
+        self.completions.resolve(task.task_id, result)
         
         # Store result in shared memory if needed
         if "output_key" in task.payload:
@@ -383,6 +411,7 @@ class AgentManager:
         # Mark as failed
         self.completed_tasks[task.task_id] = {"error": error, "status": "failed"}
         del self.pending_tasks[task.task_id]
+        self.completions.resolve(task.task_id, self.completed_tasks[task.task_id])
         
         # Notify dependent tasks
         await self._process_dependent_tasks(task.task_id)
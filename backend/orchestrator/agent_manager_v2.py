@@ -30,14 +30,29 @@ import asyncpg
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
-import networkx as nx
 from circuit_breaker import CircuitBreaker
 
 from backend.models.models import AgentType, JobStatus
-from backend.memory.context_store import SharedMemoryStore
+from backend.memory.context_store import LocalContextCache, SharedMemoryStore
 from backend.grpc.agent_client import AgentServiceClient
 from backend.database.db import db_manager
+from .affinity import AffinityScheduler, affinity_placement_counter
+from .agent_index import AgentIndex, least_busy_key, performance_key, round_robin_key
+from .aggregates import AgentTypeAggregates
+from .batching import TaskBatcher
+from .checkpointing import CheckpointManager
+from .completion import TaskCompletions, completion_outcome
 from .config import config, SchedulingStrategy
+from .deadlines import DeadlineMonitor, deadline_aware_key
+from .dispatch_queue import PriorityDispatchQueue
+from .duration_model import TaskDurationEstimator
+from .hedging import run_hedged
+from .idempotency import IdempotencyCache
+from .liveness import LivenessMonitor
+from .retention import ResultRetentionStore
+from .retry_scheduler import RetryScheduler
+from .task_dag import TaskDAG
+from .task_journal import TaskStateJournal
 
 
 # Initialize OpenTelemetry
@@ -49,6 +64,9 @@ else:
 
 logger = structlog.get_logger()
 
+# Admission grant for a task parked in its warm agent's local queue
+DEFERRED = object()
+
 # Enhanced Metrics
 task_assigned_counter = Counter('agent_tasks_assigned_total', 'Total tasks assigned to agents', ['agent_type', 'priority'])
 task_completed_counter = Counter('agent_tasks_completed_total', 'Total tasks completed by agents', ['agent_type', 'status'])
@@ -64,6 +82,10 @@ dag_critical_path_length = Gauge('dag_critical_path_length', 'DAG critical path
 agent_pool_size_gauge = Gauge('agent_pool_size', 'Current agent pool size', ['agent_type'])
 task_throughput_rate = Counter('task_throughput_total', 'Task throughput rate', ['agent_type'])
 load_shedding_counter = Counter('load_shedding_total', 'Tasks rejected due to load shedding')
+forecast_agents_needed_gauge = Gauge('predictive_agents_needed', 'Agents needed for forecast demand', ['agent_type'])
+prewarmed_agents_counter = Counter('predictive_prewarmed_agents_total', 'Agents spawned ahead of forecast demand', ['agent_type'])
+context_load_histogram = Histogram('task_context_load_seconds', 'Time to load task context from shared memory',
+                                   buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1])
 
 
 class TaskPriority(Enum):
@@ -139,81 +161,6 @@ class EnhancedAgentInstance:
     resource_usage: Dict[str, float] = field(default_factory=dict)
 
 
-class TaskDAG:
-    """Directed Acyclic Graph for task dependencies and optimization"""
-    
-    def __init__(self):
-        self.graph = nx.DiGraph()
-        self.task_durations: Dict[str, float] = {}
-        
-    def add_task(self, task_id: str, estimated_duration: float = 1.0):
-        self.graph.add_node(task_id)
-        self.task_durations[task_id] = estimated_duration
-        
-    def add_dependency(self, from_task: str, to_task: str):
-        self.graph.add_edge(from_task, to_task)
-        
-    def get_critical_path(self) -> Tuple[List[str], float]:
-        """Calculate critical path using longest path algorithm"""
-        if not self.graph:
-            return [], 0
-            
-        # Topological sort
-        try:
-            topo_order = list(nx.topological_sort(self.graph))
-        except nx.NetworkXError:
-            logger.error("Cycle detected in task DAG")
-            return [], 0
-            
-        # Calculate longest path
-        distances = {node: 0 for node in self.graph.nodes()}
-        predecessors = {node: None for node in self.graph.nodes()}
-        
-        for node in topo_order:
-            for successor in self.graph.successors(node):
-                new_distance = distances[node] + self.task_durations.get(node, 1.0)
-                if new_distance > distances[successor]:
-                    distances[successor] = new_distance
-                    predecessors[successor] = node
-        
-        # Find the longest path
-        end_node = max(distances.items(), key=lambda x: x[1])[0]
-        path = []
-        current = end_node
-        
-        while current is not None:
-            path.append(current)
-            current = predecessors[current]
-            
-        path.reverse()
-        return path, distances[end_node]
-    
-    def get_parallelizable_tasks(self) -> List[Set[str]]:
-        """Get sets of tasks that can be executed in parallel"""
-        levels = []
-        remaining = set(self.graph.nodes())
-        
-        while remaining:
-            # Find tasks with no dependencies in remaining set
-            level = set()
-            for task in remaining:
-                predecessors = set(self.graph.predecessors(task))
-                if not predecessors.intersection(remaining):
-                    level.add(task)
-            
-            if not level:
-                break
-                
-            levels.append(level)
-            remaining -= level
-            
-        return levels
-    
-    def should_cancel_descendants(self, failed_task: str) -> Set[str]:
-        """Determine which tasks should be cancelled when a task fails"""
-        return set(nx.descendants(self.graph, failed_task))
-
-
 class EnhancedAgentManager:
     """
     Production-grade orchestrator with advanced features for high-scale operations.
@@ -222,29 +169,148 @@ class EnhancedAgentManager:
     def __init__(self):
         self.config = config
         self.agents: Dict[str, EnhancedAgentInstance] = {}
+        self.task_routing_rules = task_routing_rules
+        
+        # Per-agent-type load counters for the autoscaler and metrics loops,
+        # fed by the agent index and by pending task adds and removals
+        self.aggregates = AgentTypeAggregates(self.task_routing_rules)
+        
+        # Schedulable agents per task type, ordered for the active strategy
+        self.agent_index = AgentIndex(
+            self.task_routing_rules,
+            is_schedulable=self._is_schedulable,
+            key={
+                SchedulingStrategy.PERFORMANCE_BASED: performance_key,
+                SchedulingStrategy.ROUND_ROBIN: round_robin_key,
+            }.get(config.scheduling_strategy, least_busy_key),
+            observer=self.aggregates
+        )
         
-        # Enhanced task queues with priority and backpressure
-        self.task_queues: Dict[TaskPriority, asyncio.Queue] = {}
+        # Single priority-aware ready queue with backpressure; processors
+        # block on it instead of polling per-priority queues, and only take a
+        # task once an eligible agent slot is reserved for its type
+        queue_key = None
+        if config.scheduling_strategy == SchedulingStrategy.DEADLINE_AWARE:
+            # Earliest virtual deadline first instead of strict priority
+            queue_key = deadline_aware_key({
+                p.value: config.priority_aging_seconds.get(p.name, 0.0) for p in TaskPriority
+            })
+        elif config.feature_flags["critical_path_analysis"]:
+            queue_key = self._critical_path_key
+        self._critical_path_ordering = queue_key == self._critical_path_key
+        self.ready_queue = PriorityDispatchQueue(
+            priorities=[p.value for p in TaskPriority],
+            maxsize_per_priority=config.performance.task_queue_size // len(TaskPriority),
+            key=queue_key,
+            partition=lambda task: task.task_type
+        )
         self.pending_tasks: Dict[str, EnhancedAgentTask] = {}
-        self.completed_tasks: Dict[str, Any] = {}
-        self.task_dependencies: Dict[str, Set[str]] = defaultdict(set)
         
-        # Task DAG for optimization
+        # Warm-context placement and per-agent local queues with stealing
+        self.affinity = AffinityScheduler(
+            max_local_queue=config.affinity_local_queue_size,
+            max_tracked_keys=config.affinity_tracked_keys
+        )
+        self._local_dispatches: Set[asyncio.Task] = set()
+        
+        # Task DAG for dependency readiness and optimization
         self.task_dag = TaskDAG()
         
+        # Learned run time per task type and agent type, used for DAG
+        # durations, cost estimates and adaptive timeouts
+        self.duration_estimator = TaskDurationEstimator(
+            alpha=config.performance.duration_ewma_alpha,
+            default_seconds=config.performance.default_task_duration_seconds,
+            quantiles=(config.performance.hedge_quantile,
+                       config.fault_tolerance.adaptive_timeout_quantile)
+        )
+        
         # Shared memory and communication
         self.memory_store = SharedMemoryStore(config.redis_url)
+        self.context_reader = self.memory_store
+        if config.performance.enable_context_cache:
+            self.context_reader = LocalContextCache(
+                self.memory_store,
+                ttl_seconds=config.performance.context_cache_ttl_seconds,
+                max_entries=config.performance.context_cache_max_entries
+            )
+        
+        # Recent results in memory, older ones spilled to shared memory
+        self.completed_tasks = ResultRetentionStore(
+            self.memory_store,
+            max_entries=config.performance.result_retention_max_entries,
+            max_age_seconds=config.performance.result_retention_max_age_seconds,
+            spill_ttl_seconds=config.performance.result_spill_ttl_seconds,
+            spill_batch_size=config.performance.batch_size,
+            spilled_index_size=config.performance.result_spilled_index_size
+        )
+        
+        # Futures for callers awaiting a task's outcome instead of polling
+        self.completions = TaskCompletions()
         self.agent_clients: Dict[str, AgentServiceClient] = {}
         
+        # Coalesces small same-type tasks per agent into one RPC
+        self.task_batcher = TaskBatcher(
+            self._dispatch_task_batch,
+            max_batch_size=config.performance.batch_size,
+            window_seconds=config.performance.batch_window_ms / 1000
+        )
+        
         # Database connection for exactly-once delivery
         self.db_pool: Optional[asyncpg.Pool] = None
         
+        # Batched writer for task state transitions
+        self.task_journal: Optional[TaskStateJournal] = None
+        
+        # Resolves duplicate submissions without a database round-trip
+        self.idempotency_cache = IdempotencyCache(
+            max_entries=config.performance.idempotency_cache_size,
+            ttl_seconds=config.performance.idempotency_cache_ttl_seconds
+        )
+        
         # Redis for dead-letter queue
         self.redis_client: Optional[redis.Redis] = None
         
+        # Called with (task_id, succeeded) once a task reaches a final state
+        self._task_finished_listeners: List[Callable[[str, bool], None]] = []
+        
         # Semaphore for concurrency control
         self.task_semaphore = Semaphore(config.performance.max_concurrent_tasks)
         
+        # Retry backoff runs on a timer so processors never sleep in-line
+        self.retry_scheduler = RetryScheduler(
+            self._requeue_delayed_task,
+            base_delay_seconds=config.fault_tolerance.retry_base_delay_seconds,
+            max_delay_seconds=config.fault_tolerance.retry_max_delay_seconds
+        )
+        
+        # One timer checkpoints every running task as compressed deltas
+        self.checkpoints = CheckpointManager(
+            self._fetch_checkpoints,
+            interval_seconds=config.fault_tolerance.checkpoint_interval_seconds,
+            full_every=config.fault_tolerance.checkpoint_full_every,
+            compression_level=config.fault_tolerance.checkpoint_compression_level
+        )
+        
+        # Escalates or expires tasks as their deadlines approach
+        self.deadline_monitor = DeadlineMonitor(
+            self._escalate_task,
+            self._expire_task,
+            escalation_seconds=config.deadline_escalation_seconds
+        )
+        
+        # Agent liveness from pushed heartbeats; only lapsed agents are probed
+        self.liveness = LivenessMonitor(
+            self._probe_agent,
+            self._mark_agent_online,
+            self._mark_agent_offline,
+            heartbeat_timeout=config.agent_heartbeat_timeout,
+            probe_timeout=config.agent_probe_timeout_seconds,
+            max_concurrent_probes=config.agent_max_concurrent_probes,
+            tick_seconds=config.agent_liveness_tick_seconds
+        )
+        self._heartbeat_streams: Dict[str, asyncio.Task] = {}
+        
         # Circuit breakers for agents
         self.agent_circuit_breakers: Dict[str, CircuitBreaker] = {}
         
@@ -252,6 +318,12 @@ class EnhancedAgentManager:
         self.last_scaling_decision: Dict[AgentType, datetime] = {}
         self.scaling_metrics: Dict[AgentType, deque] = defaultdict(lambda: deque(maxlen=100))
         
+        # Forecast-driven pre-warming; agents each type is expected to need
+        # within the forecast horizon, which also holds off scale-down
+        self.feature_extractor = None
+        self.workload_forecaster = None
+        self.forecast_agents_needed: Dict[AgentType, int] = {}
+        
         # Load shedding state
         self.load_shedding_active = False
         self.rejected_tasks_count = 0
@@ -259,22 +331,17 @@ class EnhancedAgentManager:
         # Background tasks
         self._running = False
         self._task_processors: List[asyncio.Task] = []
-        self._heartbeat_monitor_task = None
         self._autoscaler_task = None
         self._metrics_collector_task = None
         self._dag_optimizer_task = None
+        self._predictive_scaling_task = None
         
     async def initialize(self):
         """Initialize the enhanced agent manager"""
         try:
-            # Initialize task queues
-            for priority in TaskPriority:
-                self.task_queues[priority] = asyncio.Queue(
-                    maxsize=config.performance.task_queue_size // len(TaskPriority)
-                )
-            
             # Connect to shared memory
             await self.memory_store.connect()
+            await self.completed_tasks.start()
             
             # Initialize database pool for exactly-once delivery
             if config.fault_tolerance.enable_exactly_once_delivery:
@@ -283,7 +350,16 @@ class EnhancedAgentManager:
                     min_size=10,
                     max_size=config.performance.connection_pool_size
                 )
+                self.checkpoints.db_pool = self.db_pool
                 await self._init_database_schema()
+                
+                self.task_journal = TaskStateJournal(
+                    self.db_pool,
+                    max_batch_size=config.performance.journal_max_batch_size,
+                    flush_interval_seconds=config.performance.journal_flush_interval_ms / 1000,
+                    sync_status_updates=config.performance.journal_sync_status_updates
+                )
+                await self.task_journal.start()
             
             # Initialize Redis for dead-letter queue
             if config.fault_tolerance.enable_dead_letter_queue:
@@ -294,6 +370,10 @@ class EnhancedAgentManager:
                 )
             
             self._running = True
+            await self.retry_scheduler.start()
+            await self.deadline_monitor.start()
+            if config.fault_tolerance.enable_task_checkpointing:
+                await self.checkpoints.start()
             
             # Start multiple task processors for parallelism
             num_processors = min(config.performance.max_concurrent_tasks // 100, 10)
@@ -302,10 +382,12 @@ class EnhancedAgentManager:
                 self._task_processors.append(processor)
             
             # Start background tasks
-            self._heartbeat_monitor_task = asyncio.create_task(self._monitor_agent_heartbeats())
+            await self.liveness.start()
             self._autoscaler_task = asyncio.create_task(self._autoscale_agents())
             self._metrics_collector_task = asyncio.create_task(self._collect_metrics())
             self._dag_optimizer_task = asyncio.create_task(self._optimize_dag())
+            if config.autoscaling.enabled and config.feature_flags["predictive_scaling"]:
+                self._start_predictive_scaling()
             
             logger.info("Enhanced Agent Manager initialized", 
                        num_processors=num_processors,
@@ -335,6 +417,7 @@ class EnhancedAgentManager:
                 CREATE INDEX IF NOT EXISTS idx_tasks_idempotency ON tasks(idempotency_key);
                 CREATE INDEX IF NOT EXISTS idx_tasks_assigned ON tasks(assigned_to);
             ''')
+            await self.checkpoints.init_schema(conn)
     
     @asynccontextmanager
     async def _acquire_task_lock(self, task_id: str):
@@ -365,23 +448,25 @@ class EnhancedAgentManager:
                          estimated_complexity: float = 1.0,
                          deadline: Optional[datetime] = None,
                          idempotency_key: Optional[str] = None,
-                         parent_task_id: Optional[str] = None) -> str:
-        """Submit a new task with enhanced features"""
+                         parent_task_id: Optional[str] = None,
+                         task_id: Optional[str] = None) -> str:
+        """
+        Submit a new task with enhanced features.
+        
+        ``task_id`` lets a caller that routes tasks before submission (the
+        sharded router) fix the ID up front; one is generated otherwise.
+        """
         
         # Check for load shedding
         if self._should_shed_load():
             load_shedding_counter.inc()
             raise Exception("System overloaded, task rejected")
         
-        # Check idempotency
-        if idempotency_key and self.db_pool:
-            async with self.db_pool.acquire() as conn:
-                existing = await conn.fetchrow(
-                    'SELECT task_id FROM tasks WHERE idempotency_key = $1',
-                    idempotency_key
-                )
-                if existing:
-                    return str(existing['task_id'])
+        # Check idempotency in memory; the insert below is the atomic check
+        if idempotency_key:
+            existing_task_id = await self.idempotency_cache.lookup(idempotency_key)
+            if existing_task_id:
+                return existing_task_id
         
         # Create task with tracing context
         task = EnhancedAgentTask(
@@ -396,6 +481,8 @@ class EnhancedAgentManager:
             parent_task_id=parent_task_id,
             enqueued_at=datetime.utcnow()
         )
+        if task_id:
+            task.task_id = task_id
         
         # Add tracing context if available
         if tracer:
@@ -404,23 +491,33 @@ class EnhancedAgentManager:
             task.span_id = format(ctx.span_id, '016x')
         
         # Store in database for persistence
-        if self.db_pool:
-            async with self.db_pool.acquire() as conn:
-                await conn.execute('''
-                    INSERT INTO tasks (task_id, idempotency_key, status, created_at)
-                    VALUES ($1, $2, $3, $4)
-                ''', uuid.UUID(task.task_id), idempotency_key, 'pending', task.created_at)
+        owner_task_id = await self._persist_new_task(task)
+        if owner_task_id != task.task_id:
+            # Another orchestrator already accepted this idempotency key
+            return owner_task_id
         
         self.pending_tasks[task.task_id] = task
+        self.aggregates.task_added(task.task_type)
+        if deadline:
+            self.deadline_monitor.track(task.task_id, deadline)
         
-        # Add to DAG
-        self.task_dag.add_task(task.task_id, estimated_complexity)
+        # Add to DAG; dependencies already collected from it are finished
+        raised = self.task_dag.add_task(
+            task.task_id, self.duration_estimator.estimate(task_type, estimated_complexity)
+        )
         for dep_id in task.dependencies:
-            self.task_dependencies[dep_id].add(task.task_id)
-            self.task_dag.add_dependency(dep_id, task.task_id)
+            if dep_id in self.task_dag or not await self.completed_tasks.is_finished(dep_id):
+                raised += self.task_dag.add_dependency(dep_id, task.task_id)
+        
+        # Queued ancestors now lead a longer path; their least-slack keys are stale
+        if raised and self._critical_path_ordering:
+            await self.ready_queue.rekey(
+                self.pending_tasks[ancestor_id] for ancestor_id in set(raised)
+                if ancestor_id in self.pending_tasks and self.task_dag.is_ready(ancestor_id)
+            )
         
         # Check if task can be queued immediately
-        if not task.dependencies or all(dep in self.completed_tasks for dep in task.dependencies):
+        if self.task_dag.is_ready(task.task_id):
             await self._enqueue_task(task)
         
         # Update metrics
@@ -434,30 +531,71 @@ class EnhancedAgentManager:
         
         return task.task_id
     
+    async def _persist_new_task(self, task: EnhancedAgentTask) -> str:
+        """
+        Insert the task row, returning the task_id that owns its idempotency key.
+        
+        Idempotent submissions wait for the row to be durable, using a single
+        INSERT ... ON CONFLICT DO NOTHING RETURNING so concurrent duplicates
+        across instances cannot both be accepted.
+        """
+        key = task.idempotency_key
+        if not key:
+            if self.task_journal:
+                await self.task_journal.insert_task(
+                    task.task_id, None, 'pending', task.created_at, sync=False
+                )
+            return task.task_id
+        
+        self.idempotency_cache.begin(key)
+        try:
+            owner_task_id = task.task_id
+            if self.task_journal:
+                owner_task_id = await self.task_journal.insert_task(
+                    task.task_id, key, 'pending', task.created_at, sync=True
+                )
+        except asyncio.CancelledError:
+            # Duplicates go on to the conflict-aware insert themselves
+            self.idempotency_cache.release(key)
+            raise
+        except Exception as e:
+            self.idempotency_cache.abort(key, e)
+            raise
+        
+        self.idempotency_cache.complete(key, owner_task_id)
+        return owner_task_id
+    
     async def _enqueue_task(self, task: EnhancedAgentTask):
         """Enqueue task with priority and backpressure handling"""
         priority = TaskPriority(task.priority)
-        queue = self.task_queues[priority]
         
-        # Apply backpressure if queue is full
-        if queue.full():
-            # Try higher priority queue
+        # Apply backpressure if the priority lane is full
+        if self.ready_queue.full(priority.value):
+            # Try higher priority lane
             for higher_priority in TaskPriority:
-                if higher_priority.value < priority.value:
-                    higher_queue = self.task_queues[higher_priority]
-                    if not higher_queue.full():
-                        task.priority = higher_priority.value
-                        await higher_queue.put(task)
-                        return
+                if (higher_priority.value < priority.value and
+                    not self.ready_queue.full(higher_priority.value)):
+                    task.priority = higher_priority.value
+                    await self.ready_queue.put(task)
+                    return
             
-            # If all queues full, wait with timeout
+            # If all lanes full, wait with timeout
             try:
-                await asyncio.wait_for(queue.put(task), timeout=5.0)
+                await self.ready_queue.put(task, timeout=5.0)
             except asyncio.TimeoutError:
                 await self._send_to_dead_letter_queue(task, "Queue full timeout")
                 raise
         else:
-            await queue.put(task)
+            await self.ready_queue.put(task)
+    
+    def _critical_path_key(self, task: EnhancedAgentTask) -> Tuple[int, float]:
+        """
+        Ready-queue key: priority, then least slack first.
+        
+        Every ready task can start now, so their slack differs only by the
+        length of the longest path still ahead of them; the longest goes first.
+        """
+        return (task.priority, -self.task_dag.tail_length(task.task_id))
     
     def _should_shed_load(self) -> bool:
         """Determine if load shedding should be activated"""
@@ -465,8 +603,8 @@ class EnhancedAgentManager:
             return False
             
         # Calculate system load
-        total_queued = sum(q.qsize() for q in self.task_queues.values())
-        total_capacity = sum(q.maxsize for q in self.task_queues.values())
+        total_queued = self.ready_queue.qsize()
+        total_capacity = self.ready_queue.maxsize
         
         load_ratio = total_queued / total_capacity if total_capacity > 0 else 0
         
@@ -489,41 +627,46 @@ class EnhancedAgentManager:
         
         while self._running:
             try:
-                # Process tasks from all priority queues
-                task = None
-                for priority in TaskPriority:
-                    queue = self.task_queues[priority]
-                    if not queue.empty():
-                        task = await queue.get()
-                        break
-                
-                if not task:
-                    await asyncio.sleep(0.1)
+                # Block until a task is ready and an agent slot is reserved
+                # for it; highest priority first
+                task, agent = await self.ready_queue.get_admitted(
+                    self._admit_task,
+                    recheck_interval=config.performance.admission_recheck_seconds
+                )
+                if agent is DEFERRED:
+                    # Parked on its warm agent; started when a slot frees up
                     continue
                 
-                # Acquire semaphore for concurrency control
-                async with self.task_semaphore:
-                    # Start span for task processing
-                    span_name = f"process_task_{task.task_type}"
-                    if tracer and task.trace_id:
-                        # Continue trace from task submission
-                        ctx = trace.SpanContext(
-                            trace_id=int(task.trace_id, 16),
-                            span_id=int(task.span_id, 16),
-                            is_remote=True,
-                            trace_flags=trace.TraceFlags(0x01)
-                        )
-                        with tracer.start_as_current_span(span_name, context=ctx) as span:
-                            await self._process_single_task(task, span)
-                    else:
-                        await self._process_single_task(task, None)
+                await self._run_admitted_task(task, agent)
                         
             except Exception as e:
                 logger.error(f"Error in task processor {processor_id}", error=str(e))
                 await asyncio.sleep(1)
     
-    async def _process_single_task(self, task: EnhancedAgentTask, span: Optional[trace.Span]):
-        """Process a single task with full error handling and observability"""
+    async def _run_admitted_task(self, task: EnhancedAgentTask, agent: EnhancedAgentInstance):
+        """Run a task on its reserved agent under the concurrency limit"""
+        # Acquire semaphore for concurrency control
+        async with self.task_semaphore:
+            # Start span for task processing
+            span_name = f"process_task_{task.task_type}"
+            if tracer and task.trace_id:
+                # Continue trace from task submission
+                ctx = trace.SpanContext(
+                    trace_id=int(task.trace_id, 16),
+                    span_id=int(task.span_id, 16),
+                    is_remote=True,
+                    trace_flags=trace.TraceFlags(0x01)
+                )
+                with tracer.start_as_current_span(span_name, context=ctx) as span:
+                    await self._process_single_task(task, agent, span)
+            else:
+                await self._process_single_task(task, agent, None)
+    
+    async def _process_single_task(self,
+                                   task: EnhancedAgentTask,
+                                   agent: EnhancedAgentInstance,
+                                   span: Optional[trace.Span]):
+        """Process an admitted task on its reserved agent with full error handling"""
         start_time = time.time()
         
         try:
@@ -534,29 +677,18 @@ class EnhancedAgentManager:
                 if span:
                     span.set_attribute("queue_time_seconds", queue_time)
             
-            # Find suitable agent based on scheduling strategy
-            agent = await self._select_agent(task)
-            
-            if not agent:
-                # No available agent, retry later
-                task.retry_count += 1
-                if task.retry_count < task.max_retries:
-                    await asyncio.sleep(min(2 ** task.retry_count, 60))
-                    await self._enqueue_task(task)
-                else:
-                    await self._handle_task_failure(task, "No available agents", span)
-                return
-            
             # Assign task with exactly-once semantics
             async with self._acquire_task_lock(task.task_id) as lock_acquired:
                 if not lock_acquired:
                     logger.warning("Failed to acquire task lock", task_id=task.task_id)
+                    await self._release_agent_slot(agent, task.task_id)
                     return
                 
                 await self._assign_task_to_agent(task, agent, span)
                 
         except Exception as e:
             logger.error("Task processing failed", task_id=task.task_id, error=str(e))
+            await self._release_agent_slot(agent, task.task_id)
             if span:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
             await self._handle_task_failure(task, str(e), span)
@@ -567,12 +699,95 @@ class EnhancedAgentManager:
             if span:
                 span.set_attribute("assignment_latency_seconds", assignment_time)
     
-    async def _select_agent(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
+    def _admit_task(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
+        """
+        Reserve a slot on an eligible agent for the task, or refuse it.
+        
+        Called by the ready queue under its lock, so a task is only dequeued
+        when it can run and no two processors claim the same slot. With
+        affinity scheduling a task may instead be parked in the local queue
+        of the agent holding its context (the DEFERRED grant).
+        """
+        agent, placement = None, None
+        if config.enable_affinity_scheduling:
+            agent, placement = self._admit_with_affinity(task)
+            if agent is DEFERRED:
+                affinity_placement_counter.labels(outcome=placement).inc()
+                self.affinity.unpin(task.task_id)
+                return agent
+        if agent is None:
+            agent = self._select_agent(task)
+        if agent:
+            agent.active_tasks.add(task.task_id)
+            self.agent_index.update(agent)
+            # Counted once the placement is committed, not per refused recheck
+            if placement:
+                affinity_placement_counter.labels(outcome=placement).inc()
+                self.affinity.unpin(task.task_id)
+        return agent
+    
+    def _admit_with_affinity(self, task: EnhancedAgentTask) -> Tuple[Any, str]:
+        """
+        Warm agent for the task, DEFERRED, or None for normal selection,
+        with the placement outcome (warm, deferred, cold).
+        
+        A busy warm agent is waited for only while no eligible agent is idle;
+        an idle agent runs the task cold rather than sit unused.
+        """
+        warm = self.agents.get(self.affinity.preferred_agent(task) or "")
+        if warm is None:
+            return None, 'cold'
+        if self.agent_index.can_serve(warm, task.task_type):
+            return warm, 'warm'
+        
+        # Only a full warm agent is worth waiting for
+        warm_is_full = (
+            self.agent_index.serves(warm.agent_id, task.task_type) and
+            warm.status in (AgentStatus.AVAILABLE, AgentStatus.BUSY) and
+            not (warm.circuit_breaker and warm.circuit_breaker.is_open)
+        )
+        if warm_is_full and not self.agent_index.has_idle(task.task_type) and self.affinity.defer(warm.agent_id, task):
+            return DEFERRED, 'deferred'
+        return None, 'cold'
+    
+    async def _release_agent_slot(self, agent: EnhancedAgentInstance, task_id: str):
+        """Free an agent slot and wake processors waiting for capacity"""
+        agent.active_tasks.discard(task_id)
+        self.agent_index.update(agent)
+        await self.ready_queue.notify_capacity()
+        self._serve_local_queue(agent)
+    
+    def _serve_local_queue(self, agent: EnhancedAgentInstance):
+        """
+        Give free slots on an agent to its own local queue first, otherwise
+        to work stolen from the longest other local queue.
+        """
+        if not config.enable_affinity_scheduling:
+            return
+        
+        while self._is_schedulable(agent):
+            task = self.affinity.next_task(
+                agent.agent_id,
+                lambda queued: self.agent_index.can_serve(agent, queued.task_type)
+            )
+            if task is None:
+                return
+            if task.task_id not in self.pending_tasks:
+                # Cancelled or expired while parked
+                continue
+            
+            agent.active_tasks.add(task.task_id)
+            self.agent_index.update(agent)
+            dispatch = asyncio.create_task(self._run_admitted_task(task, agent))
+            self._local_dispatches.add(dispatch)
+            dispatch.add_done_callback(self._local_dispatches.discard)
+    
+    def _select_agent(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
         """Select agent based on configured scheduling strategy"""
         strategy = config.scheduling_strategy
         
         if strategy == SchedulingStrategy.COST_BASED and config.feature_flags["cost_based_scheduling"]:
-            return await self._cost_based_scheduling(task)
+            return self._cost_based_scheduling(task)
         elif strategy == SchedulingStrategy.PERFORMANCE_BASED:
             return self._performance_based_scheduling(task)
         elif strategy == SchedulingStrategy.ROUND_ROBIN:
@@ -580,7 +795,7 @@ class EnhancedAgentManager:
         else:
             return self._least_busy_scheduling(task)
     
-    async def _cost_based_scheduling(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
+    def _cost_based_scheduling(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
         """Cost-optimized agent selection"""
         eligible_agents = self._get_eligible_agents(task.task_type)
         if not eligible_agents:
@@ -593,8 +808,13 @@ class EnhancedAgentManager:
             utilization_penalty = len(agent.active_tasks) / agent.max_concurrent_tasks
             complexity_factor = task.estimated_complexity
             
-            # Estimate task completion time based on agent's average
-            estimated_time = agent.average_task_time * complexity_factor
+            # Estimate task completion time from learned durations for this agent type
+            if config.feature_flags["adaptive_timeout"]:
+                estimated_time = self.duration_estimator.estimate(
+                    task.task_type, complexity_factor, agent.agent_type.value
+                )
+            else:
+                estimated_time = agent.average_task_time * complexity_factor
             
             # Total cost = hourly rate * estimated hours * utilization penalty
             total_cost = base_cost * (estimated_time / 3600) * (1 + utilization_penalty)
@@ -611,52 +831,25 @@ class EnhancedAgentManager:
         return min(eligible_agents, key=cost_score)
     
     def _performance_based_scheduling(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
-        """Performance-optimized agent selection"""
-        eligible_agents = self._get_eligible_agents(task.task_type)
-        if not eligible_agents:
-            return None
-        
-        # Select agent with best performance score and capacity
-        return max(eligible_agents, 
-                  key=lambda a: (a.performance_score * a.current_capacity, 
-                               -a.error_rate,
-                               -len(a.active_tasks)))
+        """Performance-optimized agent selection (best score and capacity)"""
+        return self.agent_index.select(task.task_type)
     
     def _round_robin_scheduling(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
-        """Simple round-robin scheduling"""
-        eligible_agents = self._get_eligible_agents(task.task_type)
-        if not eligible_agents:
-            return None
-        
-        # Sort by tasks completed to ensure even distribution
-        return min(eligible_agents, key=lambda a: a.tasks_completed)
+        """Simple round-robin scheduling (fewest tasks completed)"""
+        return self.agent_index.select(task.task_type)
     
     def _least_busy_scheduling(self, task: EnhancedAgentTask) -> Optional[EnhancedAgentInstance]:
         """Select least busy agent"""
-        eligible_agents = self._get_eligible_agents(task.task_type)
-        if not eligible_agents:
-            return None
-        
-        return min(eligible_agents, key=lambda a: len(a.active_tasks) / a.max_concurrent_tasks)
+        return self.agent_index.select(task.task_type)
     
     def _get_eligible_agents(self, task_type: str) -> List[EnhancedAgentInstance]:
         """Get agents eligible for a task type"""
-        eligible_agent_types = self.task_routing_rules.get(task_type, [])
-        
-        agents = []
-        for agent in self.agents.values():
-            if (agent.agent_type in eligible_agent_types and
-                agent.status in [AgentStatus.AVAILABLE, AgentStatus.BUSY] and
-                task_type in agent.capabilities and
-                len(agent.active_tasks) < agent.max_concurrent_tasks):
-                
-                # Check circuit breaker if enabled
-                if agent.circuit_breaker and agent.circuit_breaker.is_open:
-                    continue
-                    
-                agents.append(agent)
-        
-        return agents
+        return self.agent_index.eligible(task_type)
+    
+    @staticmethod
+    def _is_schedulable(agent: EnhancedAgentInstance) -> bool:
+        return (agent.status in (AgentStatus.AVAILABLE, AgentStatus.BUSY) and
+                len(agent.active_tasks) < agent.max_concurrent_tasks)
     
     async def _assign_task_to_agent(self, 
                                    task: EnhancedAgentTask, 
@@ -665,16 +858,17 @@ class EnhancedAgentManager:
         """Assign task to agent with full tracking"""
         task.assigned_to = agent.agent_id
         task.started_at = datetime.utcnow()
+        self.completions.dispatched(task.task_id)
         agent.active_tasks.add(task.task_id)
+        self.agent_index.update(agent)
+        if config.enable_affinity_scheduling:
+            self.affinity.record_placement(task, agent.agent_id)
         
         # Update database
-        if self.db_pool:
-            async with self.db_pool.acquire() as conn:
-                await conn.execute('''
-                    UPDATE tasks 
-                    SET status = 'assigned', assigned_to = $1 
-                    WHERE task_id = $2
-                ''', uuid.UUID(agent.agent_id), uuid.UUID(task.task_id))
+        if self.task_journal:
+            await self.task_journal.update_task(
+                task.task_id, status='assigned', assigned_to=uuid.UUID(agent.agent_id)
+            )
         
         # Update metrics
         task_assigned_counter.labels(
@@ -683,16 +877,22 @@ class EnhancedAgentManager:
         ).inc()
         pending_tasks_per_agent_gauge.labels(agent_type=agent.agent_type.value).inc()
         
-        # Load context from shared memory
+        # Load context from shared memory in one round-trip
         context = {}
-        for key in task.context_keys:
-            value = await self.memory_store.get(key)
-            if value:
-                context[key] = value
+        if task.context_keys:
+            load_start = time.perf_counter()
+            try:
+                values = await self.context_reader.get_multiple(task.context_keys)
+                context = {key: value for key, value in values.items() if value}
+            except Exception as e:
+                logger.error("Failed to load task context", task_id=task.task_id, error=str(e))
+            context_load_histogram.observe(time.perf_counter() - load_start)
         
         # Add parent task results if available
-        if task.parent_task_id and task.parent_task_id in self.completed_tasks:
-            context['parent_result'] = self.completed_tasks[task.parent_task_id]
+        if task.parent_task_id:
+            found, parent_result = await self.completed_tasks.lookup(task.parent_task_id)
+            if found:
+                context['parent_result'] = parent_result
         
         # Execute task via gRPC with circuit breaker
         if agent.agent_id in self.agent_clients:
@@ -716,6 +916,7 @@ class EnhancedAgentManager:
                 # Update agent error rate
                 agent.tasks_failed += 1
                 agent.error_rate = agent.tasks_failed / (agent.tasks_completed + agent.tasks_failed)
+                await self._release_agent_slot(agent, task.task_id)
                 
                 await self._handle_task_failure(task, str(e), span)
     
@@ -724,76 +925,164 @@ class EnhancedAgentManager:
                                     task: EnhancedAgentTask,
                                     context: Dict[str, Any],
                                     span: Optional[trace.Span]):
-        """Execute task on agent with timeout and checkpointing"""
-        client = self.agent_clients[agent.agent_id]
-        
-        # Set timeout based on task complexity and configuration
-        timeout = min(
-            config.fault_tolerance.task_timeout_seconds * task.estimated_complexity,
-            3600  # Max 1 hour
-        )
+        """Execute task on agent with timeout, checkpointing and straggler hedging"""
+        timeout = self._task_timeout(task, agent)
         
         # Add checkpointing if enabled
-        checkpoint_task = None
         if config.fault_tolerance.enable_task_checkpointing:
-            checkpoint_task = asyncio.create_task(
-                self._checkpoint_task_periodically(task, agent)
-            )
+            self.checkpoints.track(task.task_id, agent.agent_id, task.checkpoint_data)
         
         try:
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                client.execute_task(
-                    task_id=task.task_id,
-                    task_type=task.task_type,
-                    payload=task.payload,
-                    context=context,
-                    checkpoint_data=task.checkpoint_data
+            # Execute with timeout; a straggler gets a duplicate on another agent
+            outcome = await run_hedged(
+                agent,
+                self._run_task_attempt(agent, task, context),
+                timeout=timeout,
+                abandon=lambda attempt_agent, still_running: self._abandon_attempt(
+                    task.task_id, attempt_agent, still_running
                 ),
-                timeout=timeout
+                hedge_after=self._hedge_delay(task, timeout),
+                start_hedge=lambda: self._start_hedge(task, agent, context),
+                task_type=task.task_type
             )
             
-            # Task completed successfully
-            await self._handle_task_completion(task, agent, result, span)
+            if not outcome.hedged:
+                # Task completed successfully
+                await self._handle_task_completion(task, agent, outcome.result, span)
+                return
+            
+            # Two attempts ran; record the result exactly once under the task lock
+            async with self._acquire_task_lock(task.task_id) as lock_acquired:
+                if lock_acquired and task.task_id in self.pending_tasks:
+                    await self._handle_task_completion(task, outcome.winner, outcome.result, span)
+                else:
+                    logger.warning("Hedged result already recorded", task_id=task.task_id)
+                    await self._release_agent_slot(outcome.winner, task.task_id)
             
         except asyncio.TimeoutError:
             logger.error("Task timeout", task_id=task.task_id, timeout=timeout)
+            await self._release_agent_slot(agent, task.task_id)
             await self._handle_task_failure(task, f"Timeout after {timeout}s", span)
             
         finally:
-            if checkpoint_task:
-                checkpoint_task.cancel()
+            if config.fault_tolerance.enable_task_checkpointing:
+                # A retry resumes from the last state seen
+                task.checkpoint_data = self.checkpoints.untrack(task.task_id)
     
-    async def _checkpoint_task_periodically(self, 
-                                          task: EnhancedAgentTask,
-                                          agent: EnhancedAgentInstance):
-        """Periodically save task checkpoint data"""
-        interval = config.fault_tolerance.checkpoint_interval_seconds
+    async def _run_task_attempt(self,
+                                agent: EnhancedAgentInstance,
+                                task: EnhancedAgentTask,
+                                context: Dict[str, Any]) -> Any:
+        """Run one attempt of a task on an agent; agent-reported failures raise"""
+        # Small tasks of batchable types share one RPC per agent
+        if self._should_batch(task):
+            result = await self.task_batcher.submit(agent.agent_id, task.task_type, {
+                'task_id': task.task_id,
+                'task_type': task.task_type,
+                'payload': task.payload,
+                'context': context,
+                'priority': task.priority
+            })
+        else:
+            result = await self.agent_clients[agent.agent_id].execute_task(
+                task_id=task.task_id,
+                task_type=task.task_type,
+                payload=task.payload,
+                context=context,
+                checkpoint_data=task.checkpoint_data
+            )
         
-        while True:
-            await asyncio.sleep(interval)
-            
+        if isinstance(result, dict) and result.get('success') is False:
+            raise Exception(result.get('error_message') or "Agent reported task failure")
+        return result
+    
+    def _hedge_delay(self, task: EnhancedAgentTask, timeout: float) -> Optional[float]:
+        """Run time after which a task counts as a straggler, if known"""
+        if not config.performance.enable_hedging:
+            return None
+        return self.duration_estimator.quantile(
+            task.task_type,
+            config.performance.hedge_quantile,
+            complexity=task.estimated_complexity,
+            min_samples=config.performance.hedge_min_samples
+        )
+    
+    def _start_hedge(self,
+                     task: EnhancedAgentTask,
+                     primary: EnhancedAgentInstance,
+                     context: Dict[str, Any]):
+        """Reserve another eligible agent and start a duplicate attempt on it"""
+        candidates = [
+            agent for agent in self.agent_index.eligible(task.task_type)
+            if agent.agent_id != primary.agent_id and agent.agent_id in self.agent_clients
+        ]
+        if not candidates:
+            return None
+        
+        agent = min(candidates, key=least_busy_key)
+        agent.active_tasks.add(task.task_id)
+        self.agent_index.update(agent)
+        logger.info("Hedging straggler task",
+                   task_id=task.task_id,
+                   primary_agent=primary.agent_id,
+                   hedge_agent=agent.agent_id)
+        return agent, self._run_task_attempt(agent, task, context)
+    
+    async def _abandon_attempt(self,
+                               task_id: str,
+                               agent: EnhancedAgentInstance,
+                               still_running: bool):
+        """Cancel a losing attempt on its agent and free the slot it held"""
+        if still_running and agent.agent_id in self.agent_clients:
             try:
-                # Get checkpoint from agent
-                client = self.agent_clients[agent.agent_id]
-                checkpoint = await client.get_task_checkpoint(task.task_id)
-                
-                if checkpoint:
-                    task.checkpoint_data = checkpoint
-                    
-                    # Save to database
-                    if self.db_pool:
-                        async with self.db_pool.acquire() as conn:
-                            await conn.execute('''
-                                UPDATE tasks 
-                                SET checkpoint_data = $1 
-                                WHERE task_id = $2
-                            ''', json.dumps(checkpoint), uuid.UUID(task.task_id))
-                            
+                await self.agent_clients[agent.agent_id].cancel_task(
+                    task_id, reason="Speculative duplicate lost"
+                )
             except Exception as e:
-                logger.warning("Failed to checkpoint task", 
-                             task_id=task.task_id, 
-                             error=str(e))
+                logger.warning("Failed to cancel losing attempt",
+                             task_id=task_id, agent_id=agent.agent_id, error=str(e))
+        await self._release_agent_slot(agent, task_id)
+    
+    def _task_timeout(self, task: EnhancedAgentTask, agent: EnhancedAgentInstance) -> float:
+        """Timeout from learned run times when available, else from configuration"""
+        timeout = config.fault_tolerance.task_timeout_seconds * task.estimated_complexity
+        
+        if config.feature_flags["adaptive_timeout"]:
+            learned = self.duration_estimator.quantile(
+                task.task_type,
+                config.fault_tolerance.adaptive_timeout_quantile,
+                complexity=task.estimated_complexity,
+                agent_type=agent.agent_type.value,
+                min_samples=config.fault_tolerance.adaptive_timeout_min_samples
+            )
+            if learned is not None:
+                timeout = max(learned * config.fault_tolerance.adaptive_timeout_margin,
+                              config.fault_tolerance.adaptive_timeout_min_seconds)
+        
+        return min(timeout, 3600)  # Max 1 hour
+    
+    def _should_batch(self, task: EnhancedAgentTask) -> bool:
+        return (config.performance.enable_task_batching and
+                task.task_type in config.performance.batchable_task_types and
+                task.estimated_complexity <= config.performance.batch_max_complexity)
+    
+    async def _dispatch_task_batch(self,
+                                   agent_id: str,
+                                   task_type: str,
+                                   requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Send one batched RPC and key the results by task_id for demultiplexing"""
+        client = self.agent_clients[agent_id]
+        results = await client.execute_task_batch(
+            requests, timeout=config.fault_tolerance.task_timeout_seconds
+        )
+        return {result['task_id']: result for result in results}
+    
+    async def _fetch_checkpoints(self, agent_id: str, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Latest checkpoints of an agent's running tasks, in one RPC"""
+        client = self.agent_clients.get(agent_id)
+        if not client:
+            return {}
+        return await client.get_task_checkpoints(task_ids)
     
     async def _handle_task_completion(self,
                                      task: EnhancedAgentTask,
@@ -803,6 +1092,8 @@ class EnhancedAgentManager:
         """Handle successful task completion"""
         task.completed_at = datetime.utcnow()
         duration = (task.completed_at - task.started_at).total_seconds()
+        if task.deadline:
+            self.deadline_monitor.record_completion(task.deadline, task.completed_at)
         
         # Update agent statistics
         agent.active_tasks.remove(task.task_id)
@@ -812,23 +1103,31 @@ class EnhancedAgentManager:
             / agent.tasks_completed
         )
         agent.performance_score = min(1.0, agent.performance_score * 1.01)  # Improve score
+        self.duration_estimator.observe(
+            task.task_type, duration, task.estimated_complexity, agent.agent_type.value
+        )
+        self.agent_index.update(agent)
+        await self.ready_queue.notify_capacity()
+        self._serve_local_queue(agent)
         
-        # Store result
-        self.completed_tasks[task.task_id] = result
+        # Store result; the task will never resume from a checkpoint
+        self.completed_tasks.put(task.task_id, result)
         del self.pending_tasks[task.task_id]
+        self.affinity.unpin(task.task_id)
+        self.checkpoints.discard(task.task_id)
+        self.aggregates.task_removed(task.task_type)
+        self.completions.resolve(task.task_id, result)
         
         # Update database
-        if self.db_pool:
-            async with self.db_pool.acquire() as conn:
-                await conn.execute('''
-                    UPDATE tasks 
-                    SET status = 'completed', completed_at = $1, result = $2 
-                    WHERE task_id = $3
-                ''', task.completed_at, json.dumps(result), uuid.UUID(task.task_id))
+        if self.task_journal:
+            await self.task_journal.update_task(
+                task.task_id, status='completed',
+                completed_at=task.completed_at, result=json.dumps(result)
+            )
         
         # Store result in shared memory if needed
         if "output_key" in task.payload:
-            await self.memory_store.set(task.payload["output_key"], result)
+            await self.context_reader.set(task.payload["output_key"], result)
         
         # Update metrics
         task_completed_counter.labels(
@@ -841,6 +1140,7 @@ class EnhancedAgentManager:
         
         # Process dependent tasks
         await self._process_dependent_tasks(task.task_id)
+        self._notify_task_finished(task.task_id, True)
         
         # Update span
         if span:
@@ -873,38 +1173,91 @@ class EnhancedAgentManager:
         # Check if should retry
         if task.retry_count < task.max_retries:
             task.retry_count += 1
-            logger.info("Retrying task", task_id=task.task_id, retry=task.retry_count)
             
-            # Exponential backoff
-            await asyncio.sleep(min(2 ** task.retry_count, 60))
-            await self._enqueue_task(task)
+            # Exponential backoff with jitter
+            delay = self.retry_scheduler.schedule(task, task.retry_count)
+            logger.info("Retrying task", task_id=task.task_id, retry=task.retry_count, delay=delay)
         else:
             # Send to dead-letter queue
             await self._send_to_dead_letter_queue(task, error)
             
             # Mark as failed
-            self.completed_tasks[task.task_id] = {"error": error, "status": "failed"}
+            self.completed_tasks.put(task.task_id, {"error": error, "status": "failed"})
             del self.pending_tasks[task.task_id]
+            self.affinity.unpin(task.task_id)
+            self.aggregates.task_removed(task.task_type)
+            self.completions.resolve(task.task_id, {"error": error, "status": "failed"})
             
             # Update database
-            if self.db_pool:
-                async with self.db_pool.acquire() as conn:
-                    await conn.execute('''
-                        UPDATE tasks 
-                        SET status = 'failed', error = $1, completed_at = $2 
-                        WHERE task_id = $3
-                    ''', error, datetime.utcnow(), uuid.UUID(task.task_id))
+            if self.task_journal:
+                await self.task_journal.update_task(
+                    task.task_id, status='failed',
+                    error=error, completed_at=datetime.utcnow()
+                )
             
-            # Cancel dependent tasks if configured
-            if config.feature_flags["dag_optimization"]:
-                cancelled_tasks = self.task_dag.should_cancel_descendants(task.task_id)
-                for cancelled_id in cancelled_tasks:
-                    if cancelled_id in self.pending_tasks:
-                        await self._cancel_task(cancelled_id, f"Parent task {task.task_id} failed")
+            await self._propagate_failure(task.task_id)
+            self._notify_task_finished(task.task_id, False)
+    
+    async def _propagate_failure(self, failed_task_id: str):
+        """Record a failed dependency; dependants stay blocked unless cancelled"""
+        self.task_dag.mark_finished(failed_task_id, succeeded=False)
+        
+        # Cancel dependent tasks if configured
+        if config.feature_flags["dag_optimization"]:
+            cancelled_tasks = self.task_dag.should_cancel_descendants(failed_task_id)
+            for cancelled_id in cancelled_tasks:
+                if cancelled_id in self.pending_tasks:
+                    await self._cancel_task(cancelled_id, f"Parent task {failed_task_id} failed")
+        
+        self.task_dag.collect_finished(failed_task_id)
+    
+    async def _requeue_delayed_task(self, task: EnhancedAgentTask):
+        """Requeue a task once its retry backoff has elapsed"""
+        # Skip tasks cancelled or finished while waiting
+        if task.task_id in self.pending_tasks:
+            await self._enqueue_task(task)
+    
+    async def _escalate_task(self, task_id: str):
+        """Promote a task that is still waiting shortly before its deadline"""
+        task = self.pending_tasks.get(task_id)
+        if not task or task.priority == TaskPriority.CRITICAL.value:
+            return
+        
+        if not await self.ready_queue.reprioritize(task, TaskPriority.CRITICAL.value):
+            if self.task_dag.is_ready(task_id):
+                # Running or waiting for a retry; leave it alone
+                return
+            # Still blocked on dependencies; takes effect when enqueued
+            task.priority = TaskPriority.CRITICAL.value
+        
+        logger.info("Task escalated near deadline", task_id=task_id, deadline=str(task.deadline))
+    
+    async def _expire_task(self, task_id: str):
+        """Cancel a task whose deadline passed before it was dispatched"""
+        task = self.pending_tasks.get(task_id)
+        if not task or not config.expire_missed_deadlines:
+            return
+        
+        # Running tasks finish and are scored as missed instead
+        queued = await self.ready_queue.remove(task) or self.affinity.remove(task)
+        if not queued and self.task_dag.is_ready(task_id):
+            return
+        
+        self.deadline_monitor.record_expired()
+        cancelled_tasks = set()
+        if config.feature_flags["dag_optimization"]:
+            cancelled_tasks = self.task_dag.should_cancel_descendants(task_id)
+        
+        await self._cancel_task(task_id, "Deadline passed before dispatch")
+        for cancelled_id in cancelled_tasks:
+            if cancelled_id in self.pending_tasks:
+                await self._cancel_task(cancelled_id, f"Parent task {task_id} missed its deadline")
     
     async def _send_to_dead_letter_queue(self, task: EnhancedAgentTask, error: str):
         """Send failed task to dead-letter queue for manual processing"""
         if not self.redis_client or not config.fault_tolerance.enable_dead_letter_queue:
+            # Checkpoints are only kept for tasks that can be reprocessed
+            self.checkpoints.discard(task.task_id)
             return
         
         try:
@@ -926,6 +1279,7 @@ class EnhancedAgentManager:
             
         except Exception as e:
             logger.error("Failed to send task to DLQ", task_id=task.task_id, error=str(e))
+            self.checkpoints.discard(task.task_id)
     
     async def _cancel_task(self, task_id: str, reason: str):
         """Cancel a pending task"""
@@ -935,86 +1289,126 @@ class EnhancedAgentManager:
         task = self.pending_tasks[task_id]
         
         # Mark as cancelled
-        self.completed_tasks[task_id] = {"status": "cancelled", "reason": reason}
+        self.completed_tasks.put(task_id, {"status": "cancelled", "reason": reason})
         del self.pending_tasks[task_id]
+        self.affinity.unpin(task_id)
+        self.aggregates.task_removed(task.task_type)
+        self.completions.resolve(task_id, {"status": "cancelled", "reason": reason})
+        self.checkpoints.discard(task_id)
         
         # Update database
-        if self.db_pool:
-            async with self.db_pool.acquire() as conn:
-                await conn.execute('''
-                    UPDATE tasks 
-                    SET status = 'cancelled', error = $1, completed_at = $2 
-                    WHERE task_id = $3
-                ''', reason, datetime.utcnow(), uuid.UUID(task_id))
+        if self.task_journal:
+            await self.task_journal.update_task(
+                task_id, status='cancelled',
+                error=reason, completed_at=datetime.utcnow()
+            )
+        
+        self.task_dag.mark_finished(task_id, succeeded=False)
+        self.task_dag.collect_finished(task_id)
+        self._notify_task_finished(task_id, False)
         
         logger.info("Task cancelled", task_id=task_id, reason=reason)
     
     async def _process_dependent_tasks(self, completed_task_id: str):
-        """Process tasks that depend on the completed task"""
-        dependent_tasks = self.task_dependencies.get(completed_task_id, set())
-        
-        for dep_task_id in dependent_tasks:
+        """Enqueue tasks whose last unsatisfied dependency just completed"""
+        for dep_task_id in self.task_dag.mark_finished(completed_task_id):
             if dep_task_id in self.pending_tasks:
-                task = self.pending_tasks[dep_task_id]
-                
-                # Check if all dependencies are satisfied
-                if all(dep in self.completed_tasks for dep in task.dependencies):
-                    await self._enqueue_task(task)
+                await self._enqueue_task(self.pending_tasks[dep_task_id])
+        
+        self.task_dag.collect_finished(completed_task_id)
     
-    async def _monitor_agent_heartbeats(self):
-        """Enhanced heartbeat monitoring with health checks"""
-        while self._running:
+    def add_task_finished_listener(self, listener: Callable[[str, bool], None]):
+        """Call ``listener(task_id, succeeded)`` whenever a task reaches a final state"""
+        self._task_finished_listeners.append(listener)
+    
+    def _notify_task_finished(self, task_id: str, succeeded: bool):
+        for listener in self._task_finished_listeners:
             try:
-                current_time = datetime.utcnow()
-                
-                for agent in list(self.agents.values()):
-                    time_since_heartbeat = (current_time - agent.last_heartbeat).total_seconds()
-                    
-                    # Perform health check if configured
-                    if (config.fault_tolerance.enable_circuit_breaker and 
-                        agent.agent_id in self.agent_clients):
-                        
-                        try:
-                            # gRPC health check
-                            client = self.agent_clients[agent.agent_id]
-                            health_status = await asyncio.wait_for(
-                                client.check_health(),
-                                timeout=5.0
-                            )
-                            
-                            if health_status.status == "SERVING":
-                                agent.last_heartbeat = current_time
-                                if agent.status == AgentStatus.OFFLINE:
-                                    agent.status = AgentStatus.AVAILABLE
-                                    logger.info("Agent back online", agent_id=agent.agent_id)
-                            else:
-                                agent.status = AgentStatus.ERROR
-                                
-                        except Exception as e:
-                            logger.warning("Agent health check failed", 
-                                         agent_id=agent.agent_id, 
-                                         error=str(e))
-                    
-                    # Mark offline if no heartbeat
-                    if (time_since_heartbeat > config.agent_heartbeat_timeout and 
-                        agent.status != AgentStatus.OFFLINE):
-                        
-                        logger.warning("Agent offline", agent_id=agent.agent_id)
-                        agent.status = AgentStatus.OFFLINE
-                        
-                        # Reassign active tasks
-                        for task_id in list(agent.active_tasks):
-                            if task_id in self.pending_tasks:
-                                task = self.pending_tasks[task_id]
-                                task.assigned_to = None
-                                agent.active_tasks.remove(task_id)
-                                await self._enqueue_task(task)
-                
-                await asyncio.sleep(config.agent_health_check_interval)
-                
+                listener(task_id, succeeded)
             except Exception as e:
-                logger.error("Error in heartbeat monitor", error=str(e))
-                await asyncio.sleep(10)
+                logger.error("Task finished listener failed", task_id=task_id, error=str(e))
+    
+    async def mark_external_task_finished(self, task_id: str, succeeded: bool):
+        """
+        Resolve a dependency on a task this manager does not own.
+        
+        Used in sharded mode when an upstream task finishes on another shard;
+        tasks unknown to the local DAG are ignored.
+        """
+        if task_id not in self.task_dag or task_id in self.pending_tasks:
+            return
+        
+        if succeeded:
+            await self._process_dependent_tasks(task_id)
+        else:
+            await self._propagate_failure(task_id)
+    
+    async def _consume_heartbeats(self, agent_id: str):
+        """Read an agent's heartbeat stream, reopening it if it drops"""
+        while agent_id in self.agent_clients:
+            try:
+                async for heartbeat in self.agent_clients[agent_id].stream_heartbeats():
+                    await self._record_heartbeat(agent_id, heartbeat)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Heartbeat stream closed", agent_id=agent_id, error=str(e))
+            
+            # Liveness probes cover the gap until the stream is back
+            await asyncio.sleep(config.agent_health_check_interval)
+    
+    async def _record_heartbeat(self, agent_id: str, heartbeat: Dict[str, Any]):
+        """Apply a pushed heartbeat to the agent's state"""
+        agent = self.agents.get(agent_id)
+        if not agent:
+            return
+        
+        agent.last_heartbeat = datetime.utcnow()
+        agent.resource_usage = heartbeat.get('resource_usage') or agent.resource_usage
+        if self.liveness.heartbeat(agent_id) or agent.status == AgentStatus.OFFLINE:
+            await self._mark_agent_online(agent_id)
+    
+    async def _probe_agent(self, agent_id: str) -> bool:
+        """Active health check for an agent whose heartbeats lapsed"""
+        client = self.agent_clients.get(agent_id)
+        if not client:
+            return False
+        return await client.check_health(agent_id, timeout=config.agent_probe_timeout_seconds)
+    
+    async def _mark_agent_online(self, agent_id: str):
+        agent = self.agents.get(agent_id)
+        if not agent:
+            return
+        
+        agent.last_heartbeat = datetime.utcnow()
+        if agent.status == AgentStatus.OFFLINE:
+            agent.status = AgentStatus.AVAILABLE
+            self.agent_index.update(agent)
+            await self.ready_queue.notify_capacity()
+            self._serve_local_queue(agent)
+            logger.info("Agent back online", agent_id=agent_id)
+    
+    async def _mark_agent_offline(self, agent_id: str):
+        agent = self.agents.get(agent_id)
+        if not agent or agent.status == AgentStatus.OFFLINE:
+            return
+        
+        logger.warning("Agent offline", agent_id=agent_id)
+        agent.status = AgentStatus.OFFLINE
+        
+        # Reassign active tasks
+        for task_id in list(agent.active_tasks):
+            if task_id in self.pending_tasks:
+                task = self.pending_tasks[task_id]
+                task.assigned_to = None
+                agent.active_tasks.remove(task_id)
+                await self._enqueue_task(task)
+        # Tasks parked for this agent would otherwise wait for a steal; its
+        # warm keys stay in case it comes back
+        for task in self.affinity.drain_agent(agent_id):
+            if task.task_id in self.pending_tasks:
+                await self._enqueue_task(task)
+        self.agent_index.update(agent)
     
     async def _autoscale_agents(self):
         """Dynamic autoscaling based on load and performance"""
@@ -1033,33 +1427,24 @@ class EnhancedAgentManager:
                         (current_time - last_decision).total_seconds() < config.autoscaling.cooldown_seconds):
                         continue
                     
-                    # Calculate scaling metrics
-                    agents_of_type = [a for a in self.agents.values() if a.agent_type == agent_type]
-                    if not agents_of_type:
+                    # Calculate scaling metrics from the running aggregates
+                    agent_count = self.aggregates.agents_of(agent_type)
+                    if not agent_count:
                         continue
                     
-                    # Calculate average utilization
-                    total_active = sum(len(a.active_tasks) for a in agents_of_type)
-                    total_capacity = sum(a.max_concurrent_tasks for a in agents_of_type)
-                    utilization = total_active / total_capacity if total_capacity > 0 else 0
-                    
-                    # Calculate pending tasks for this agent type
-                    pending_count = sum(1 for t in self.pending_tasks.values() 
-                                      if t.task_type in self._get_task_types_for_agent(agent_type))
-                    
-                    # Calculate pending tasks per agent
-                    pending_per_agent = pending_count / len(agents_of_type) if agents_of_type else 0
+                    utilization = self.aggregates.utilization(agent_type)
+                    pending_per_agent = self.aggregates.pending_for(agent_type) / agent_count
                     
                     # Update metrics for HPA
                     pending_tasks_per_agent_gauge.labels(agent_type=agent_type.value).set(pending_per_agent)
-                    agent_pool_size_gauge.labels(agent_type=agent_type.value).set(len(agents_of_type))
+                    agent_pool_size_gauge.labels(agent_type=agent_type.value).set(agent_count)
                     
                     # Store metrics for decision making
                     self.scaling_metrics[agent_type].append({
                         'timestamp': current_time,
                         'utilization': utilization,
                         'pending_per_agent': pending_per_agent,
-                        'agent_count': len(agents_of_type)
+                        'agent_count': agent_count
                     })
                     
                     # Make scaling decision
@@ -1071,7 +1456,8 @@ class EnhancedAgentManager:
                     should_scale_down = (
                         utilization < config.autoscaling.scale_down_threshold and
                         pending_per_agent < config.autoscaling.target_queue_depth * 0.5 and
-                        len(agents_of_type) > config.autoscaling.min_agents_per_type
+                        agent_count > max(config.autoscaling.min_agents_per_type,
+                                          self.forecast_agents_needed.get(agent_type, 0))
                     )
                     
                     if should_scale_up:
@@ -1091,7 +1477,7 @@ class EnhancedAgentManager:
                         # Scale up
                         scale_count = min(
                             config.autoscaling.scale_up_rate,
-                            config.autoscaling.max_agents_per_type - len(agents_of_type)
+                            config.autoscaling.max_agents_per_type - agent_count
                         )
                         
                         for _ in range(scale_count):
@@ -1108,17 +1494,19 @@ class EnhancedAgentManager:
                         # Scale down
                         scale_count = min(
                             config.autoscaling.scale_down_rate,
-                            len(agents_of_type) - config.autoscaling.min_agents_per_type
+                            agent_count - max(config.autoscaling.min_agents_per_type,
+                                              self.forecast_agents_needed.get(agent_type, 0))
                         )
                         
                         # Select least busy agents for removal
                         agents_to_remove = sorted(
-                            agents_of_type,
+                            (a for a in self.agents.values() if a.agent_type == agent_type),
                             key=lambda a: len(a.active_tasks)
                         )[:scale_count]
                         
                         for agent in agents_to_remove:
                             agent.status = AgentStatus.DRAINING
+                            self.agent_index.update(agent)
                             asyncio.create_task(self._drain_and_remove_agent(agent.agent_id))
                         
                         self.last_scaling_decision[agent_type] = current_time
@@ -1137,23 +1525,90 @@ class EnhancedAgentManager:
         """Calculate current hourly cost of all agents"""
         total_cost = 0.0
         
-        for agent in self.agents.values():
+        for agent_type in AgentType:
             agent_cost = config.autoscaling.agent_cost_per_hour.get(
-                agent.agent_type.value, 10.0
+                agent_type.value, 10.0
             )
-            total_cost += agent_cost
+            total_cost += agent_cost * self.aggregates.agents_of(agent_type)
         
         return total_cost
     
-    def _get_task_types_for_agent(self, agent_type: AgentType) -> Set[str]:
-        """Get task types that can be handled by an agent type"""
-        task_types = set()
+    def _start_predictive_scaling(self):
+        """Start forecasting demand from Prometheus features"""
+        # Imported here so the forecasting dependencies are only needed when enabled
+        from .predictive_scaling import FeatureExtractor, WorkloadForecaster
+        
+        self.feature_extractor = FeatureExtractor(config.observability.prometheus_url)
+        self.workload_forecaster = WorkloadForecaster(
+            [agent_type.value for agent_type in AgentType],
+            horizon_minutes=config.autoscaling.predictive_horizon_minutes,
+            min_history=config.autoscaling.predictive_min_history
+        )
+        self._predictive_scaling_task = asyncio.create_task(self._predictive_scaling())
+    
+    async def _predictive_scaling(self):
+        """Pre-warm agents ahead of forecast demand"""
+        while self._running:
+            try:
+                features = await self.feature_extractor.extract_features(datetime.utcnow())
+                self.workload_forecaster.observe(features)
+                
+                for agent_type in AgentType:
+                    forecast = self.workload_forecaster.forecast(agent_type.value)
+                    if forecast is None:
+                        continue
+                    
+                    await self._prewarm_agents(agent_type, forecast)
+                
+            except Exception as e:
+                logger.error("Error in predictive scaling", error=str(e))
+            
+            await asyncio.sleep(config.autoscaling.predictive_interval_seconds)
+    
+    async def _prewarm_agents(self, agent_type: AgentType, forecast):
+        """Spawn the agents a forecast calls for that are not running yet"""
+        agent_count = self.aggregates.agents_of(agent_type)
+        slots_per_agent = (
+            self.aggregates.capacity[agent_type] / agent_count if agent_count else 1.0
+        )
+        needed = min(
+            forecast.agents_needed(config.autoscaling.target_queue_depth, slots_per_agent),
+            config.autoscaling.max_agents_per_type
+        )
+        self.forecast_agents_needed[agent_type] = needed
+        forecast_agents_needed_gauge.labels(agent_type=agent_type.value).set(needed)
         
-        for task_type, agent_types in self.task_routing_rules.items():
-            if agent_type in agent_types:
-                task_types.add(task_type)
+        scale_count = min(needed - agent_count, config.autoscaling.scale_up_rate)
+        if scale_count <= 0:
+            return
+        
+        last_decision = self.last_scaling_decision.get(agent_type)
+        current_time = datetime.utcnow()
+        if (last_decision and
+            (current_time - last_decision).total_seconds() < config.autoscaling.cooldown_seconds):
+            return
+        
+        if config.autoscaling.cost_optimization_enabled:
+            agent_cost = config.autoscaling.agent_cost_per_hour.get(agent_type.value, 10.0)
+            affordable = int(
+                (config.autoscaling.max_hourly_cost - self._calculate_current_hourly_cost()) // agent_cost
+            )
+            scale_count = min(scale_count, affordable)
+            if scale_count <= 0:
+                logger.warning("Pre-warming blocked by cost constraint",
+                             agent_type=agent_type.value)
+                return
         
-        return task_types
+        for _ in range(scale_count):
+            await self._spawn_new_agent(agent_type)
+        prewarmed_agents_counter.labels(agent_type=agent_type.value).inc(scale_count)
+        
+        self.last_scaling_decision[agent_type] = current_time
+        logger.info("Pre-warmed agents for forecast demand",
+                   agent_type=agent_type.value,
+                   count=scale_count,
+                   forecast_peak_pending=float(forecast.pending.max()),
+                   method=forecast.method)
     
     async def _spawn_new_agent(self, agent_type: AgentType):
         """Spawn a new agent instance (placeholder for actual implementation)"""
@@ -1196,18 +1651,16 @@ class EnhancedAgentManager:
         while self._running:
             try:
                 # Update queue depth metrics
+                depths = self.ready_queue.qsize_by_priority()
                 for priority in TaskPriority:
-                    queue = self.task_queues[priority]
-                    task_queue_depth_gauge.labels(priority=priority.name).set(queue.qsize())
+                    task_queue_depth_gauge.labels(priority=priority.name).set(depths[priority.value])
                 
                 # Update agent utilization
                 for agent_type in AgentType:
-                    agents_of_type = [a for a in self.agents.values() if a.agent_type == agent_type]
-                    if agents_of_type:
-                        total_active = sum(len(a.active_tasks) for a in agents_of_type)
-                        total_capacity = sum(a.max_concurrent_tasks for a in agents_of_type)
-                        utilization = total_active / total_capacity if total_capacity > 0 else 0
-                        agent_utilization_gauge.labels(agent_type=agent_type.value).set(utilization)
+                    if self.aggregates.agents_of(agent_type):
+                        agent_utilization_gauge.labels(agent_type=agent_type.value).set(
+                            self.aggregates.utilization(agent_type)
+                        )
                 
                 await asyncio.sleep(10)
                 
@@ -1224,7 +1677,7 @@ class EnhancedAgentManager:
                     continue
                 
                 # Calculate critical path
-                if self.task_dag.graph:
+                if self.task_dag:
                     critical_path, path_length = self.task_dag.get_critical_path()
                     dag_critical_path_length.set(path_length)
                     
@@ -1258,7 +1711,16 @@ class EnhancedAgentManager:
                 await asyncio.sleep(60)
     
     async def _gang_schedule_tasks(self, task_ids: List[str]):
-        """Schedule related tasks together for better performance"""
+        """
+        Schedule related tasks together for better performance.
+        
+        Tasks are not started here; each gets an affinity hint towards the
+        agent chosen for its group, honoured when it is admitted from the
+        ready queue (requires affinity scheduling).
+        """
+        if not config.enable_affinity_scheduling:
+            return
+        
         # Group tasks by type
         tasks_by_type = defaultdict(list)
         for task_id in task_ids:
@@ -1266,7 +1728,7 @@ class EnhancedAgentManager:
             if task:
                 tasks_by_type[task.task_type].append(task)
         
-        # Try to assign tasks of the same type to the same agent
+        # Co-locate tasks of the same type, filling agents with most capacity first
         for task_type, tasks in tasks_by_type.items():
             eligible_agents = self._get_eligible_agents(task_type)
             
@@ -1276,18 +1738,12 @@ class EnhancedAgentManager:
                 reverse=True
             )
             
-            # Assign tasks to agents with most capacity
-            for task in tasks:
-                if eligible_agents:
-                    agent = eligible_agents[0]
-                    if len(agent.active_tasks) < agent.max_concurrent_tasks:
-                        await self._assign_task_to_agent(task, agent, None)
-                    else:
-                        # Move to next agent
-                        eligible_agents.pop(0)
-                        if eligible_agents:
-                            agent = eligible_agents[0]
-                            await self._assign_task_to_agent(task, agent, None)
+            slots = [
+                agent for agent in eligible_agents
+                for _ in range(agent.max_concurrent_tasks - len(agent.active_tasks))
+            ]
+            for task, agent in zip(tasks, slots):
+                self.affinity.pin(task, agent.agent_id)
     
     async def register_agent(self,
                            agent_type: AgentType,
@@ -1321,11 +1777,16 @@ class EnhancedAgentManager:
         )
         
         self.agents[agent_id] = agent
+        self.agent_index.add(agent)
+        await self.ready_queue.notify_capacity()
+        self._serve_local_queue(agent)
         
         # Initialize gRPC client if endpoint provided
         if grpc_endpoint:
             self.agent_clients[agent_id] = AgentServiceClient(grpc_endpoint)
             await self.agent_clients[agent_id].connect()
+            self._heartbeat_streams[agent_id] = asyncio.create_task(self._consume_heartbeats(agent_id))
+        self.liveness.watch(agent_id)
         
         # Update metrics
         agent_pool_size_gauge.labels(agent_type=agent_type.value).inc()
@@ -1352,7 +1813,16 @@ class EnhancedAgentManager:
                 task.assigned_to = None
                 await self._enqueue_task(task)
         
-        # Close gRPC connection
+        # Tasks parked for this agent go back to the ready queue
+        for task in self.affinity.remove_agent(agent_id):
+            if task.task_id in self.pending_tasks:
+                await self._enqueue_task(task)
+        
+        # Close heartbeat stream and gRPC connection
+        self.liveness.forget(agent_id)
+        stream = self._heartbeat_streams.pop(agent_id, None)
+        if stream:
+            stream.cancel()
         if agent_id in self.agent_clients:
             await self.agent_clients[agent_id].close()
             del self.agent_clients[agent_id]
@@ -1361,13 +1831,17 @@ class EnhancedAgentManager:
         agent_pool_size_gauge.labels(agent_type=agent.agent_type.value).dec()
         
         del self.agents[agent_id]
+        self.agent_index.remove(agent_id)
         logger.info("Agent unregistered", agent_id=agent_id)
     
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get enhanced task status with additional metadata"""
-        # Check completed tasks
-        if task_id in self.completed_tasks:
-            result = self.completed_tasks[task_id]
+        # Check completed tasks, including results spilled out of memory
+        found, result = False, None
+        if task_id not in self.pending_tasks:
+            found, result = await self.completed_tasks.lookup(task_id)
+        
+        if found:
             status = "failed" if isinstance(result, dict) and "error" in result else "completed"
             
             # Get additional info from database
@@ -1384,7 +1858,7 @@ class EnhancedAgentManager:
                             "created_at": row['created_at'].isoformat(),
                             "completed_at": row['completed_at'].isoformat() if row['completed_at'] else None,
                             "assigned_to": str(row['assigned_to']) if row['assigned_to'] else None,
-                            "checkpoint_data": row['checkpoint_data']
+                            "checkpoint_data": await self.checkpoints.load(task_id)
                         }
             
             return {
@@ -1406,8 +1880,56 @@ class EnhancedAgentManager:
                 "estimated_complexity": task.estimated_complexity
             }
         
+        # Results past the spill TTL are still durable in Postgres
+        elif self.db_pool:
+            async with self.db_pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    "SELECT * FROM tasks WHERE task_id = $1 "
+                    "AND status IN ('completed', 'failed', 'cancelled')",
+                    uuid.UUID(task_id)
+                )
+                if row:
+                    return {
+                        "status": row['status'],
+                        "result": json.loads(row['result']) if row['result'] else None,
+                        "error": row['error'],
+                        "created_at": row['created_at'].isoformat(),
+                        "completed_at": row['completed_at'].isoformat() if row['completed_at'] else None,
+                        "assigned_to": str(row['assigned_to']) if row['assigned_to'] else None
+                    }
+        
         return None
     
+    async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Wait for a task to complete, fail or be cancelled, without polling.
+        
+        Returns:
+            Terminal status, result and error, or None for an unknown task
+        """
+        if task_id in self.pending_tasks:
+            return await self.completions.wait(task_id, timeout)
+        
+        found, result = await self.completed_tasks.lookup(task_id)
+        if found:
+            return completion_outcome(result)
+        
+        # Past the spill TTL; the durable row still has the outcome
+        status = await self.get_task_status(task_id)
+        if status is None:
+            return None
+        return {"status": status["status"], "result": status.get("result"), "error": status.get("error")}
+    
+    def is_task_queued(self, task_id: str) -> bool:
+        """Whether a task is pending without having been dispatched to an agent"""
+        task = self.pending_tasks.get(task_id)
+        return task is not None and not task.assigned_to
+    
+    async def wait_for_dispatch(self, task_id: str, timeout: Optional[float] = None):
+        """Wait, without polling, until a queued task is dispatched to an agent or finishes"""
+        if self.is_task_queued(task_id):
+            await self.completions.wait_dispatched(task_id, timeout)
+    
     async def reprocess_dead_letter_task(self, dlq_entry_id: str) -> str:
         """Manually reprocess a task from the dead-letter queue"""
         if not self.redis_client:
@@ -1429,14 +1951,18 @@ class EnhancedAgentManager:
         # Create new task with reset retry count
         task = EnhancedAgentTask(**task_data)
         task.retry_count = 0
+        if task.checkpoint_data is None:
+            task.checkpoint_data = await self.checkpoints.load(task_data['task_id'])
         task.task_id = str(uuid.uuid4())  # New ID to avoid conflicts
         
         # Resubmit task
         self.pending_tasks[task.task_id] = task
+        self.aggregates.task_added(task.task_type)
         await self._enqueue_task(task)
         
-        # Remove from DLQ
+        # Remove from DLQ; the new task carries the checkpoint forward
         await self.redis_client.xdel("task_dead_letter_queue", entry_id)
+        self.checkpoints.discard(task_data['task_id'])
         
         logger.info("Reprocessed dead-letter task",
                    original_id=task_data['task_id'],
@@ -1446,6 +1972,7 @@ class EnhancedAgentManager:
     
     def get_system_statistics(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
+        queue_depths = self.ready_queue.qsize_by_priority()
         stats = {
             "agents": {
                 "total": len(self.agents),
@@ -1455,14 +1982,19 @@ class EnhancedAgentManager:
             },
             "tasks": {
                 "pending": len(self.pending_tasks),
-                "completed": len(self.completed_tasks),
-                "in_queues": sum(q.qsize() for q in self.task_queues.values()),
-                "by_priority": {p.name: self.task_queues[p].qsize() for p in TaskPriority}
+                "completed": self.completed_tasks.total_recorded,
+                "results_in_memory": len(self.completed_tasks),
+                "in_queues": self.ready_queue.qsize(),
+                "in_local_queues": sum(self.affinity.local_queue_lengths().values()),
+                "by_priority": {p.name: queue_depths[p.value] for p in TaskPriority}
             },
             "performance": {
-                "avg_queue_depth": sum(q.qsize() for q in self.task_queues.values()) / len(self.task_queues),
+                "avg_queue_depth": self.ready_queue.qsize() / len(TaskPriority),
                 "load_shedding_active": self.load_shedding_active,
                 "rejected_tasks": self.rejected_tasks_count,
+                "deadline_miss_rate": self.deadline_monitor.miss_rate,
+                "deadlines_met": self.deadline_monitor.met,
+                "deadlines_missed": self.deadline_monitor.missed + self.deadline_monitor.expired,
                 "critical_path_length": 0
             },
             "cost": {
@@ -1484,9 +2016,7 @@ class EnhancedAgentManager:
             stats["cost"]["cost_per_agent_type"][agent_type.value] = agent_count * cost_per_hour
         
         # Critical path
-        if self.task_dag.graph:
-            _, path_length = self.task_dag.get_critical_path()
-            stats["performance"]["critical_path_length"] = path_length
+        stats["performance"]["critical_path_length"] = self.task_dag.get_critical_path_length()
         
         return stats
     
@@ -1497,9 +2027,11 @@ class EnhancedAgentManager:
         
         # Cancel all background tasks
         tasks_to_cancel = (
-            self._task_processors +
-            [self._heartbeat_monitor_task, self._autoscaler_task,
-             self._metrics_collector_task, self._dag_optimizer_task]
+            self._task_processors + list(self._local_dispatches) +
+            list(self._heartbeat_streams.values()) +
+            [self._autoscaler_task,
+             self._metrics_collector_task, self._dag_optimizer_task] +
+            ([self._predictive_scaling_task] if self._predictive_scaling_task else [])
         )
         
         for task in tasks_to_cancel:
@@ -1508,10 +2040,23 @@ class EnhancedAgentManager:
         
         # Wait for tasks to complete
         await asyncio.gather(*tasks_to_cancel, return_exceptions=True)
+        await self.retry_scheduler.stop()
+        self.completions.cancel_all()
+        await self.deadline_monitor.stop()
+        await self.checkpoints.stop()
+        await self.liveness.stop()
+        await self.task_batcher.flush()
+        
+        # Spill retained results while the store is still connected
+        await self.completed_tasks.stop()
         
         # Close connections
         await self.memory_store.disconnect()
         
+        # Flush buffered task state before the pool goes away
+        if self.task_journal:
+            await self.task_journal.stop()
+        
         if self.db_pool:
             await self.db_pool.close()
         
@@ -0,0 +1,70 @@
+"""
+Running per-agent-type load aggregates
+
+Agent count, active tasks and capacity per agent type, and pending tasks per
+task type, maintained incrementally as agents change and tasks come and go.
+The autoscaler and metrics collector read them per agent type in constant
+time instead of rebuilding per-type lists from every agent and every pending
+task on each tick.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Set, Tuple
+
+
+class AgentTypeAggregates:
+    """
+    Per-agent-type counters fed by agent and task lifecycle events.
+
+    ``agent_changed`` must be called whenever an agent's load or capacity
+    may have changed (the agent index does this on every update), and
+    ``task_added``/``task_removed`` as tasks enter and leave the pending set.
+    """
+
+    def __init__(self, routing_rules: Dict[str, List[Any]]):
+        self._task_types: Dict[Hashable, Set[str]] = defaultdict(set)
+        for task_type, agent_types in routing_rules.items():
+            for agent_type in agent_types:
+                self._task_types[agent_type].add(task_type)
+
+        # agent_id -> (agent_type, active, capacity) last counted
+        self._agents: Dict[str, Tuple[Hashable, int, int]] = {}
+        self.agent_count: Dict[Hashable, int] = defaultdict(int)
+        self.active: Dict[Hashable, int] = defaultdict(int)
+        self.capacity: Dict[Hashable, int] = defaultdict(int)
+        self.pending_by_task_type: Dict[str, int] = defaultdict(int)
+
+    def agent_changed(self, agent):
+        """Replace an agent's previous contribution with its current one"""
+        self.agent_removed(agent.agent_id)
+        entry = (agent.agent_type, len(agent.active_tasks), agent.max_concurrent_tasks)
+        self._agents[agent.agent_id] = entry
+        self.agent_count[entry[0]] += 1
+        self.active[entry[0]] += entry[1]
+        self.capacity[entry[0]] += entry[2]
+
+    def agent_removed(self, agent_id: str):
+        entry = self._agents.pop(agent_id, None)
+        if entry is None:
+            return
+        self.agent_count[entry[0]] -= 1
+        self.active[entry[0]] -= entry[1]
+        self.capacity[entry[0]] -= entry[2]
+
+    def task_added(self, task_type: str):
+        self.pending_by_task_type[task_type] += 1
+
+    def task_removed(self, task_type: str):
+        self.pending_by_task_type[task_type] -= 1
+
+    def agents_of(self, agent_type: Hashable) -> int:
+        return self.agent_count.get(agent_type, 0)
+
+    def utilization(self, agent_type: Hashable) -> float:
+        capacity = self.capacity.get(agent_type, 0)
+        return self.active.get(agent_type, 0) / capacity if capacity > 0 else 0.0
+
+    def pending_for(self, agent_type: Hashable) -> int:
+        """Pending tasks of every task type this agent type can serve"""
+        return sum(self.pending_by_task_type.get(task_type, 0)
+                   for task_type in self._task_types.get(agent_type, ()))
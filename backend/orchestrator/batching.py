@@ -0,0 +1,124 @@
+"""
+Batching stage for small, homogeneous task dispatches
+
+Tasks of the same type bound for the same agent that arrive within a short
+window are coalesced into a single batched RPC. Each caller awaits its own
+future, so results are demultiplexed back to individual task completions and
+failures.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Histogram
+
+
+logger = structlog.get_logger()
+
+# Metrics
+dispatch_batch_size = Histogram(
+    'task_dispatch_batch_size',
+    'Number of tasks sent per batched agent RPC',
+    ['task_type'],
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256]
+)
+
+BatchKey = Tuple[str, str]  # (agent_id, task_type)
+
+
+class TaskBatcher:
+    """
+    Groups task requests per (agent, task type) and flushes them on size or
+    after ``window_seconds``.
+
+    ``dispatch(agent_id, task_type, requests)`` must return a mapping of
+    task_id to result; tasks missing from it are failed individually.
+    """
+
+    def __init__(self,
+                 dispatch: Callable[[str, str, List[Dict[str, Any]]], Awaitable[Dict[str, Any]]],
+                 max_batch_size: int = 100,
+                 window_seconds: float = 0.005):
+        self.dispatch = dispatch
+        self.max_batch_size = max_batch_size
+        self.window_seconds = window_seconds
+
+        self._pending: Dict[BatchKey, List[Tuple[Dict[str, Any], asyncio.Future]]] = defaultdict(list)
+        self._timers: Dict[BatchKey, asyncio.TimerHandle] = {}
+        self._in_flight: set = set()
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(batch) for batch in self._pending.values())
+
+    async def submit(self, agent_id: str, task_type: str, request: Dict[str, Any]) -> Any:
+        """Queue a task request for batched dispatch and wait for its own result"""
+        key = (agent_id, task_type)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key].append((request, future))
+
+        if len(self._pending[key]) >= self.max_batch_size:
+            self._flush_key(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._flush_key, key
+            )
+
+        return await future
+
+    async def flush(self):
+        """Dispatch everything buffered and wait for in-flight batches"""
+        for key in list(self._pending):
+            self._flush_key(key)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _flush_key(self, key: BatchKey):
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._dispatch_batch(key, batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch_batch(self, key: BatchKey, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        agent_id, task_type = key
+        # Callers that timed out no longer need a result
+        batch = [(request, future) for request, future in batch if not future.done()]
+        if not batch:
+            return
+        dispatch_batch_size.labels(task_type=task_type).observe(len(batch))
+
+        try:
+            results = await self.dispatch(agent_id, task_type, [request for request, _ in batch])
+        except Exception as e:
+            logger.error("Batched dispatch failed",
+                         agent_id=agent_id,
+                         task_type=task_type,
+                         batch_size=len(batch),
+                         error=str(e))
+            for _, future in batch:
+                _resolve(future, error=e)
+            return
+
+        for request, future in batch:
+            task_id = request['task_id']
+            if task_id in results:
+                _resolve(future, result=results[task_id])
+            else:
+                _resolve(future, error=RuntimeError(f"No result for task {task_id} in batch response"))
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[Exception] = None):
+    if future.done():
+        return
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
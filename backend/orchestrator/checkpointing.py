@@ -0,0 +1,334 @@
+"""
+Incremental, batched task checkpointing
+
+One timer walks every running task and asks each agent for the checkpoints of
+all its running tasks in a single RPC. Only what changed since the previous
+checkpoint is persisted: a msgpack-encoded delta compressed with zstd (zlib
+when zstandard is not installed). A full base is written on the first
+checkpoint of an attempt and every ``full_every`` deltas, so rehydration
+replays a bounded number of deltas. All records from one pass are written in a
+single transaction, together with deleting the records of tasks that finished
+for good since the previous pass.
+"""
+
+import asyncio
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+import msgpack
+import structlog
+from prometheus_client import Counter, Histogram
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+logger = structlog.get_logger()
+
+# Metrics
+checkpoint_bytes_counter = Counter(
+    'task_checkpoint_bytes_total',
+    'Compressed checkpoint bytes written, by record kind (base, delta)',
+    ['kind']
+)
+checkpoint_pass_duration = Histogram(
+    'task_checkpoint_pass_duration_seconds',
+    'Time to fetch and persist checkpoints for all running tasks',
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+)
+checkpoint_errors_counter = Counter(
+    'task_checkpoint_errors_total',
+    'Checkpoint fetches or flushes that failed',
+    ['stage']
+)
+
+CREATE_CHECKPOINTS_SQL = '''
+    CREATE TABLE IF NOT EXISTS task_checkpoints (
+        checkpoint_id BIGSERIAL PRIMARY KEY,
+        task_id UUID NOT NULL,
+        is_base BOOLEAN NOT NULL,
+        data BYTEA NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_task_checkpoints_task
+        ON task_checkpoints(task_id, checkpoint_id);
+'''
+
+INSERT_CHECKPOINTS_SQL = '''
+    INSERT INTO task_checkpoints (task_id, is_base, data)
+    SELECT * FROM unnest($1::uuid[], $2::boolean[], $3::bytea[])
+'''
+
+# Records older than a task's newest base are no longer needed
+DELETE_SUPERSEDED_SQL = '''
+    DELETE FROM task_checkpoints c
+    USING (
+        SELECT task_id, MAX(checkpoint_id) AS base_id FROM task_checkpoints
+        WHERE task_id = ANY($1::uuid[]) AND is_base
+        GROUP BY task_id
+    ) b
+    WHERE c.task_id = b.task_id AND c.checkpoint_id < b.base_id
+'''
+
+DELETE_TASKS_SQL = '''
+    DELETE FROM task_checkpoints WHERE task_id = ANY($1::uuid[])
+'''
+
+SELECT_CHAIN_SQL = '''
+    SELECT is_base, data FROM task_checkpoints
+    WHERE task_id = $1 AND checkpoint_id >= (
+        SELECT MAX(checkpoint_id) FROM task_checkpoints WHERE task_id = $1 AND is_base
+    )
+    ORDER BY checkpoint_id
+'''
+
+_ZSTD = b'Z'
+_ZLIB = b'z'
+
+
+def encode_record(value: Any, level: int = 3) -> bytes:
+    """msgpack then zstd (or zlib), prefixed with the codec used"""
+    packed = msgpack.packb(value, use_bin_type=True)
+    if zstandard is not None:
+        return _ZSTD + zstandard.ZstdCompressor(level=level).compress(packed)
+    return _ZLIB + zlib.compress(packed, level)
+
+
+def decode_record(data: bytes) -> Any:
+    codec, body = data[:1], data[1:]
+    if codec == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Checkpoint is zstd-compressed but zstandard is not installed")
+        packed = zstandard.ZstdDecompressor().decompress(body)
+    elif codec == _ZLIB:
+        packed = zlib.decompress(body)
+    else:
+        raise ValueError(f"Unknown checkpoint codec {codec!r}")
+    return msgpack.unpackb(packed, raw=False)
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any], path: Tuple = ()) -> List[list]:
+    """
+    Operations turning ``old`` into ``new``: ``["s", path, value]`` sets a
+    key, ``["d", path]`` deletes one. Nested dicts are diffed recursively;
+    any other changed value is replaced whole.
+    """
+    ops: List[list] = []
+    for key, value in new.items():
+        if key not in old:
+            ops.append(["s", list(path + (key,)), value])
+        elif old[key] != value:
+            if isinstance(value, dict) and isinstance(old[key], dict):
+                ops.extend(diff_state(old[key], value, path + (key,)))
+            else:
+                ops.append(["s", list(path + (key,)), value])
+    for key in old:
+        if key not in new:
+            ops.append(["d", list(path + (key,))])
+    return ops
+
+
+def apply_delta(state: Dict[str, Any], ops: List[list]) -> Dict[str, Any]:
+    """Apply ``diff_state`` operations, copying only the dicts they touch"""
+    state = dict(state)
+    for op in ops:
+        parent = state
+        *parents, key = op[1]
+        for part in parents:
+            parent[part] = dict(parent[part])
+            parent = parent[part]
+        if op[0] == "s":
+            parent[key] = op[2]
+        else:
+            parent.pop(key, None)
+    return state
+
+
+@dataclass
+class _TrackedTask:
+    agent_id: str
+    state: Optional[Dict[str, Any]]
+    deltas_since_base: Optional[int] = None  # None until a base is written
+
+
+class CheckpointManager:
+    """
+    Single-timer checkpointing for all running tasks.
+
+    ``fetch(agent_id, task_ids)`` returns the current checkpoint of each task
+    that has one. Without a database pool checkpoints are kept in memory only.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[str, List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
+                 db_pool: Optional[asyncpg.Pool] = None,
+                 interval_seconds: float = 30.0,
+                 full_every: int = 20,
+                 compression_level: int = 3):
+        self.fetch = fetch
+        self.db_pool = db_pool
+        self.interval_seconds = interval_seconds
+        self.full_every = full_every
+        self.compression_level = compression_level
+
+        self._tasks: Dict[str, _TrackedTask] = {}
+        self._discarded: Set[str] = set()  # task_ids whose records go at the next pass
+        self._timer_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def tracked_count(self) -> int:
+        return len(self._tasks)
+
+    async def start(self):
+        self._running = True
+        self._timer_task = asyncio.create_task(self._timer_loop())
+
+    async def stop(self):
+        self._running = False
+        if self._timer_task:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+        if self._discarded and self.db_pool:
+            await self._flush([])
+
+    async def init_schema(self, conn: asyncpg.Connection):
+        await conn.execute(CREATE_CHECKPOINTS_SQL)
+
+    def track(self, task_id: str, agent_id: str, resume_state: Optional[Dict[str, Any]] = None):
+        """Checkpoint a task while it runs on ``agent_id``, starting from its resume state"""
+        self._tasks[task_id] = _TrackedTask(agent_id, resume_state)
+
+    def untrack(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Stop checkpointing a task; returns its latest state"""
+        tracked = self._tasks.pop(task_id, None)
+        return tracked.state if tracked else None
+
+    def discard(self, task_id: str):
+        """
+        Forget a task that will never resume: it completed or was cancelled.
+
+        Its persisted records are deleted with the next pass's writes.
+        """
+        self._tasks.pop(task_id, None)
+        if self.db_pool:
+            self._discarded.add(task_id)
+
+    def latest(self, task_id: str) -> Optional[Dict[str, Any]]:
+        tracked = self._tasks.get(task_id)
+        return tracked.state if tracked else None
+
+    async def load(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Rehydrate a task's last persisted checkpoint from its base and deltas"""
+        if task_id in self._tasks and self._tasks[task_id].state is not None:
+            return self._tasks[task_id].state
+        if not self.db_pool:
+            return None
+
+        async with self.db_pool.acquire() as conn:
+            records = await conn.fetch(SELECT_CHAIN_SQL, uuid.UUID(task_id))
+        state = None
+        for record in records:
+            value = decode_record(record['data'])
+            state = value if record['is_base'] else apply_delta(state, value)
+        return state
+
+    async def checkpoint_once(self):
+        """Fetch every running task's checkpoint and persist what changed"""
+        start_time = time.perf_counter()
+        by_agent: Dict[str, List[str]] = defaultdict(list)
+        for task_id, tracked in self._tasks.items():
+            by_agent[tracked.agent_id].append(task_id)
+        if not by_agent:
+            if self._discarded and self.db_pool:
+                await self._flush([])
+            return
+
+        agent_ids = list(by_agent)
+        fetched = await asyncio.gather(
+            *(self.fetch(agent_id, by_agent[agent_id]) for agent_id in agent_ids),
+            return_exceptions=True
+        )
+
+        records: List[Tuple[uuid.UUID, bool, bytes]] = []
+        for agent_id, checkpoints in zip(agent_ids, fetched):
+            if isinstance(checkpoints, Exception):
+                checkpoint_errors_counter.labels(stage='fetch').inc()
+                logger.warning("Failed to fetch checkpoints",
+                             agent_id=agent_id, error=str(checkpoints))
+                continue
+            for task_id, checkpoint in checkpoints.items():
+                record = self._record_for(task_id, agent_id, checkpoint)
+                if record:
+                    records.append(record)
+
+        if (records or self._discarded) and self.db_pool:
+            await self._flush(records)
+        checkpoint_pass_duration.observe(time.perf_counter() - start_time)
+
+    def _record_for(self,
+                    task_id: str,
+                    agent_id: str,
+                    checkpoint: Dict[str, Any]) -> Optional[Tuple[uuid.UUID, bool, bytes]]:
+        """Advance a task's state and encode the base or delta to persist"""
+        tracked = self._tasks.get(task_id)
+        # Finished, or moved to another agent, while the fetch was in flight
+        if tracked is None or tracked.agent_id != agent_id:
+            return None
+
+        write_base = tracked.deltas_since_base is None or tracked.deltas_since_base >= self.full_every
+        if not write_base and checkpoint == tracked.state:
+            return None
+
+        if write_base:
+            data = encode_record(checkpoint, self.compression_level)
+            tracked.deltas_since_base = 0
+        else:
+            data = encode_record(diff_state(tracked.state, checkpoint), self.compression_level)
+            tracked.deltas_since_base += 1
+        tracked.state = checkpoint
+        checkpoint_bytes_counter.labels(kind='base' if write_base else 'delta').inc(len(data))
+        return uuid.UUID(task_id), write_base, data
+
+    async def _flush(self, records: List[Tuple[uuid.UUID, bool, bytes]]):
+        """Insert one pass's records and drop superseded and discarded records"""
+        rebased = [task_id for task_id, is_base, _ in records if is_base]
+        discarded = list(self._discarded)
+        self._discarded.clear()
+        try:
+            async with self.db_pool.acquire() as conn:
+                async with conn.transaction():
+                    if records:
+                        await conn.execute(INSERT_CHECKPOINTS_SQL, *[list(c) for c in zip(*records)])
+                    if rebased:
+                        await conn.execute(DELETE_SUPERSEDED_SQL, rebased)
+                    if discarded:
+                        await conn.execute(DELETE_TASKS_SQL, [uuid.UUID(t) for t in discarded])
+        except Exception as e:
+            checkpoint_errors_counter.labels(stage='flush').inc()
+            logger.error("Checkpoint flush failed", records=len(records), error=str(e))
+            # Retry the deletes with the next pass
+            self._discarded.update(discarded)
+            # Deltas on top of an unwritten record cannot be replayed
+            for task_id, _, _ in records:
+                tracked = self._tasks.get(str(task_id))
+                if tracked:
+                    tracked.deltas_since_base = None
+
+    async def _timer_loop(self):
+        while self._running:
+            try:
+                await asyncio.sleep(self.interval_seconds)
+                await self.checkpoint_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in checkpoint loop", error=str(e))
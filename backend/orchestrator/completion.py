@@ -0,0 +1,88 @@
+"""
+Completion notifications for submitted tasks
+
+Callers waiting for a task to finish subscribe to a per-task future that the
+manager resolves when the task completes, fails for good or is cancelled, so
+nothing polls ``get_task_status``. Subscribers of the same task share one
+future; each waits on it through a shield, so one caller timing out or being
+cancelled does not cancel the others. Callers can likewise wait for a queued
+task to be dispatched to an agent, to tell time spent queued from time spent
+running.
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+
+def completion_outcome(result: Any) -> Dict[str, Any]:
+    """Terminal status of a task from its stored result"""
+    if isinstance(result, dict) and result.get("status") == "cancelled":
+        return {"status": "cancelled", "result": result, "error": result.get("reason")}
+    if isinstance(result, dict) and "error" in result:
+        return {"status": "failed", "result": result, "error": result["error"]}
+    return {"status": "completed", "result": result, "error": None}
+
+
+class TaskCompletions:
+    """Futures resolved when tasks are dispatched and when they reach a terminal state"""
+
+    def __init__(self):
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._dispatch_futures: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def subscribe(self, task_id: str) -> asyncio.Future:
+        """
+        Future for a task's outcome.
+
+        Must be called while the task is still pending; a task that already
+        finished is never resolved again.
+        """
+        future = self._futures.get(task_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[task_id] = future
+        return future
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a task's outcome.
+
+        Only for tasks still pending: a task that already finished has no
+        future left to resolve, so callers check for a stored result first.
+        """
+        return await asyncio.wait_for(asyncio.shield(self.subscribe(task_id)), timeout)
+
+    async def wait_dispatched(self, task_id: str, timeout: Optional[float] = None):
+        """
+        Wait until a queued task is dispatched to an agent or finishes.
+
+        Only for tasks still queued, for the same reason as ``wait``.
+        """
+        future = self._dispatch_futures.get(task_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._dispatch_futures[task_id] = future
+        await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def dispatched(self, task_id: str):
+        """Wake every caller waiting for a task to leave the queue"""
+        future = self._dispatch_futures.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def resolve(self, task_id: str, result: Any):
+        """Wake every subscriber of a task with its outcome"""
+        # A task finishing without being dispatched (e.g. cancelled) has left the queue too
+        self.dispatched(task_id)
+        future = self._futures.pop(task_id, None)
+        if future is not None and not future.done():
+            future.set_result(completion_outcome(result))
+
+    def cancel_all(self):
+        for future in (*self._futures.values(), *self._dispatch_futures.values()):
+            future.cancel()
+        self._futures.clear()
+        self._dispatch_futures.clear()
@@ -5,7 +5,7 @@ This module provides centralized configuration for the orchestrator,
 including feature flags, performance tuning, and autoscaling parameters.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import os
@@ -17,6 +17,7 @@ class SchedulingStrategy(Enum):
     LEAST_BUSY = "least_busy"
     COST_BASED = "cost_based"
     PERFORMANCE_BASED = "performance_based"
+    DEADLINE_AWARE = "deadline_aware"  # Earliest virtual deadline first, with priority aging
 
 
 @dataclass
@@ -32,6 +33,11 @@ class AutoscalingConfig:
     scale_down_rate: int = 1  # Number of agents to remove
     cooldown_seconds: int = 60  # Time between scaling decisions
     
+    # Forecast-driven pre-warming (feature flag "predictive_scaling")
+    predictive_interval_seconds: int = 60  # One feature sample per interval
+    predictive_horizon_minutes: int = 10
+    predictive_min_history: int = 60  # Samples before the ridge model replaces Holt smoothing
+    
     # Cost-aware scaling
     cost_optimization_enabled: bool = True
     max_hourly_cost: float = 1000.0  # Maximum cost per hour
@@ -50,12 +56,20 @@ class FaultToleranceConfig:
     enable_exactly_once_delivery: bool = True
     enable_dead_letter_queue: bool = True
     max_task_retries: int = 3
+    retry_base_delay_seconds: float = 1.0  # Backoff base; doubles per attempt
+    retry_max_delay_seconds: float = 60.0  # Backoff cap before jitter
     task_timeout_seconds: int = 300  # 5 minutes
+    adaptive_timeout_quantile: float = 0.99  # Learned run-time quantile a timeout is based on
+    adaptive_timeout_margin: float = 1.5  # Timeout = quantile * margin
+    adaptive_timeout_min_samples: int = 30  # Observations needed before the static timeout is replaced
+    adaptive_timeout_min_seconds: float = 5.0
     enable_circuit_breaker: bool = True
     circuit_breaker_threshold: int = 5  # Failures before opening
     circuit_breaker_timeout: int = 60  # Seconds before half-open
     enable_task_checkpointing: bool = True
     checkpoint_interval_seconds: int = 30
+    checkpoint_full_every: int = 20  # Deltas between full checkpoints
+    checkpoint_compression_level: int = 3
 
 
 @dataclass
@@ -66,6 +80,7 @@ class ObservabilityConfig:
     enable_distributed_tracing: bool = True
     trace_sample_rate: float = 0.1  # 10% sampling
     metrics_port: int = 9090
+    prometheus_url: str = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
     jaeger_endpoint: str = os.getenv("JAEGER_ENDPOINT", "http://localhost:14268/api/traces")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     enable_performance_profiling: bool = False
@@ -81,13 +96,52 @@ class PerformanceConfig:
     grpc_max_message_size: int = 100 * 1024 * 1024  # 100MB
     enable_connection_pooling: bool = True
     enable_task_batching: bool = True
+    batch_window_ms: int = 5  # Max time a task waits for batch companions
+    batch_max_complexity: float = 1.0  # Only tasks at or below this are batched
+    batchable_task_types: List[str] = field(default_factory=lambda: ["code_review"])
     enable_result_caching: bool = True
     cache_ttl_seconds: int = 3600  # 1 hour
     
+    # Write-behind task state journal
+    journal_max_batch_size: int = 500  # Rows per flush before forcing one
+    journal_flush_interval_ms: int = 50  # Max time a transition stays buffered
+    journal_sync_status_updates: bool = False  # Await persistence of status updates
+    
+    # In-process idempotency-key cache
+    idempotency_cache_size: int = 100000
+    idempotency_cache_ttl_seconds: int = 3600
+    
+    # Finished task result retention
+    result_retention_max_entries: int = 10000  # Results kept in memory
+    result_retention_max_age_seconds: int = 900  # Older results are spilled
+    result_spill_ttl_seconds: int = 86400  # Lifetime of spilled results in Redis
+    result_spilled_index_size: int = 100000  # Spilled IDs remembered for dependency checks
+    
+    # Local cache for context keys shared by sibling tasks
+    enable_context_cache: bool = True
+    context_cache_ttl_seconds: float = 2.0
+    context_cache_max_entries: int = 10000
+    
+    # Learned task durations for critical-path ordering
+    duration_ewma_alpha: float = 0.2
+    default_task_duration_seconds: float = 30.0  # Per unit of complexity until a type is observed
+    
+    # Speculative duplicates for tasks running past their type's usual duration
+    enable_hedging: bool = True
+    hedge_quantile: float = 0.95  # A task running longer than this quantile is hedged
+    hedge_min_samples: int = 50  # Observations of a task type needed before hedging it
+    
+    # Sharded mode: worker processes, each running its own manager
+    shard_count: int = 1
+    shard_key: str = "dag_root"  # "dag_root" keeps dependency chains on one shard, or "task_id"
+    shard_virtual_nodes: int = 128  # Points per shard on the hash ring
+    shard_tracked_tasks: int = 1000000  # Task-to-shard mappings the router remembers
+    
     # Load shedding
     enable_load_shedding: bool = True
     load_shedding_threshold: float = 0.9  # 90% capacity
     priority_queue_enabled: bool = True
+    admission_recheck_seconds: float = 1.0  # Re-check agent capacity without a wake-up (e.g. breaker recovery)
 
 
 @dataclass
@@ -115,6 +169,20 @@ class OrchestratorConfig:
     scheduling_strategy: SchedulingStrategy = SchedulingStrategy.LEAST_BUSY
     enable_gang_scheduling: bool = False  # Schedule related tasks together
     enable_affinity_scheduling: bool = True  # Keep tasks on same agent
+    # Tasks waiting for their warm agent; idle agents steal from the longest
+    affinity_local_queue_size: int = 4
+    affinity_tracked_keys: int = 100000
+    # Deadline-aware dispatch: a task without a deadline is due this long
+    # after enqueueing, so lower priorities age instead of starving
+    priority_aging_seconds: Dict[str, float] = field(default_factory=lambda: {
+        "CRITICAL": 0.0,
+        "HIGH": 10.0,
+        "NORMAL": 60.0,
+        "LOW": 300.0,
+        "BACKGROUND": 900.0
+    })
+    deadline_escalation_seconds: float = 30.0  # Promote queued tasks this close to their deadline
+    expire_missed_deadlines: bool = True  # Cancel tasks whose deadline passes before dispatch
     
     # Sub-configurations
     autoscaling: AutoscalingConfig = field(default_factory=AutoscalingConfig)
@@ -125,6 +193,9 @@ class OrchestratorConfig:
     # Agent-specific configurations
     agent_health_check_interval: int = 10  # seconds
     agent_heartbeat_timeout: int = 30  # seconds
+    agent_probe_timeout_seconds: float = 5.0  # Health probe of an agent whose heartbeats lapsed
+    agent_max_concurrent_probes: int = 32
+    agent_liveness_tick_seconds: float = 1.0  # Timer wheel resolution for heartbeat expiry
     agent_grpc_timeout: int = 60  # seconds
     
     @classmethod
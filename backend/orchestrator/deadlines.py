@@ -0,0 +1,171 @@
+"""
+Deadline-aware dispatch ordering and deadline enforcement
+
+Ready tasks are ordered by a virtual deadline: their own deadline, or their
+enqueue time plus an aging allowance for their priority. The key is fixed when
+a task is queued, yet a waiting low-priority task still overtakes newer
+high-priority work once its allowance has elapsed, so nothing starves.
+
+A single timer watches real deadlines, escalating tasks that are still queued
+shortly before their deadline and expiring those that miss it before being
+dispatched. Met, missed and expired outcomes are exported as metrics.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Histogram
+
+
+logger = structlog.get_logger()
+
+# Metrics
+deadline_outcomes_counter = Counter(
+    'task_deadline_outcomes_total',
+    'Deadline-bound tasks by outcome (met, missed, expired)',
+    ['outcome']
+)
+deadline_lateness_histogram = Histogram(
+    'task_deadline_lateness_seconds',
+    'Completion time minus deadline; negative values finished early',
+    buckets=[-300, -60, -10, -1, 0, 1, 10, 60, 300, 3600]
+)
+
+ESCALATE = 0
+EXPIRE = 1
+
+
+def task_timestamp(moment: datetime) -> float:
+    """Epoch seconds for a task datetime; naive values are UTC"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def deadline_aware_key(aging_seconds: Dict[int, float]) -> Callable[[Any], float]:
+    """
+    Ready-queue key for earliest-virtual-deadline-first ordering.
+
+    ``aging_seconds`` maps a priority value to how long a task of that
+    priority may wait before it is due.
+    """
+    def key(task) -> float:
+        enqueued = task_timestamp(task.enqueued_at) if task.enqueued_at else time.time()
+        virtual_deadline = enqueued + aging_seconds.get(task.priority, 0.0)
+        if task.deadline:
+            virtual_deadline = min(virtual_deadline, task_timestamp(task.deadline))
+        return virtual_deadline
+
+    return key
+
+
+class DeadlineMonitor:
+    """
+    Heap of upcoming escalation and expiry times served by one timer.
+
+    Callbacks receive the task_id and must ignore tasks that already
+    finished; entries are never removed early.
+    """
+
+    def __init__(self,
+                 on_escalate: Callable[[str], Awaitable[None]],
+                 on_expire: Callable[[str], Awaitable[None]],
+                 escalation_seconds: float = 30.0):
+        self.on_escalate = on_escalate
+        self.on_expire = on_expire
+        self.escalation_seconds = escalation_seconds
+
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._timer_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.met = 0
+        self.missed = 0
+        self.expired = 0
+
+    @property
+    def miss_rate(self) -> float:
+        """Share of finished deadline-bound tasks that missed or expired"""
+        total = self.met + self.missed + self.expired
+        return (self.missed + self.expired) / total if total else 0.0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._heap)
+
+    async def start(self):
+        self._running = True
+        self._timer_task = asyncio.create_task(self._timer_loop())
+
+    async def stop(self):
+        self._running = False
+        if self._timer_task:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+
+    def track(self, task_id: str, deadline: datetime):
+        """Schedule escalation and expiry checks for a task's deadline"""
+        due = task_timestamp(deadline)
+        if self.escalation_seconds > 0:
+            self._push(due - self.escalation_seconds, ESCALATE, task_id)
+        self._push(due, EXPIRE, task_id)
+
+    def record_completion(self, deadline: datetime, completed_at: datetime) -> bool:
+        """Record whether a finished task met its deadline"""
+        lateness = task_timestamp(completed_at) - task_timestamp(deadline)
+        deadline_lateness_histogram.observe(lateness)
+        if lateness <= 0:
+            self.met += 1
+            deadline_outcomes_counter.labels(outcome='met').inc()
+            return True
+        self.missed += 1
+        deadline_outcomes_counter.labels(outcome='missed').inc()
+        return False
+
+    def record_expired(self):
+        self.expired += 1
+        deadline_outcomes_counter.labels(outcome='expired').inc()
+
+    def _push(self, due: float, action: int, task_id: str):
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, next(self._sequence), action, task_id))
+        if wake:
+            self._changed.set()
+
+    async def _timer_loop(self):
+        while self._running:
+            try:
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - time.time())
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                await self._fire_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in deadline monitor", error=str(e))
+                await asyncio.sleep(1)
+
+    async def _fire_due(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, action, task_id = heapq.heappop(self._heap)
+            callback = self.on_escalate if action == ESCALATE else self.on_expire
+            try:
+                await callback(task_id)
+            except Exception as e:
+                logger.error("Deadline action failed",
+                             task_id=task_id,
+                             action='escalate' if action == ESCALATE else 'expire',
+                             error=str(e))
@@ -0,0 +1,235 @@
+"""
+Priority-aware ready queue for orchestrator task processors
+
+This module replaces the per-priority asyncio.Queue polling loop with a single
+heap guarded by asyncio conditions, so processors block until work arrives and
+always take the highest-priority task first.
+
+Tasks can optionally be partitioned (e.g. by task type) so that a consumer only
+dequeues work it can admit: ``get_admitted`` skips partitions whose head task
+is refused and otherwise waits until capacity is signalled.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class PriorityDispatchQueue:
+    """
+    Single ready structure shared by all task processors.
+
+    Tasks are ordered by ``key(task)`` (lower is served first) and FIFO within
+    equal keys. Capacity is tracked per priority lane so the backpressure rules
+    of the old per-priority queues are preserved. With ``partition`` each
+    partition keeps its own heap and ``get`` serves the best head across them.
+
+    Removing or re-keying a task supersedes its heap entry instead of
+    rebuilding the heap; superseded entries are dropped once they reach the
+    top or when they come to dominate a partition.
+    """
+
+    def __init__(self,
+                 priorities: Iterable[int],
+                 maxsize_per_priority: int = 0,
+                 key: Optional[Callable[[Any], Any]] = None,
+                 partition: Optional[Callable[[Any], Hashable]] = None):
+        self.maxsize_per_priority = maxsize_per_priority
+        self._key = key or (lambda task: task.priority)
+        self._partition = partition or (lambda task: None)
+        self._heaps: Dict[Hashable, List[Tuple[Any, int, int, Any]]] = defaultdict(list)
+        self._entries: Dict[int, Tuple[Any, int, int, Any]] = {}
+        self._counts: Dict[Hashable, int] = defaultdict(int)
+        self._size = 0
+        self._sequence = itertools.count()
+        self._lane_sizes: Dict[int, int] = {p: 0 for p in priorities}
+
+        # Both conditions share one lock so producers and consumers
+        # can hand off without polling
+        self._lock = asyncio.Lock()
+        self._not_empty = asyncio.Condition(self._lock)
+        self._not_full = asyncio.Condition(self._lock)
+
+    @property
+    def maxsize(self) -> int:
+        """Total capacity across all priority lanes (0 means unbounded)"""
+        return self.maxsize_per_priority * len(self._lane_sizes)
+
+    def qsize(self) -> int:
+        return self._size
+
+    def qsize_by_priority(self) -> Dict[int, int]:
+        return dict(self._lane_sizes)
+
+    def qsize_by_partition(self) -> Dict[Hashable, int]:
+        return {part: count for part, count in self._counts.items() if count}
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def full(self, priority: int) -> bool:
+        """Check whether the lane for a priority has reached its capacity"""
+        if self.maxsize_per_priority <= 0:
+            return False
+        return self._lane_sizes.get(priority, 0) >= self.maxsize_per_priority
+
+    async def put(self, task: Any, timeout: Optional[float] = None):
+        """
+        Add a task, waiting for space in its priority lane if necessary.
+
+        Raises:
+            asyncio.TimeoutError: If no space frees up within ``timeout``
+        """
+        async with self._lock:
+            if self.full(task.priority):
+                await asyncio.wait_for(
+                    self._not_full.wait_for(lambda: not self.full(task.priority)),
+                    timeout=timeout
+                )
+            self._push(task)
+            self._not_empty.notify()
+
+    async def get(self) -> Any:
+        """Remove and return the highest-priority task, blocking until one exists"""
+        async with self._lock:
+            await self._not_empty.wait_for(lambda: self._size > 0)
+            task = self._pop(self._ordered_partitions()[0])
+            self._not_full.notify_all()
+            return task
+
+    async def get_admitted(self,
+                           admit: Callable[[Any], Optional[Any]],
+                           recheck_interval: Optional[float] = None) -> Tuple[Any, Any]:
+        """
+        Remove and return the best task that ``admit`` accepts.
+
+        ``admit`` is called with the head task of each partition, best first,
+        and returns a grant (e.g. a reserved agent) or None to leave the
+        partition queued. Blocks until a task is admitted; waiters are woken by
+        ``put``, ``notify_capacity`` or every ``recheck_interval`` seconds.
+
+        Returns:
+            (task, grant)
+        """
+        async with self._lock:
+            while True:
+                for part in self._ordered_partitions():
+                    grant = admit(self._heaps[part][0][3])
+                    if grant is not None:
+                        task = self._pop(part)
+                        self._not_full.notify_all()
+                        return task, grant
+                try:
+                    await asyncio.wait_for(self._not_empty.wait(), timeout=recheck_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def remove(self, task: Any) -> bool:
+        """
+        Drop a queued task (e.g. one that expired while waiting).
+
+        Returns:
+            False if the task was not queued
+        """
+        async with self._lock:
+            if not self._remove(task):
+                return False
+            self._not_full.notify_all()
+            return True
+
+    async def reprioritize(self, task: Any, priority: int) -> bool:
+        """
+        Move a queued task to another priority lane and re-key it.
+
+        Returns:
+            False if the task was not queued; its priority is left unchanged
+        """
+        async with self._lock:
+            if not self._remove(task):
+                return False
+            task.priority = priority
+            self._push(task)
+            self._not_full.notify_all()
+            self._not_empty.notify()
+            return True
+
+    async def rekey(self, tasks: Iterable[Any]) -> int:
+        """
+        Recompute the keys of queued tasks whose ordering inputs changed.
+
+        Tasks keep their FIFO position among equal keys; tasks that are not
+        queued are ignored. Each re-key costs O(log n).
+
+        Returns:
+            Number of queued tasks re-keyed
+        """
+        async with self._lock:
+            rekeyed = 0
+            for task in tasks:
+                entry = self._entries.get(id(task))
+                if entry is None:
+                    continue
+                rekeyed += 1
+                key = self._key(task)
+                if key == entry[0]:
+                    continue
+                part = self._partition(task)
+                fresh = (key, entry[1], entry[2], task)
+                self._entries[id(task)] = fresh
+                heapq.heappush(self._heaps[part], fresh)
+                self._prune(part)
+            if rekeyed:
+                self._not_empty.notify()
+            return rekeyed
+
+    async def notify_capacity(self):
+        """Wake consumers waiting in ``get_admitted`` after capacity frees up"""
+        async with self._lock:
+            self._not_empty.notify_all()
+
+    def _ordered_partitions(self) -> List[Hashable]:
+        """Non-empty partitions, best head first"""
+        heads = [(heap[0][0], heap[0][1], part) for part, heap in self._heaps.items() if heap]
+        heads.sort(key=lambda head: head[:2])
+        return [part for _, _, part in heads]
+
+    def _push(self, task: Any):
+        # Remember the lane at push time so accounting survives later
+        # changes to task.priority
+        self._remove(task)
+        lane = task.priority
+        part = self._partition(task)
+        entry = (self._key(task), next(self._sequence), lane, task)
+        heapq.heappush(self._heaps[part], entry)
+        self._entries[id(task)] = entry
+        self._counts[part] += 1
+        self._lane_sizes[lane] = self._lane_sizes.get(lane, 0) + 1
+        self._size += 1
+
+    def _pop(self, part: Hashable) -> Any:
+        task = self._heaps[part][0][3]
+        self._remove(task)
+        return task
+
+    def _remove(self, task: Any) -> bool:
+        entry = self._entries.pop(id(task), None)
+        if entry is None:
+            return False
+        part = self._partition(task)
+        self._counts[part] -= 1
+        self._lane_sizes[entry[2]] -= 1
+        self._size -= 1
+        self._prune(part)
+        return True
+
+    def _prune(self, part: Hashable):
+        """Drop superseded entries from the top, keeping every head live"""
+        heap = self._heaps[part]
+        while heap and self._entries.get(id(heap[0][3])) is not heap[0]:
+            heapq.heappop(heap)
+        if len(heap) > 2 * self._counts[part] + 16:
+            live = [entry for entry in heap if self._entries.get(id(entry[3])) is entry]
+            heapq.heapify(live)
+            self._heaps[part] = live
@@ -0,0 +1,177 @@
+"""
+Learned task duration estimates
+
+Keeps streaming statistics of observed run time per unit of complexity for
+each task type and each (task type, agent type) pair: an exponentially
+weighted moving average for expected duration, plus P² quantile sketches
+(Jain & Chlamtac) for tail durations in constant memory. DAG durations,
+cost-based scheduling estimates and adaptive timeouts are derived from them
+rather than from the submitter's complexity hint alone.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile using five markers (P² algorithm)"""
+
+    def __init__(self, quantile: float):
+        self.quantile = quantile
+        self.count = 0
+        self._initial: List[float] = []
+        self._heights: List[float] = []
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float):
+        self.count += 1
+        if not self._heights:
+            self._initial.append(value)
+            if len(self._initial) == 5:
+                p = self.quantile
+                self._heights = sorted(self._initial)
+                self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+                self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+            return
+
+        heights, positions = self._heights, self._positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # Move the middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1) or
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def value(self) -> Optional[float]:
+        if self._heights:
+            return self._heights[2]
+        if not self._initial:
+            return None
+        ordered = sorted(self._initial)
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+
+class DurationStats:
+    """EWMA and quantile sketches over one stream of per-unit run times"""
+
+    def __init__(self, alpha: float, quantiles: Iterable[float]):
+        self.alpha = alpha
+        self.count = 0
+        self.mean: Optional[float] = None
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, value: float):
+        self.count += 1
+        self.mean = value if self.mean is None else self.mean + self.alpha * (value - self.mean)
+        for sketch in self.quantiles.values():
+            sketch.add(value)
+
+
+class TaskDurationEstimator:
+    """
+    Run-time model per task type and per (task type, agent type).
+
+    Durations are tracked per unit of complexity. Estimates prefer the
+    (type, agent type) stream, then the task type, then the average across all
+    types, then ``default_seconds``.
+    """
+
+    def __init__(self,
+                 alpha: float = 0.2,
+                 default_seconds: float = 30.0,
+                 quantiles: Iterable[float] = (0.95, 0.99)):
+        self.alpha = alpha
+        self.default_seconds = default_seconds
+        self.tracked_quantiles = tuple(sorted(set(quantiles)))
+        self._stats: Dict[Tuple[str, Optional[str]], DurationStats] = {}
+        self._overall = DurationStats(alpha, ())
+
+    def observe(self,
+                task_type: str,
+                duration_seconds: float,
+                complexity: float = 1.0,
+                agent_type: Optional[str] = None):
+        """Fold a finished task's run time into its streams"""
+        per_unit = duration_seconds / max(complexity, 1e-6)
+        keys = [(task_type, None)]
+        if agent_type is not None:
+            keys.append((task_type, agent_type))
+        for key in keys:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = DurationStats(self.alpha, self.tracked_quantiles)
+            stats.add(per_unit)
+        self._overall.add(per_unit)
+
+    def estimate(self,
+                 task_type: str,
+                 complexity: float = 1.0,
+                 agent_type: Optional[str] = None) -> float:
+        """Expected run time in seconds for a task of this type and complexity"""
+        stats = self._stats_for(task_type, agent_type, min_samples=1)
+        if stats is not None:
+            per_unit = stats.mean
+        elif self._overall.mean is not None:
+            per_unit = self._overall.mean
+        else:
+            per_unit = self.default_seconds
+        return per_unit * complexity
+
+    def quantile(self,
+                 task_type: str,
+                 quantile: float,
+                 complexity: float = 1.0,
+                 agent_type: Optional[str] = None,
+                 min_samples: int = 1) -> Optional[float]:
+        """
+        Run time in seconds below which ``quantile`` of tasks finished, or
+        None with fewer than ``min_samples`` observations.
+        """
+        if quantile not in self.tracked_quantiles:
+            raise ValueError(f"Quantile {quantile} is not tracked")
+        stats = self._stats_for(task_type, agent_type, min_samples)
+        if stats is None:
+            return None
+        return stats.quantiles[quantile].value() * complexity
+
+    def sample_count(self, task_type: str, agent_type: Optional[str] = None) -> int:
+        stats = self._stats.get((task_type, agent_type))
+        return stats.count if stats else 0
+
+    def _stats_for(self, task_type: str, agent_type: Optional[str], min_samples: int) -> Optional[DurationStats]:
+        for key in ((task_type, agent_type), (task_type, None)):
+            stats = self._stats.get(key)
+            if stats is not None and stats.count >= min_samples:
+                return stats
+        return None
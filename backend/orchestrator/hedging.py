@@ -0,0 +1,129 @@
+"""
+Speculative execution for straggler tasks
+
+A task that runs past its type's usual duration (e.g. p95) gets one
+speculative duplicate on another agent. Whichever attempt returns a
+successful result first wins; attempts still running are cancelled and every
+attempt other than the winner is handed back to the caller for cleanup.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+
+logger = structlog.get_logger()
+
+# Metrics
+hedges_launched_counter = Counter(
+    'task_hedges_launched_total',
+    'Speculative duplicates launched for straggling tasks',
+    ['task_type']
+)
+hedge_outcomes_counter = Counter(
+    'task_hedge_outcomes_total',
+    'Hedged tasks by the attempt that won (hedge or primary)',
+    ['task_type', 'winner']
+)
+
+
+@dataclass
+class HedgeOutcome:
+    """Result of a possibly hedged execution"""
+    result: Any
+    winner: Any
+    hedged: bool = False
+    losers: List[Any] = field(default_factory=list)
+
+
+async def run_hedged(primary_label: Any,
+                     primary: Awaitable[Any],
+                     timeout: float,
+                     abandon: Callable[[Any, bool], Awaitable[None]],
+                     hedge_after: Optional[float] = None,
+                     start_hedge: Optional[Callable[[], Optional[Tuple[Any, Awaitable[Any]]]]] = None,
+                     task_type: str = "") -> HedgeOutcome:
+    """
+    Run a primary attempt and at most one hedge; the first success wins.
+
+    ``start_hedge()`` is called once the primary has run for ``hedge_after``
+    seconds and returns ``(label, attempt)`` or None if no hedge can start.
+    ``abandon(label, still_running)`` is awaited for every attempt that does
+    not win; ``still_running`` tells whether it was cut short and should be
+    cancelled remotely. When no attempt wins, the primary is left to the
+    caller's own failure handling and only hedges are abandoned.
+
+    Raises:
+        asyncio.TimeoutError: If no attempt succeeds within ``timeout``
+        Exception: The last attempt's error if every attempt failed
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempts: Dict[asyncio.Future, Any] = {asyncio.ensure_future(primary): primary_label}
+    finished: List[Any] = []
+    hedged = False
+    winner = None
+
+    try:
+        if hedge_after is not None and start_hedge and hedge_after < timeout:
+            done, _ = await asyncio.wait(list(attempts), timeout=hedge_after)
+            if not done:
+                hedge = start_hedge()
+                if hedge:
+                    hedge_label, hedge_attempt = hedge
+                    attempts[asyncio.ensure_future(hedge_attempt)] = hedge_label
+                    hedged = True
+                    hedges_launched_counter.labels(task_type=task_type).inc()
+
+        error: Optional[BaseException] = None
+        while attempts:
+            remaining = deadline - loop.time()
+            done, _ = await asyncio.wait(
+                list(attempts), timeout=max(remaining, 0),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                raise asyncio.TimeoutError()
+
+            for future in done:
+                label = attempts.pop(future)
+                if future.exception() is not None:
+                    error = future.exception()
+                    finished.append(label)
+                    continue
+                winner = label
+                if hedged:
+                    hedge_outcomes_counter.labels(
+                        task_type=task_type,
+                        winner='primary' if label is primary_label else 'hedge'
+                    ).inc()
+                return HedgeOutcome(
+                    result=future.result(),
+                    winner=label,
+                    hedged=hedged,
+                    losers=finished + list(attempts.values())
+                )
+
+        raise error
+
+    finally:
+        for future in attempts:
+            future.cancel()
+        await asyncio.gather(*attempts, return_exceptions=True)
+
+        for label in finished:
+            if label is not primary_label or winner is not None:
+                await _abandon(abandon, label, still_running=False)
+        for label in attempts.values():
+            if label is not primary_label or winner is not None:
+                await _abandon(abandon, label, still_running=True)
+
+
+async def _abandon(abandon: Callable[[Any, bool], Awaitable[None]], label: Any, still_running: bool):
+    try:
+        await abandon(label, still_running)
+    except Exception as e:
+        logger.warning("Failed to abandon task attempt", error=str(e))
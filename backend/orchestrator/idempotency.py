@@ -0,0 +1,105 @@
+"""
+In-process idempotency-key cache for task submission
+
+Resolves repeated submissions of the same idempotency key in memory: completed
+keys are served from a bounded LRU with TTL, and concurrent duplicates of a key
+whose first submission is still being persisted wait for that submission
+instead of racing it to the database.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+
+# Metrics
+idempotency_cache_hits = Counter(
+    'idempotency_cache_hits_total',
+    'Duplicate submissions resolved in memory',
+    ['source']
+)
+idempotency_cache_misses = Counter(
+    'idempotency_cache_misses_total',
+    'Idempotency keys not found in the in-process cache'
+)
+idempotency_cache_size = Gauge(
+    'idempotency_cache_entries',
+    'Idempotency keys currently cached'
+)
+
+
+class IdempotencyCache:
+    """
+    Bounded LRU/TTL map from idempotency key to owning task_id.
+
+    The cache is only an accelerator: the database unique constraint remains
+    the source of truth across orchestrator instances.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def lookup(self, key: str) -> Optional[str]:
+        """
+        Resolve a key to its task_id without touching the database.
+
+        Waits for an in-flight submission of the same key. Returns None when
+        the caller should submit (and then call ``begin``).
+        """
+        entry = self._entries.get(key)
+        if entry:
+            task_id, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                idempotency_cache_hits.labels(source='cache').inc()
+                return task_id
+            del self._entries[key]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight:
+            idempotency_cache_hits.labels(source='in_flight').inc()
+            return await asyncio.shield(in_flight)
+
+        idempotency_cache_misses.inc()
+        return None
+
+    def begin(self, key: str):
+        """Mark a key as being submitted by the caller"""
+        self._in_flight[key] = asyncio.get_running_loop().create_future()
+
+    def complete(self, key: str, task_id: str):
+        """Record the persisted owner of a key and release waiting duplicates"""
+        self.put(key, task_id)
+        future = self._in_flight.pop(key, None)
+        if future and not future.done():
+            future.set_result(task_id)
+
+    def abort(self, key: str, error: Exception):
+        """Fail waiting duplicates when the owning submission fails"""
+        future = self._in_flight.pop(key, None)
+        if future and not future.done():
+            future.set_exception(error)
+            # Mark retrieved so an unawaited failure is not logged by asyncio
+            future.exception()
+
+    def release(self, key: str):
+        """Let waiting duplicates submit themselves when the owner gives up without an outcome"""
+        future = self._in_flight.pop(key, None)
+        if future and not future.done():
+            future.set_result(None)
+
+    def put(self, key: str, task_id: str):
+        self._entries[key] = (task_id, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        idempotency_cache_size.set(len(self._entries))
@@ -0,0 +1,201 @@
+"""
+Agent liveness from pushed heartbeats
+
+Agents push heartbeats; each one re-arms the agent's expiry on a hashed timer
+wheel, so tracking thousands of agents costs O(1) per heartbeat and one slot
+scan per tick. Only agents whose heartbeats lapse are probed, concurrently and
+with bounded parallelism, before being declared dead; a dead agent keeps being
+probed once per timeout period so it can come back.
+"""
+
+import asyncio
+import math
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+
+logger = structlog.get_logger()
+
+# Metrics
+heartbeats_received_counter = Counter(
+    'agent_heartbeats_received_total',
+    'Heartbeats pushed by agents'
+)
+liveness_probes_counter = Counter(
+    'agent_liveness_probes_total',
+    'Active probes of agents whose heartbeats lapsed, by result (alive, dead)',
+    ['result']
+)
+lapsed_agents_gauge = Gauge(
+    'agent_liveness_lapsed_agents',
+    'Agents currently considered dead'
+)
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel keyed by string.
+
+    Re-arming a key leaves its old slot entry behind; stale entries are
+    dropped the next time their slot is scanned.
+    """
+
+    def __init__(self, tick_seconds: float, num_slots: int = 512):
+        self.tick_seconds = tick_seconds
+        self._slots: List[Set[str]] = [set() for _ in range(num_slots)]
+        self._deadlines: Dict[str, int] = {}
+        self._tick = 0
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def arm(self, key: str, delay_seconds: float):
+        """Expire ``key`` after ``delay_seconds``, replacing any earlier expiry"""
+        deadline = self._tick + max(1, math.ceil(delay_seconds / self.tick_seconds))
+        self._deadlines[key] = deadline
+        self._slots[deadline % len(self._slots)].add(key)
+
+    def cancel(self, key: str):
+        self._deadlines.pop(key, None)
+
+    def advance(self) -> List[str]:
+        """Move one tick forward and return the keys that expired"""
+        self._tick += 1
+        index = self._tick % len(self._slots)
+        slot = self._slots[index]
+        expired = []
+        for key in list(slot):
+            deadline = self._deadlines.get(key)
+            if deadline is None or deadline % len(self._slots) != index:
+                slot.discard(key)
+            elif deadline == self._tick:
+                slot.discard(key)
+                del self._deadlines[key]
+                expired.append(key)
+        return expired
+
+
+class LivenessMonitor:
+    """
+    Heartbeat expiry plus bounded, concurrent probing of lapsed agents.
+
+    ``probe(agent_id)`` returns whether the agent answered. ``on_alive`` is
+    awaited when a lapsed or dead agent is found alive, ``on_dead`` when a
+    probe fails; both may be called repeatedly for the same agent.
+    """
+
+    def __init__(self,
+                 probe: Callable[[str], Awaitable[bool]],
+                 on_alive: Callable[[str], Awaitable[None]],
+                 on_dead: Callable[[str], Awaitable[None]],
+                 heartbeat_timeout: float = 30.0,
+                 probe_timeout: float = 5.0,
+                 max_concurrent_probes: int = 32,
+                 tick_seconds: float = 1.0):
+        self.probe = probe
+        self.on_alive = on_alive
+        self.on_dead = on_dead
+        self.heartbeat_timeout = heartbeat_timeout
+        self.probe_timeout = probe_timeout
+
+        self._wheel = TimerWheel(tick_seconds)
+        self._watched: Set[str] = set()
+        self._dead: Set[str] = set()
+        self._probe_slots = asyncio.Semaphore(max_concurrent_probes)
+        self._probes: Set[asyncio.Task] = set()
+        self._timer_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def dead_agents(self) -> Set[str]:
+        return set(self._dead)
+
+    async def start(self):
+        self._running = True
+        self._timer_task = asyncio.create_task(self._timer_loop())
+
+    async def stop(self):
+        self._running = False
+        tasks = list(self._probes) + ([self._timer_task] if self._timer_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def watch(self, agent_id: str):
+        """Start expecting heartbeats from an agent"""
+        self._watched.add(agent_id)
+        self._wheel.arm(agent_id, self.heartbeat_timeout)
+
+    def forget(self, agent_id: str):
+        self._watched.discard(agent_id)
+        self._dead.discard(agent_id)
+        self._wheel.cancel(agent_id)
+        lapsed_agents_gauge.set(len(self._dead))
+
+    def heartbeat(self, agent_id: str) -> bool:
+        """
+        Record a heartbeat.
+
+        Returns:
+            True if the agent was considered dead and is now alive again
+        """
+        if agent_id not in self._watched:
+            return False
+        heartbeats_received_counter.inc()
+        self._wheel.arm(agent_id, self.heartbeat_timeout)
+        if agent_id in self._dead:
+            self._dead.discard(agent_id)
+            lapsed_agents_gauge.set(len(self._dead))
+            return True
+        return False
+
+    def tick(self):
+        """Advance the wheel once and start probes for lapsed agents"""
+        for agent_id in self._wheel.advance():
+            probe = asyncio.create_task(self._probe_lapsed(agent_id))
+            self._probes.add(probe)
+            probe.add_done_callback(self._probes.discard)
+
+    async def _probe_lapsed(self, agent_id: str):
+        async with self._probe_slots:
+            try:
+                alive = await asyncio.wait_for(self.probe(agent_id), timeout=self.probe_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Agent liveness probe failed", agent_id=agent_id, error=str(e))
+                alive = False
+
+        # Forgotten, or a heartbeat arrived while probing
+        if agent_id not in self._watched or agent_id in self._wheel:
+            return
+
+        liveness_probes_counter.labels(result='alive' if alive else 'dead').inc()
+        self._wheel.arm(agent_id, self.heartbeat_timeout)
+        try:
+            if alive:
+                self._dead.discard(agent_id)
+                await self.on_alive(agent_id)
+            else:
+                self._dead.add(agent_id)
+                await self.on_dead(agent_id)
+        finally:
+            lapsed_agents_gauge.set(len(self._dead))
+
+    async def _timer_loop(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self._running:
+            try:
+                next_tick += self._wheel.tick_seconds
+                await asyncio.sleep(max(0.0, next_tick - loop.time()))
+                self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in liveness monitor", error=str(e))
@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 import json
 import csv
+import os
 from collections import defaultdict, deque
 import numpy as np
 from concurrent.futures import ProcessPoolExecutor
@@ -29,6 +30,7 @@ import pandas as pd
 from backend.models.models import AgentType
 from .agent_manager_v2 import EnhancedAgentManager, TaskPriority
 from .config import OrchestratorConfig
+from .sharding import ShardedAgentManager
 
 
 logger = structlog.get_logger()
@@ -805,6 +807,131 @@ async def run_load_test_suite():
         await manager.shutdown()
 
 
+# Latency of simulated agents in the shard scaling test
+SIMULATED_AGENT_LATENCY_SECONDS = 0.001
+
+
+class SimulatedAgentClient:
+    """In-process stand-in for an agent's gRPC client with a fixed latency"""
+    
+    def __init__(self, latency_seconds: float = SIMULATED_AGENT_LATENCY_SECONDS):
+        self.latency_seconds = latency_seconds
+    
+    async def execute_task(self, task_id: str, task_type: str, payload: Dict[str, Any],
+                           context: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency_seconds)
+        return {"task_id": task_id, "success": True}
+    
+    async def execute_task_batch(self, tasks: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        await asyncio.sleep(self.latency_seconds)
+        return [{"task_id": task["task_id"], "success": True} for task in tasks]
+    
+    async def get_task_checkpoints(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {}
+    
+    async def check_health(self, agent_id: str, timeout: float = 5.0) -> bool:
+        return True
+    
+    async def close(self):
+        pass
+
+
+class SimulatedAgentManager(EnhancedAgentManager):
+    """Manager whose agents are simulated in-process, so the orchestrator is the bottleneck"""
+    
+    async def register_agent(self, *args, **kwargs) -> str:
+        agent_id = await super().register_agent(*args, **kwargs)
+        self.agent_clients[agent_id] = SimulatedAgentClient()
+        return agent_id
+
+
+def simulated_shard_manager(shard_id: int) -> EnhancedAgentManager:
+    return SimulatedAgentManager()
+
+
+async def run_shard_scaling_test(shard_counts: Tuple[int, ...] = (1, 2, 4, 8),
+                                 num_dags: int = 4000,
+                                 dag_depth: int = 5,
+                                 agents_per_shard: int = 20,
+                                 timeout_seconds: float = 600,
+                                 min_efficiency: Optional[float] = 0.8) -> Dict[int, Dict[str, float]]:
+    """
+    Measure sharded-mode throughput as shards are added.
+    
+    Each run submits ``num_dags`` dependency chains of ``dag_depth`` tasks and
+    waits for every task to finish. Agents are simulated and added in
+    proportion to the shards, so per-shard dispatch and bookkeeping is what
+    is measured; near-linear scaling shows as an efficiency close to 1.
+    
+    Raises:
+        AssertionError: If a shard count that fits on the available cores
+            scales below ``min_efficiency``; larger counts share cores and
+            are reported only
+    """
+    total_tasks = num_dags * dag_depth
+    results: Dict[int, Dict[str, float]] = {}
+    
+    for num_shards in shard_counts:
+        manager = ShardedAgentManager(simulated_shard_manager, num_shards=num_shards)
+        await manager.initialize()
+        
+        try:
+            for _ in range(agents_per_shard * num_shards):
+                await manager.register_agent(AgentType.TESTER, {"testing"}, max_concurrent_tasks=50)
+            
+            async def submit_chain():
+                parent = None
+                for _ in range(dag_depth):
+                    parent = await manager.submit_task(
+                        "testing", {}, dependencies=[parent] if parent else None
+                    )
+            
+            start = time.perf_counter()
+            await asyncio.gather(*(submit_chain() for _ in range(num_dags)))
+            
+            while True:
+                stats = await manager.get_system_statistics()
+                if stats["tasks"]["completed"] >= total_tasks:
+                    break
+                if time.perf_counter() - start > timeout_seconds:
+                    raise TimeoutError(f"{num_shards} shards finished {stats['tasks']['completed']}/{total_tasks} tasks")
+                await asyncio.sleep(0.1)
+            elapsed = time.perf_counter() - start
+            
+        finally:
+            await manager.shutdown()
+        
+        results[num_shards] = {"elapsed_seconds": elapsed, "throughput_tps": total_tasks / elapsed}
+    
+    baseline_shards = shard_counts[0]
+    baseline = results[baseline_shards]["throughput_tps"]
+    for num_shards, result in results.items():
+        result["speedup"] = result["throughput_tps"] / baseline
+        result["efficiency"] = result["speedup"] * baseline_shards / num_shards
+        logger.info("Shard scaling result", shards=num_shards, **result)
+    
+    # Each shard is a process; the router needs a core of its own too
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    if min_efficiency is not None:
+        below = {
+            num_shards: round(result["efficiency"], 2)
+            for num_shards, result in results.items()
+            if num_shards < cores and result["efficiency"] < min_efficiency
+        }
+        assert not below, (
+            f"Shard scaling efficiency below {min_efficiency} on {cores} cores: {below}"
+        )
+    
+    return results
+
+
 if __name__ == "__main__":
-    # Run the load test suite
-    asyncio.run(run_load_test_suite())
\ No newline at end of file
+    import sys
+    
+    if "--shard-scaling" in sys.argv:
+        for shards, result in asyncio.run(run_shard_scaling_test()).items():
+            print(f"shards={shards} throughput={result['throughput_tps']:.0f} tasks/s "
+                  f"speedup={result['speedup']:.2f}x efficiency={result['efficiency']:.2f}")
+    else:
+        # Run the load test suite
+        asyncio.run(run_load_test_suite())
\ No newline at end of file
@@ -7,17 +7,30 @@ automatic fallback to rule-based scaling.
 """
 
 from .features import FeatureExtractor, ScalingFeatures
-from .model import WorkloadPredictor, PredictiveScalingEngine
-from .scaler import PredictiveScaler, ScalingDecision, ScalingConstraints
+from .forecaster import BacktestResult, Forecast, WorkloadForecaster, backtest
 
 __all__ = [
     'FeatureExtractor',
-    'ScalingFeatures', 
-    'WorkloadPredictor',
-    'PredictiveScalingEngine',
-    'PredictiveScaler',
-    'ScalingDecision',
-    'ScalingConstraints'
+    'ScalingFeatures',
+    'WorkloadForecaster',
+    'Forecast',
+    'BacktestResult',
+    'backtest',
 ]
 
-__version__ = '1.0.0'
\ No newline at end of file
+# The LSTM predictor and its scaler need torch; the numpy forecaster does not
+try:
+    from .model import WorkloadPredictor, PredictiveScalingEngine
+    from .scaler import PredictiveScaler, ScalingDecision, ScalingConstraints
+except ImportError:
+    pass
+else:
+    __all__ += [
+        'WorkloadPredictor',
+        'PredictiveScalingEngine',
+        'PredictiveScaler',
+        'ScalingDecision',
+        'ScalingConstraints'
+    ]
+
+__version__ = '1.0.0'
@@ -5,7 +5,7 @@ This module extracts and engineers features from Prometheus metrics
 for use in the LSTM workload prediction model.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, Tuple
 import numpy as np
 from datetime import datetime, timedelta
@@ -84,6 +84,10 @@ class ScalingFeatures:
     cost_efficiency: float  # Tasks per dollar
     queue_pressure: float  # Queue depth relative to processing capacity
     
+    # Per-agent-type demand; forecasting targets, not model inputs
+    pending_tasks_by_type: Dict[str, float] = field(default_factory=dict)
+    arrival_rate_by_type: Dict[str, float] = field(default_factory=dict)  # Tasks per second
+    
     def to_numpy(self) -> np.ndarray:
         """Convert features to numpy array for model input"""
         features = []
@@ -178,7 +182,8 @@ class FeatureExtractor:
                 self._extract_agent_metrics(timestamp),
                 self._extract_complexity_metrics(timestamp),
                 self._extract_system_metrics(timestamp),
-                self._extract_external_metrics(timestamp)
+                self._extract_external_metrics(timestamp),
+                self._extract_demand_metrics(timestamp)
             ]
             
             results = await asyncio.gather(*tasks)
@@ -199,6 +204,8 @@ class FeatureExtractor:
                 **results[5],
                 # External metrics
                 **results[6],
+                # Per-agent-type demand
+                **results[7],
                 # Derived features (calculated from above)
                 task_acceleration=self._calculate_acceleration(results[1]),
                 utilization_pressure=self._calculate_pressure(results[3]),
@@ -216,6 +223,18 @@ class FeatureExtractor:
             logger.error("Feature extraction failed", error=str(e), timestamp=timestamp)
             raise
     
+    async def extract_history(self,
+                              start: datetime,
+                              end: datetime,
+                              step: timedelta = timedelta(minutes=1)) -> List[ScalingFeatures]:
+        """Replay recorded metrics as a feature series, e.g. for forecaster backtests"""
+        history = []
+        timestamp = start
+        while timestamp <= end:
+            history.append(await self.extract_features(timestamp))
+            timestamp += step
+        return history
+    
     async def _extract_time_features(self, timestamp: datetime) -> Dict[str, Any]:
         """Extract time-based features"""
         return {
@@ -388,6 +407,19 @@ class FeatureExtractor:
             'concurrent_deployments': concurrent_deployments
         }
     
+    async def _extract_demand_metrics(self, timestamp: datetime) -> Dict[str, Any]:
+        """Extract pending tasks and arrival rate per agent type"""
+        pending_query = 'pending_tasks_per_agent * on (agent_type) agent_pool_size'
+        pending_result = await self._query_prometheus(pending_query, timestamp)
+        
+        arrival_query = 'sum by (agent_type) (rate(agent_tasks_assigned_total[1m]))'
+        arrival_result = await self._query_prometheus(arrival_query, timestamp)
+        
+        return {
+            'pending_tasks_by_type': self._group_by_label(pending_result, 'agent_type'),
+            'arrival_rate_by_type': self._group_by_label(arrival_result, 'agent_type')
+        }
+    
     async def _query_prometheus(self, query: str, timestamp: datetime) -> List[Dict]:
         """Execute Prometheus query with caching"""
         cache_key = f"{query}:{timestamp.isoformat()}"
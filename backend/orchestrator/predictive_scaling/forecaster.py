@@ -0,0 +1,247 @@
+"""
+Short-horizon workload forecasts for predictive autoscaling
+
+Forecasts pending tasks and task arrival rate per agent type 1 to N minutes
+ahead from ScalingFeatures sampled once a minute. Per agent type, one ridge
+regression maps the feature vector plus recent lags of both targets to the
+change in each target at every horizon, in a single closed-form solve; heavy
+regularization therefore degrades to persistence rather than to noise. Until
+enough history has been observed a damped Holt trend is used instead.
+``backtest`` replays recorded features through the same code path offline.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+TARGETS = ("pending", "arrival_rate")
+
+
+def holt_forecast(series: Sequence[float],
+                  horizon: int,
+                  alpha: float = 0.5,
+                  beta: float = 0.3,
+                  phi: float = 0.9) -> np.ndarray:
+    """Damped-trend Holt forecast for steps 1..horizon, clipped at zero"""
+    if len(series) == 0:
+        return np.zeros(horizon)
+
+    level = float(series[0])
+    trend = float(series[1]) - level if len(series) > 1 else 0.0
+    for value in series[1:]:
+        previous = level
+        level = alpha * value + (1 - alpha) * (level + phi * trend)
+        trend = beta * (level - previous) + (1 - beta) * phi * trend
+
+    damping = np.cumsum(phi ** np.arange(1, horizon + 1))
+    return np.maximum(level + damping * trend, 0.0)
+
+
+class RidgeRegression:
+    """Multi-output ridge regression on standardized inputs"""
+
+    def __init__(self, alpha: float = 1.0):
+        self.alpha = alpha
+        self._mean: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._intercept: Optional[np.ndarray] = None
+
+    def fit(self, X: np.ndarray, Y: np.ndarray) -> "RidgeRegression":
+        self._mean = X.mean(axis=0)
+        self._scale = X.std(axis=0)
+        self._scale[self._scale == 0] = 1.0
+        Z = (X - self._mean) / self._scale
+        self._intercept = Y.mean(axis=0)
+
+        gram = Z.T @ Z + self.alpha * np.eye(Z.shape[1])
+        self._weights = np.linalg.solve(gram, Z.T @ (Y - self._intercept))
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return ((X - self._mean) / self._scale) @ self._weights + self._intercept
+
+
+@dataclass
+class Forecast:
+    """Predicted demand for one agent type; index ``h - 1`` is ``h`` minutes ahead"""
+    agent_type: str
+    pending: np.ndarray
+    arrival_rate: np.ndarray  # Tasks per second
+    task_duration: float  # Seconds, from the latest features
+    method: str  # "ridge" or "holt"
+
+    def agents_needed(self, target_queue_depth: float, slots_per_agent: float) -> int:
+        """
+        Agents needed for the forecast peak.
+
+        Enough agents to keep pending tasks per agent at the target depth,
+        and enough slots to absorb the peak arrival rate (Little's law).
+        """
+        for_queue = float(self.pending.max()) / max(target_queue_depth, 1e-9)
+        for_arrivals = float(self.arrival_rate.max()) * self.task_duration / max(slots_per_agent, 1e-9)
+        return math.ceil(max(for_queue, for_arrivals))
+
+
+class WorkloadForecaster:
+    """
+    Online per-agent-type demand forecaster.
+
+    ``observe`` is fed one ScalingFeatures sample per minute; models are
+    refit every ``refit_every`` samples on the retained history.
+    """
+
+    def __init__(self,
+                 agent_types: Iterable[str],
+                 horizon_minutes: int = 10,
+                 lags: int = 5,
+                 ridge_alpha: float = 10.0,
+                 min_history: int = 60,
+                 history_size: int = 1440,
+                 refit_every: int = 15):
+        self.agent_types = list(agent_types)
+        self.horizon = horizon_minutes
+        self.lags = lags
+        self.ridge_alpha = ridge_alpha
+        self.min_history = max(min_history, lags + horizon_minutes + 1)
+        self.refit_every = refit_every
+
+        self._features: Deque[np.ndarray] = deque(maxlen=history_size)
+        # agent type -> rows of (pending, arrival_rate), aligned with _features
+        self._targets: Dict[str, Deque[Tuple[float, float]]] = {
+            agent_type: deque(maxlen=history_size) for agent_type in self.agent_types
+        }
+        self._durations: Dict[str, float] = {}
+        self._models: Dict[str, RidgeRegression] = {}
+        self._since_fit = 0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def observe(self, features):
+        """Record one sample of ScalingFeatures"""
+        self._features.append(np.asarray(features.to_numpy(), dtype=np.float64))
+        for agent_type in self.agent_types:
+            self._targets[agent_type].append((
+                float(features.pending_tasks_by_type.get(agent_type, 0.0)),
+                float(features.arrival_rate_by_type.get(agent_type, 0.0)),
+            ))
+            duration = features.avg_task_duration_by_type.get(agent_type)
+            if duration:
+                self._durations[agent_type] = float(duration)
+
+        self._since_fit += 1
+        if len(self._features) >= self.min_history and (
+            self._since_fit >= self.refit_every or not self._models
+        ):
+            self._fit()
+
+    def forecast(self, agent_type: str) -> Optional[Forecast]:
+        """Forecast for the next ``horizon_minutes``, or None without history"""
+        targets = self._targets.get(agent_type)
+        if not targets:
+            return None
+
+        duration = self._durations.get(agent_type, 0.0)
+        model = self._models.get(agent_type)
+        if model is None:
+            series = np.asarray(targets)
+            return Forecast(
+                agent_type,
+                pending=holt_forecast(series[:, 0], self.horizon),
+                arrival_rate=holt_forecast(series[:, 1], self.horizon),
+                task_duration=duration,
+                method="holt",
+            )
+
+        recent = np.asarray(list(targets)[-(self.lags + 1):])
+        x = self._design_row(self._features[-1], recent)
+        predicted = recent[-1] + model.predict(x[None, :])[0].reshape(self.horizon, len(TARGETS))
+        predicted = np.maximum(predicted, 0.0)
+        return Forecast(agent_type, predicted[:, 0], predicted[:, 1], duration, "ridge")
+
+    def _design_row(self, features: np.ndarray, window: np.ndarray) -> np.ndarray:
+        """Features plus the current targets and their last ``lags`` differences"""
+        if len(window) <= self.lags:
+            window = np.vstack([np.repeat(window[:1], self.lags + 1 - len(window), axis=0), window])
+        return np.concatenate([features, window[-1], np.diff(window, axis=0).ravel()])
+
+    def _fit(self):
+        self._since_fit = 0
+        features = np.stack(self._features)
+        rows = range(self.lags, len(features) - self.horizon)
+        if not rows:
+            return
+
+        for agent_type in self.agent_types:
+            series = np.asarray(self._targets[agent_type])
+            X = np.stack([
+                self._design_row(features[t], series[t - self.lags:t + 1]) for t in rows
+            ])
+            # Change in each target at every horizon, flattened horizon-major
+            Y = np.stack([
+                (series[t + 1:t + 1 + self.horizon] - series[t]).ravel() for t in rows
+            ])
+            self._models[agent_type] = RidgeRegression(self.ridge_alpha).fit(X, Y)
+
+
+@dataclass
+class BacktestResult:
+    """Mean absolute error per horizon (minutes 1..N) against a persistence baseline"""
+    mae: Dict[str, np.ndarray]
+    persistence_mae: Dict[str, np.ndarray]
+    forecasts: int
+
+    def skill(self, target: str = "pending") -> np.ndarray:
+        """1 - MAE / persistence MAE per horizon; positive beats persistence"""
+        baseline = self.persistence_mae[target]
+        return 1.0 - self.mae[target] / np.where(baseline > 0, baseline, 1.0)
+
+
+def backtest(samples: Sequence,
+             agent_types: Iterable[str],
+             horizon_minutes: int = 10,
+             **forecaster_kwargs) -> BacktestResult:
+    """
+    Walk-forward evaluation over recorded ScalingFeatures.
+
+    Each sample is observed in order, exactly as the live loop would; every
+    forecast made with the model past its warm-up is scored against the
+    samples that followed it. Errors are summed over agent types.
+    """
+    agent_types = list(agent_types)
+    forecaster = WorkloadForecaster(agent_types, horizon_minutes, **forecaster_kwargs)
+    errors = {target: np.zeros(horizon_minutes) for target in TARGETS}
+    baseline = {target: np.zeros(horizon_minutes) for target in TARGETS}
+    forecasts = 0
+
+    def actual(sample, agent_type) -> List[float]:
+        return [sample.pending_tasks_by_type.get(agent_type, 0.0),
+                sample.arrival_rate_by_type.get(agent_type, 0.0)]
+
+    for t, sample in enumerate(samples):
+        forecaster.observe(sample)
+        if t + horizon_minutes >= len(samples) or len(forecaster) < forecaster.min_history:
+            continue
+
+        forecasts += 1
+        for agent_type in agent_types:
+            forecast = forecaster.forecast(agent_type)
+            predicted = np.stack([forecast.pending, forecast.arrival_rate], axis=1)
+            future = np.asarray([actual(samples[t + h], agent_type)
+                                 for h in range(1, horizon_minutes + 1)])
+            now = np.asarray(actual(sample, agent_type))
+            for i, target in enumerate(TARGETS):
+                errors[target] += np.abs(predicted[:, i] - future[:, i])
+                baseline[target] += np.abs(now[i] - future[:, i])
+
+    scale = max(forecasts, 1)
+    return BacktestResult(
+        mae={target: errors[target] / scale for target in TARGETS},
+        persistence_mae={target: baseline[target] / scale for target in TARGETS},
+        forecasts=forecasts,
+    )
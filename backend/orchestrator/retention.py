@@ -0,0 +1,201 @@
+"""
+Bounded retention of finished task results
+
+Keeps a window of recent results in memory, evicting by count and age. Evicted
+results are spilled in batches to the shared memory store with a TTL, and a
+bounded index of spilled task IDs lets dependency checks answer without a
+round-trip for recently finished work. Older results remain readable from the
+store (and from Postgres through the task journal).
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from backend.memory.context_store import SharedMemoryStore
+
+
+logger = structlog.get_logger()
+
+# Metrics
+task_results_retained = Gauge(
+    'task_results_retained',
+    'Finished task results held in orchestrator memory'
+)
+task_results_spilled = Counter(
+    'task_results_spilled_total',
+    'Finished task results moved out of memory',
+    ['outcome']
+)
+task_result_lookups = Counter(
+    'task_result_lookups_total',
+    'Finished task result lookups by where they were served from',
+    ['source']
+)
+
+RESULT_KEY_PREFIX = "task_result:"
+
+
+class ResultRetentionStore:
+    """
+    In-memory window of finished task results with spill to shared memory.
+
+    ``task_id in store`` answers whether a task is known to have finished,
+    either from the in-memory window or from the spilled-ID index.
+    """
+
+    def __init__(self,
+                 memory_store: Optional[SharedMemoryStore] = None,
+                 max_entries: int = 10000,
+                 max_age_seconds: float = 900,
+                 spill_ttl_seconds: int = 86400,
+                 spill_batch_size: int = 500,
+                 spilled_index_size: int = 100000,
+                 spill_interval_seconds: float = 1.0):
+        self.memory_store = memory_store
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.spill_ttl_seconds = spill_ttl_seconds
+        self.spill_batch_size = spill_batch_size
+        self.spilled_index_size = spilled_index_size
+        self.spill_interval_seconds = spill_interval_seconds
+
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._spill_buffer: Dict[str, Any] = {}
+        self._spilled: "OrderedDict[str, None]" = OrderedDict()
+        self.total_recorded = 0
+
+        self._spill_requested = asyncio.Event()
+        self._spill_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries or task_id in self._spill_buffer or task_id in self._spilled
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def start(self):
+        """Start the background spill loop"""
+        self._running = True
+        self._spill_task = asyncio.create_task(self._spill_loop())
+
+    async def stop(self):
+        """Stop the spill loop and spill everything still buffered"""
+        self._running = False
+        if self._spill_task:
+            self._spill_task.cancel()
+            await asyncio.gather(self._spill_task, return_exceptions=True)
+        await self.spill()
+
+    def put(self, task_id: str, result: Any):
+        """Record the result of a finished task"""
+        self._entries[task_id] = (result, time.monotonic())
+        self._entries.move_to_end(task_id)
+        self._spill_buffer.pop(task_id, None)
+        self.total_recorded += 1
+
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+        task_results_retained.set(len(self._entries))
+
+        if len(self._spill_buffer) >= self.spill_batch_size:
+            self._spill_requested.set()
+
+    def get(self, task_id: str, default: Any = None) -> Any:
+        """Return a result still held in memory, without touching the store"""
+        entry = self._entries.get(task_id)
+        if entry:
+            return entry[0]
+        return self._spill_buffer.get(task_id, default)
+
+    async def lookup(self, task_id: str) -> Tuple[bool, Any]:
+        """
+        Find a finished task's result in memory or in the shared store.
+
+        Returns:
+            (found, result); results may legitimately be None
+        """
+        if task_id in self._entries:
+            task_result_lookups.labels(source='memory').inc()
+            return True, self._entries[task_id][0]
+        if task_id in self._spill_buffer:
+            task_result_lookups.labels(source='memory').inc()
+            return True, self._spill_buffer[task_id]
+
+        if self.memory_store:
+            stored = await self.memory_store.get_multiple([RESULT_KEY_PREFIX + task_id])
+            if stored:
+                task_result_lookups.labels(source='store').inc()
+                return True, stored[RESULT_KEY_PREFIX + task_id]
+
+        task_result_lookups.labels(source='miss').inc()
+        return False, None
+
+    async def is_finished(self, task_id: str) -> bool:
+        """Membership check that falls back to the shared store for old tasks"""
+        if task_id in self:
+            return True
+        if self.memory_store:
+            return await self.memory_store.exists(RESULT_KEY_PREFIX + task_id)
+        return False
+
+    def evict_expired(self):
+        """Move results older than ``max_age_seconds`` to the spill buffer"""
+        cutoff = time.monotonic() - self.max_age_seconds
+        while self._entries:
+            _, (_, stored_at) = next(iter(self._entries.items()))
+            if stored_at > cutoff:
+                break
+            self._evict_oldest()
+        task_results_retained.set(len(self._entries))
+
+    def _evict_oldest(self):
+        task_id, (result, _) = self._entries.popitem(last=False)
+        self._spill_buffer[task_id] = result
+
+    async def _spill_loop(self):
+        """Spill on size trigger or every spill interval"""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._spill_requested.wait(),
+                                           timeout=self.spill_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._spill_requested.clear()
+                self.evict_expired()
+                await self.spill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in result spill loop", error=str(e))
+                await asyncio.sleep(self.spill_interval_seconds)
+
+    async def spill(self):
+        """Write buffered evictions to the shared store in one batch"""
+        if not self._spill_buffer:
+            return
+
+        batch, self._spill_buffer = self._spill_buffer, {}
+        stored = False
+        if self.memory_store:
+            stored = await self.memory_store.set_multiple(
+                {RESULT_KEY_PREFIX + task_id: result for task_id, result in batch.items()},
+                ttl=self.spill_ttl_seconds
+            )
+
+        if not stored:
+            # Results stay readable from Postgres; never re-buffer, or a store
+            # outage would turn into unbounded memory growth
+            logger.warning("Dropping spilled task results", count=len(batch))
+        task_results_spilled.labels(outcome='stored' if stored else 'dropped').inc(len(batch))
+
+        for task_id in batch:
+            self._spilled[task_id] = None
+        while len(self._spilled) > self.spilled_index_size:
+            self._spilled.popitem(last=False)
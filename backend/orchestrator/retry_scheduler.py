@@ -0,0 +1,128 @@
+"""
+Delayed requeue scheduler for task retries
+
+Owns retry/backoff timing so task processors never sleep in-line: a retry is
+pushed onto a heap keyed by due time and a single timer coroutine requeues it
+when due. Delays use exponential backoff with full jitter to spread retries
+of tasks that failed together.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import structlog
+from prometheus_client import Gauge, Histogram
+
+
+logger = structlog.get_logger()
+
+# Metrics
+retry_delay_histogram = Histogram(
+    'task_retry_delay_seconds',
+    'Backoff delay applied before a task retry',
+    buckets=[0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60]
+)
+delayed_tasks_gauge = Gauge(
+    'task_retries_delayed',
+    'Tasks waiting for their retry backoff to elapse'
+)
+
+
+class RetryScheduler:
+    """
+    Heap-based delayed requeue with exponential backoff and full jitter.
+    """
+
+    def __init__(self,
+                 requeue: Callable[[Any], Awaitable[None]],
+                 base_delay_seconds: float = 1.0,
+                 max_delay_seconds: float = 60.0,
+                 rng: Optional[random.Random] = None):
+        self.requeue = requeue
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._rng = rng or random.Random()
+
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._timer_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._heap)
+
+    async def start(self):
+        """Start the timer loop"""
+        self._running = True
+        self._timer_task = asyncio.create_task(self._timer_loop())
+
+    async def stop(self):
+        """Stop the timer loop; delayed tasks are not requeued"""
+        self._running = False
+        if self._timer_task:
+            self._timer_task.cancel()
+            await asyncio.gather(self._timer_task, return_exceptions=True)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter delay for the given retry attempt (1-based)"""
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt)
+        return self._rng.uniform(0, cap)
+
+    def schedule(self, task: Any, attempt: int) -> float:
+        """
+        Requeue ``task`` after its backoff delay without blocking the caller.
+
+        Returns:
+            The delay applied, in seconds
+        """
+        delay = self.backoff_delay(attempt)
+        self.schedule_after(task, delay)
+        return delay
+
+    def schedule_after(self, task: Any, delay: float):
+        due = time.monotonic() + delay
+        # Only wake the timer if this retry is due before the current head
+        wake = not self._heap or due < self._heap[0][0]
+        heapq.heappush(self._heap, (due, next(self._sequence), task))
+
+        retry_delay_histogram.observe(delay)
+        delayed_tasks_gauge.set(len(self._heap))
+        if wake:
+            self._changed.set()
+
+    async def _timer_loop(self):
+        """Sleep until the earliest retry is due, then requeue everything due"""
+        while self._running:
+            try:
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                await self._requeue_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in retry scheduler", error=str(e))
+                await asyncio.sleep(1)
+
+    async def _requeue_due(self):
+        now = time.monotonic()
+        while self._heap and self._heap[0][0] <= now:
+            _, _, task = heapq.heappop(self._heap)
+            delayed_tasks_gauge.set(len(self._heap))
+            try:
+                await self.requeue(task)
+            except Exception as e:
+                logger.error("Failed to requeue delayed task",
+                             task_id=getattr(task, 'task_id', None),
+                             error=str(e))
@@ -0,0 +1,524 @@
+"""
+Sharded multi-process mode for the Enhanced Agent Manager
+
+A single manager runs dispatch and bookkeeping on one event loop, so one core
+caps its throughput. In sharded mode a thin router spreads tasks across N
+worker processes by consistent hash of the task's DAG root (or its task_id),
+so whole dependency chains stay on one shard. Each worker runs its own
+manager with its own queues and a balanced subset of the agents. A DAG edge
+that spans shards is resolved by the upstream task's shard notifying the
+dependant's shard, through the router, once the upstream task finishes.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import itertools
+import multiprocessing as mp
+import pickle
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from .config import config
+
+
+logger = structlog.get_logger()
+
+# Metrics
+sharded_tasks_routed = Counter(
+    'sharded_tasks_routed_total',
+    'Tasks routed to each orchestrator shard',
+    ['shard']
+)
+cross_shard_dependencies = Counter(
+    'cross_shard_dependency_notifications_total',
+    'Upstream task completions forwarded to another shard'
+)
+
+# Manager methods a shard worker serves for the router
+SHARD_METHODS = frozenset({
+    'submit_task',
+    'register_agent',
+    'unregister_agent',
+    'get_task_status',
+    'get_system_statistics',
+})
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+class ConsistentHashRing:
+    """
+    Hash ring with virtual nodes; adding or removing a shard only remaps the
+    keys on that shard's arcs.
+    """
+
+    def __init__(self, shard_ids: Iterable[int], virtual_nodes: int = 128):
+        self.virtual_nodes = virtual_nodes
+        self._shards: Set[int] = set()
+        self._points: List[int] = []
+        self._owners: List[int] = []
+        for shard_id in shard_ids:
+            self.add_shard(shard_id)
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+    def add_shard(self, shard_id: int):
+        if shard_id in self._shards:
+            return
+        self._shards.add(shard_id)
+        self._rebuild()
+
+    def remove_shard(self, shard_id: int):
+        self._shards.discard(shard_id)
+        self._rebuild()
+
+    def shard_for(self, key: str) -> int:
+        if not self._points:
+            raise ValueError("Hash ring has no shards")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def _rebuild(self):
+        ring = sorted(
+            (_hash(f"shard-{shard_id}#{replica}"), shard_id)
+            for shard_id in self._shards
+            for replica in range(self.virtual_nodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [shard_id for _, shard_id in ring]
+
+
+class ShardRouter:
+    """
+    Routing state for sharded mode: which shard owns a task, which shard an
+    agent lives on, and which dependency edges cross shards.
+
+    With ``shard_key="dag_root"`` a task is placed with the root of its first
+    dependency's DAG. Independent tasks carrying an idempotency key are
+    hashed by that key so duplicate submissions meet the same shard's cache.
+    """
+
+    def __init__(self,
+                 num_shards: int,
+                 shard_key: str = "dag_root",
+                 virtual_nodes: int = 128,
+                 max_tracked_tasks: int = 1000000):
+        if shard_key not in ("dag_root", "task_id"):
+            raise ValueError(f"Unknown shard key: {shard_key}")
+
+        self.num_shards = num_shards
+        self.shard_key = shard_key
+        self.max_tracked_tasks = max_tracked_tasks
+        self.ring = ConsistentHashRing(range(num_shards), virtual_nodes)
+
+        # task_id -> (DAG root, shard), oldest first
+        self._tasks: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._agent_shards: Dict[str, Tuple[int, Any]] = {}
+        self._agents_per_shard: Dict[Any, List[int]] = defaultdict(lambda: [0] * num_shards)
+
+    def route(self,
+              task_id: str,
+              dependencies: Sequence[str] = (),
+              idempotency_key: Optional[str] = None) -> int:
+        """Choose and remember the shard for a new task"""
+        if self.shard_key == "dag_root" and dependencies:
+            root = self.root_of(dependencies[0])
+        else:
+            root = idempotency_key or task_id
+
+        shard = self.ring.shard_for(root)
+        self.remember(task_id, shard, root)
+        return shard
+
+    def remember(self, task_id: str, shard: int, root: Optional[str] = None):
+        self._tasks[task_id] = (root or task_id, shard)
+        self._tasks.move_to_end(task_id)
+        if len(self._tasks) > self.max_tracked_tasks:
+            self._tasks.popitem(last=False)
+
+    def root_of(self, task_id: str) -> str:
+        known = self._tasks.get(task_id)
+        return known[0] if known else task_id
+
+    def shard_of(self, task_id: str) -> Optional[int]:
+        """Shard owning a task, or None once it has aged out of the router"""
+        known = self._tasks.get(task_id)
+        return known[1] if known else None
+
+    def remote_dependencies(self, shard: int, dependencies: Sequence[str]) -> Dict[Optional[int], List[str]]:
+        """
+        Group the dependencies owned by other shards by their owner.
+
+        Dependencies the router no longer tracks are grouped under ``None``;
+        their owner has to be asked for by broadcast.
+        """
+        remote: Dict[Optional[int], List[str]] = defaultdict(list)
+        for dep_id in dependencies:
+            owner = self.shard_of(dep_id)
+            if owner != shard:
+                remote[owner].append(dep_id)
+        return dict(remote)
+
+    def assign_agent(self, agent_type: Any) -> int:
+        """Pick the shard with the fewest agents of this type"""
+        counts = self._agents_per_shard[agent_type]
+        return min(range(self.num_shards), key=lambda shard: (counts[shard], shard))
+
+    def add_agent(self, agent_id: str, agent_type: Any, shard: int):
+        self._agent_shards[agent_id] = (shard, agent_type)
+        self._agents_per_shard[agent_type][shard] += 1
+
+    def remove_agent(self, agent_id: str) -> Optional[int]:
+        entry = self._agent_shards.pop(agent_id, None)
+        if entry is None:
+            return None
+        shard, agent_type = entry
+        self._agents_per_shard[agent_type][shard] -= 1
+        return shard
+
+
+class _MessageBuffer:
+    """Coalesces messages sent during one loop iteration into a single put"""
+
+    def __init__(self, send: Callable[[List[tuple]], None]):
+        self.send = send
+        self._messages: List[tuple] = []
+
+    def append(self, message: tuple):
+        if not self._messages:
+            asyncio.get_running_loop().call_soon(self.flush)
+        self._messages.append(message)
+
+    def flush(self):
+        if self._messages:
+            messages, self._messages = self._messages, []
+            self.send(messages)
+
+
+def _is_success(result: Any) -> bool:
+    return not (isinstance(result, dict) and
+                ("error" in result or result.get("status") == "cancelled"))
+
+
+class ShardWorker:
+    """
+    Serves router messages against one shard's manager.
+
+    Messages are tuples:
+        ("call", request_id, method, args, kwargs) -> ("reply", request_id, ok, value)
+        ("watch", task_id, shard)  notify ``shard`` once ``task_id`` finishes
+        ("dependency_finished", task_id, succeeded)
+    Finished watched tasks are reported as ("finished", task_id, succeeded, shards).
+    """
+
+    def __init__(self, shard_id: int, manager, send: Callable[[List[tuple]], None]):
+        self.shard_id = shard_id
+        self.manager = manager
+        self._outgoing = _MessageBuffer(send)
+        self._watchers: Dict[str, Set[int]] = defaultdict(set)
+        self._in_flight: Set[asyncio.Task] = set()
+        manager.add_task_finished_listener(self._on_task_finished)
+
+    def handle(self, message: tuple):
+        kind = message[0]
+        if kind == "call":
+            self._spawn(self._call(*message[1:]))
+        elif kind == "watch":
+            self._spawn(self._watch(*message[1:]))
+        elif kind == "dependency_finished":
+            self._spawn(self.manager.mark_external_task_finished(*message[1:]))
+        else:
+            logger.error("Unknown shard message", shard=self.shard_id, kind=kind)
+
+    async def drain(self):
+        """Wait for in-flight messages and send buffered replies"""
+        while self._in_flight:
+            await asyncio.gather(*list(self._in_flight), return_exceptions=True)
+        self._outgoing.flush()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _call(self, request_id: int, method: str, args: tuple, kwargs: Dict[str, Any]):
+        try:
+            if method not in SHARD_METHODS:
+                raise ValueError(f"Method {method} is not served by shards")
+            value = getattr(self.manager, method)(*args, **kwargs)
+            if asyncio.iscoroutine(value):
+                value = await value
+            reply = ("reply", request_id, True, value)
+        except Exception as e:
+            reply = ("reply", request_id, False, _picklable_error(e))
+        self._outgoing.append(reply)
+
+    async def _watch(self, task_id: str, shard: int):
+        if task_id in self.manager.pending_tasks:
+            self._watchers[task_id].add(shard)
+            return
+
+        found, result = await self.manager.completed_tasks.lookup(task_id)
+        if found:
+            self._outgoing.append(("finished", task_id, _is_success(result), [shard]))
+
+    def _on_task_finished(self, task_id: str, succeeded: bool):
+        shards = self._watchers.pop(task_id, None)
+        if shards:
+            self._outgoing.append(("finished", task_id, succeeded, sorted(shards)))
+
+
+def _picklable_error(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+
+
+def default_manager_factory(shard_id: int):
+    # Imported in the worker so the router process stays light
+    from .agent_manager_v2 import EnhancedAgentManager
+    return EnhancedAgentManager()
+
+
+def run_shard_worker(shard_id: int,
+                     manager_factory: Callable[[int], Any],
+                     inbox: mp.Queue,
+                     outbox: mp.Queue):
+    """Worker process entry point"""
+    asyncio.run(_serve_shard(shard_id, manager_factory, inbox, outbox))
+
+
+async def _serve_shard(shard_id: int,
+                       manager_factory: Callable[[int], Any],
+                       inbox: mp.Queue,
+                       outbox: mp.Queue):
+    loop = asyncio.get_running_loop()
+    manager = manager_factory(shard_id)
+    await manager.initialize()
+    worker = ShardWorker(shard_id, manager, outbox.put)
+    outbox.put([("ready", shard_id)])
+
+    try:
+        while True:
+            messages = await loop.run_in_executor(None, inbox.get)
+            if messages is None:
+                break
+            for message in messages:
+                worker.handle(message)
+    finally:
+        await worker.drain()
+        await manager.shutdown()
+        outbox.put([("stopped", shard_id)])
+
+
+class ShardedAgentManager:
+    """
+    Router-side facade with the manager's public API, backed by shard
+    worker processes.
+
+    ``manager_factory(shard_id)`` runs in each worker and must be picklable
+    (a module-level callable); it returns an uninitialized manager.
+    """
+
+    def __init__(self,
+                 manager_factory: Callable[[int], Any] = default_manager_factory,
+                 num_shards: Optional[int] = None,
+                 shard_key: Optional[str] = None,
+                 start_method: str = "spawn"):
+        self.manager_factory = manager_factory
+        self.num_shards = num_shards or config.performance.shard_count
+        self.router = ShardRouter(
+            self.num_shards,
+            shard_key=shard_key or config.performance.shard_key,
+            virtual_nodes=config.performance.shard_virtual_nodes,
+            max_tracked_tasks=config.performance.shard_tracked_tasks
+        )
+        self._context = mp.get_context(start_method)
+
+        self._inboxes: List[mp.Queue] = []
+        self._outbox: Optional[mp.Queue] = None
+        self._processes: List[mp.Process] = []
+        self._outgoing: List[_MessageBuffer] = []
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._lifecycle: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._request_ids = itertools.count()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def initialize(self):
+        """Start the shard workers and wait until each manager is initialized"""
+        loop = asyncio.get_running_loop()
+        self._outbox = self._context.Queue()
+        for shard_id in range(self.num_shards):
+            inbox = self._context.Queue()
+            process = self._context.Process(
+                target=run_shard_worker,
+                args=(shard_id, self.manager_factory, inbox, self._outbox),
+                name=f"orchestrator-shard-{shard_id}",
+                daemon=True
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+            self._outgoing.append(_MessageBuffer(inbox.put))
+            self._lifecycle[("ready", shard_id)] = loop.create_future()
+            self._lifecycle[("stopped", shard_id)] = loop.create_future()
+
+        self._reader_task = asyncio.create_task(self._read_outbox())
+        await asyncio.gather(*(self._lifecycle[("ready", shard_id)] for shard_id in range(self.num_shards)))
+
+        logger.info("Sharded agent manager initialized",
+                   num_shards=self.num_shards,
+                   shard_key=self.router.shard_key)
+
+    async def submit_task(self,
+                          task_type: str,
+                          payload: Dict[str, Any],
+                          dependencies: List[str] = None,
+                          idempotency_key: Optional[str] = None,
+                          **kwargs) -> str:
+        """Route a task to its shard; accepts ``EnhancedAgentManager.submit_task`` arguments"""
+        dependencies = list(dependencies or [])
+        task_id = str(uuid.uuid4())
+        shard = self.router.route(task_id, dependencies, idempotency_key)
+        sharded_tasks_routed.labels(shard=str(shard)).inc()
+
+        owner_task_id = await self._call(
+            shard, 'submit_task', task_type, payload,
+            dependencies=dependencies, idempotency_key=idempotency_key,
+            task_id=task_id, **kwargs
+        )
+        if owner_task_id != task_id:
+            # Duplicate idempotency key; the owning task lives on this shard
+            self.router.remember(owner_task_id, shard)
+
+        # Watch remote upstream tasks only once the dependant's shard holds
+        # placeholders for them, so an early notification is not lost
+        for owner, dep_ids in self.router.remote_dependencies(shard, dependencies).items():
+            targets = [owner] if owner is not None else [s for s in range(self.num_shards) if s != shard]
+            for target in targets:
+                for dep_id in dep_ids:
+                    self._outgoing[target].append(("watch", dep_id, shard))
+
+        return owner_task_id
+
+    async def register_agent(self, agent_type, capabilities: Set[str], **kwargs) -> str:
+        shard = self.router.assign_agent(agent_type)
+        agent_id = await self._call(shard, 'register_agent', agent_type, capabilities, **kwargs)
+        self.router.add_agent(agent_id, agent_type, shard)
+        return agent_id
+
+    async def unregister_agent(self, agent_id: str):
+        shard = self.router.remove_agent(agent_id)
+        if shard is not None:
+            await self._call(shard, 'unregister_agent', agent_id)
+
+    async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        shard = self.router.shard_of(task_id)
+        if shard is not None:
+            return await self._call(shard, 'get_task_status', task_id)
+
+        statuses = await asyncio.gather(*(
+            self._call(shard_id, 'get_task_status', task_id) for shard_id in range(self.num_shards)
+        ))
+        return next((status for status in statuses if status is not None), None)
+
+    async def get_system_statistics(self) -> Dict[str, Any]:
+        """Shard statistics merged: counts summed, flags OR-ed, path lengths maxed, rates recomputed"""
+        shard_stats = await asyncio.gather(*(
+            self._call(shard_id, 'get_system_statistics') for shard_id in range(self.num_shards)
+        ))
+        stats = _merge_statistics(shard_stats)
+        stats["shards"] = {
+            "count": self.num_shards,
+            "pending_by_shard": [s["tasks"]["pending"] for s in shard_stats],
+            "completed_by_shard": [s["tasks"]["completed"] for s in shard_stats],
+        }
+        return stats
+
+    async def shutdown(self):
+        """Stop every shard, letting each manager shut down gracefully"""
+        logger.info("Shutting down sharded agent manager")
+        for buffer in self._outgoing:
+            buffer.flush()
+        for inbox in self._inboxes:
+            inbox.put(None)
+
+        await asyncio.gather(*(self._lifecycle[("stopped", shard_id)] for shard_id in range(self.num_shards)))
+        self._outbox.put(None)
+        if self._reader_task:
+            await self._reader_task
+
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join)
+        logger.info("Sharded agent manager shutdown complete")
+
+    async def _call(self, shard: int, method: str, *args, **kwargs) -> Any:
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._replies[request_id] = future
+        self._outgoing[shard].append(("call", request_id, method, args, kwargs))
+        return await future
+
+    async def _read_outbox(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            messages = await loop.run_in_executor(None, self._outbox.get)
+            if messages is None:
+                return
+            for message in messages:
+                try:
+                    self._handle_shard_message(message)
+                except Exception as e:
+                    logger.error("Failed to handle shard message", kind=message[0], error=str(e))
+
+    def _handle_shard_message(self, message: tuple):
+        kind = message[0]
+        if kind == "reply":
+            _, request_id, ok, value = message
+            future = self._replies.pop(request_id, None)
+            if future and not future.done():
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        elif kind == "finished":
+            _, task_id, succeeded, shards = message
+            for shard in shards:
+                cross_shard_dependencies.inc()
+                self._outgoing[shard].append(("dependency_finished", task_id, succeeded))
+        elif kind in ("ready", "stopped"):
+            future = self._lifecycle[(kind, message[1])]
+            if not future.done():
+                future.set_result(None)
+
+
+def _merge_statistics(stats_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            if key not in merged:
+                merged[key] = _merge_statistics([value]) if isinstance(value, dict) else value
+            elif isinstance(value, dict):
+                merged[key] = _merge_statistics([merged[key], value])
+            elif isinstance(value, bool):
+                merged[key] = merged[key] or value
+            elif key == "critical_path_length":
+                merged[key] = max(merged[key], value)
+            elif isinstance(value, (int, float)):
+                merged[key] = merged[key] + value
+    if "deadlines_met" in merged and "deadlines_missed" in merged:
+        # Rates don't add up; recompute from the summed counts
+        total = merged["deadlines_met"] + merged["deadlines_missed"]
+        merged["deadline_miss_rate"] = merged["deadlines_missed"] / total if total else 0.0
+    return merged
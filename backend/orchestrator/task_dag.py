@@ -0,0 +1,309 @@
+"""
+Task dependency DAG for the Enhanced Agent Manager
+
+Tracks dependencies between submitted tasks for readiness, critical-path
+analysis, parallel grouping and failure propagation. Readiness (unsatisfied
+dependency counts), topological levels, earliest start/finish times and the
+longest remaining path from each task (its tail, which gives latest start and
+slack) are maintained incrementally as tasks and edges are added and tasks
+finish, so queries do not rescan the graph. Finished nodes are garbage collected once no
+live task depends on them, so the DAG only spans the active frontier of work.
+"""
+
+import heapq
+from collections import defaultdict, deque
+from typing import Dict, List, Set, Tuple
+
+import structlog
+
+
+logger = structlog.get_logger()
+
+
+class TaskDAG:
+    """Directed Acyclic Graph for task dependencies and optimization"""
+
+    def __init__(self):
+        self.task_durations: Dict[str, float] = {}
+        self._successors: Dict[str, Set[str]] = {}
+        self._predecessors: Dict[str, Set[str]] = {}
+
+        # Readiness: dependencies not yet satisfied, per unfinished task
+        self._unsatisfied: Dict[str, int] = {}
+        self._finished: Set[str] = set()
+        self._succeeded: Set[str] = set()
+        self.ready: Set[str] = set()
+
+        # Longest-path bookkeeping; values only grow, so finished work that
+        # has been collected still counts towards its descendants' paths
+        self._earliest_start: Dict[str, float] = {}
+        self._critical_predecessor: Dict[str, str] = {}
+        self._level: Dict[str, int] = {}
+        self._levels: Dict[int, Set[str]] = defaultdict(set)
+
+        # Longest duration-weighted path from each task to a sink, including
+        # the task itself
+        self._tail: Dict[str, float] = {}
+
+        # Lazy max-heap of (-earliest_finish, node); stale entries are skipped
+        self._finish_heap: List[Tuple[float, str]] = []
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._successors
+
+    def __len__(self) -> int:
+        return len(self._successors)
+
+    def add_task(self, task_id: str, estimated_duration: float = 1.0) -> List[str]:
+        """
+        Add a task or set the duration of a placeholder.
+
+        Returns:
+            Ancestors whose tail length grew as a result
+        """
+        if task_id not in self._successors:
+            self._add_node(task_id)
+        self.task_durations[task_id] = estimated_duration
+        self._tail[task_id] = estimated_duration + max(
+            (self._tail[successor] for successor in self._successors[task_id]), default=0.0
+        )
+        self._relax_from(task_id)
+        return self._relax_tail_from(task_id)
+
+    def add_dependency(self, from_task: str, to_task: str) -> List[str]:
+        """
+        Make ``to_task`` wait for ``from_task``.
+
+        Unknown upstream tasks are added as unfinished placeholders, so the
+        dependant stays blocked until that task is submitted and finishes.
+
+        Returns:
+            Ancestors of ``to_task`` whose tail length grew as a result
+        """
+        for task_id in (from_task, to_task):
+            if task_id not in self._successors:
+                self._add_node(task_id)
+        if to_task in self._successors[from_task]:
+            return []
+        if from_task == to_task or from_task in self.descendants(to_task):
+            logger.error("Cycle detected in task DAG", from_task=from_task, to_task=to_task)
+            raise ValueError(f"Dependency {from_task} -> {to_task} would create a cycle")
+
+        self._successors[from_task].add(to_task)
+        self._predecessors[to_task].add(from_task)
+
+        if from_task not in self._succeeded and to_task not in self._finished:
+            self._unsatisfied[to_task] += 1
+            self.ready.discard(to_task)
+
+        self._relax_from(from_task)
+        return self._relax_tail_from(to_task)
+
+    def is_ready(self, task_id: str) -> bool:
+        return task_id in self.ready
+
+    def mark_finished(self, task_id: str, succeeded: bool = True) -> List[str]:
+        """
+        Record that a task finished.
+
+        Only successful tasks satisfy their dependants; a failed or cancelled
+        task leaves them blocked.
+
+        Returns:
+            Dependants that became ready as a result
+        """
+        if task_id not in self._successors or task_id in self._finished:
+            return []
+
+        self._finished.add(task_id)
+        self.ready.discard(task_id)
+        self._unsatisfied.pop(task_id, None)
+        if not succeeded:
+            return []
+
+        self._succeeded.add(task_id)
+        newly_ready = []
+        for successor in self._successors[task_id]:
+            if successor in self._finished:
+                continue
+            self._unsatisfied[successor] -= 1
+            if self._unsatisfied[successor] == 0:
+                self.ready.add(successor)
+                newly_ready.append(successor)
+        return newly_ready
+
+    def earliest_start(self, task_id: str) -> float:
+        return self._earliest_start.get(task_id, 0.0)
+
+    def earliest_finish(self, task_id: str) -> float:
+        return self._earliest_start.get(task_id, 0.0) + self.task_durations.get(task_id, 1.0)
+
+    def tail_length(self, task_id: str) -> float:
+        """Longest path from the task to the end of its DAG, including itself"""
+        return self._tail.get(task_id, 0.0)
+
+    def latest_start(self, task_id: str) -> float:
+        """Latest start that does not delay the critical path"""
+        return self.get_critical_path_length() - self.tail_length(task_id)
+
+    def slack(self, task_id: str) -> float:
+        """Latest start minus earliest start; zero on the critical path"""
+        return self.latest_start(task_id) - self.earliest_start(task_id)
+
+    def get_critical_path(self) -> Tuple[List[str], float]:
+        """Return the longest weighted path through the DAG and its length"""
+        end_node = self._critical_end_node()
+        if end_node is None:
+            return [], 0
+
+        path = [end_node]
+        current = self._critical_predecessor.get(end_node)
+        while current is not None and current in self._successors:
+            path.append(current)
+            current = self._critical_predecessor.get(current)
+
+        path.reverse()
+        return path, self.earliest_finish(end_node)
+
+    def get_critical_path_length(self) -> float:
+        end_node = self._critical_end_node()
+        return self.earliest_finish(end_node) if end_node is not None else 0
+
+    def get_parallelizable_tasks(self) -> List[Set[str]]:
+        """Get sets of tasks that can be executed in parallel (topological levels)"""
+        return [set(self._levels[level]) for level in sorted(self._levels)]
+
+    def descendants(self, task_id: str) -> Set[str]:
+        if task_id not in self._successors:
+            return set()
+
+        seen: Set[str] = set()
+        frontier = deque(self._successors[task_id])
+        while frontier:
+            node = frontier.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            frontier.extend(self._successors[node])
+        return seen
+
+    def should_cancel_descendants(self, failed_task: str) -> Set[str]:
+        """Determine which tasks should be cancelled when a task fails"""
+        return self.descendants(failed_task)
+
+    def remove_task(self, task_id: str):
+        if task_id not in self._successors:
+            return
+
+        for successor in self._successors.pop(task_id):
+            self._predecessors[successor].discard(task_id)
+        for predecessor in self._predecessors.pop(task_id):
+            self._successors[predecessor].discard(task_id)
+
+        level = self._level.pop(task_id)
+        self._levels[level].discard(task_id)
+        if not self._levels[level]:
+            del self._levels[level]
+
+        self.task_durations.pop(task_id, None)
+        self._unsatisfied.pop(task_id, None)
+        self._finished.discard(task_id)
+        self._succeeded.discard(task_id)
+        self.ready.discard(task_id)
+        self._earliest_start.pop(task_id, None)
+        self._critical_predecessor.pop(task_id, None)
+        self._tail.pop(task_id, None)
+
+    def collect_finished(self, task_id: str) -> List[str]:
+        """
+        Drop finished nodes that no unfinished task still depends on.
+
+        Called when ``task_id`` finishes; considers the task itself and its
+        predecessors, since its finish may release the last unfinished
+        dependant of an upstream node.
+
+        Returns:
+            Task IDs removed from the DAG
+        """
+        if task_id not in self._successors:
+            return []
+
+        removed = []
+        for candidate in [task_id, *self._predecessors[task_id]]:
+            if candidate not in self._finished:
+                continue
+            if not self._successors[candidate] <= self._finished:
+                continue
+            removed.append(candidate)
+
+        for candidate in removed:
+            self.remove_task(candidate)
+        return removed
+
+    def _add_node(self, task_id: str):
+        self._successors[task_id] = set()
+        self._predecessors[task_id] = set()
+        self._unsatisfied[task_id] = 0
+        self.ready.add(task_id)
+        self._earliest_start[task_id] = 0.0
+        self._tail[task_id] = self.task_durations.get(task_id, 1.0)
+        self._level[task_id] = 0
+        self._levels[0].add(task_id)
+
+    def _relax_from(self, task_id: str):
+        """Propagate earliest-start and level increases to descendants"""
+        self._push_finish(task_id)
+        frontier = deque([task_id])
+        while frontier:
+            node = frontier.popleft()
+            finish = self.earliest_finish(node)
+            for successor in self._successors[node]:
+                changed = False
+                if finish > self._earliest_start[successor]:
+                    self._earliest_start[successor] = finish
+                    self._critical_predecessor[successor] = node
+                    self._push_finish(successor)
+                    changed = True
+                if self._level[node] + 1 > self._level[successor]:
+                    self._move_level(successor, self._level[node] + 1)
+                    changed = True
+                if changed:
+                    frontier.append(successor)
+
+    def _relax_tail_from(self, task_id: str) -> List[str]:
+        """Propagate tail-length increases to ancestors, returning those raised"""
+        raised = []
+        frontier = deque([task_id])
+        while frontier:
+            node = frontier.popleft()
+            tail = self._tail[node]
+            for predecessor in self._predecessors[node]:
+                candidate = self.task_durations.get(predecessor, 1.0) + tail
+                if candidate > self._tail[predecessor]:
+                    self._tail[predecessor] = candidate
+                    frontier.append(predecessor)
+                    raised.append(predecessor)
+        return raised
+
+    def _move_level(self, task_id: str, level: int):
+        old_level = self._level[task_id]
+        self._levels[old_level].discard(task_id)
+        if not self._levels[old_level]:
+            del self._levels[old_level]
+        self._level[task_id] = level
+        self._levels[level].add(task_id)
+
+    def _push_finish(self, task_id: str):
+        heapq.heappush(self._finish_heap, (-self.earliest_finish(task_id), task_id))
+        # Compact once stale entries dominate the heap
+        if len(self._finish_heap) > 2 * len(self._successors) + 64:
+            self._finish_heap = [(-self.earliest_finish(n), n) for n in self._successors]
+            heapq.heapify(self._finish_heap)
+
+    def _critical_end_node(self):
+        while self._finish_heap:
+            negative_finish, task_id = self._finish_heap[0]
+            if task_id in self._successors and -negative_finish == self.earliest_finish(task_id):
+                return task_id
+            heapq.heappop(self._finish_heap)
+        return None
@@ -0,0 +1,317 @@
+"""
+Write-behind journal for task lifecycle state in Postgres
+
+Task state transitions are buffered and coalesced per task, then flushed in
+batches (one transaction, one statement per statement shape) when either the
+batch size or the flush interval is reached. Callers choose durability per
+write: synchronous writes await the flush that persists them, asynchronous
+writes return immediately.
+
+New rows are written with ``INSERT ... ON CONFLICT (idempotency_key) DO
+NOTHING RETURNING``, so a duplicate idempotency key resolves to the task that
+already owns it instead of raising.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+import structlog
+from prometheus_client import Counter, Histogram
+
+
+logger = structlog.get_logger()
+
+# Metrics
+journal_flush_duration = Histogram(
+    'task_journal_flush_duration_seconds',
+    'Time spent flushing a task state batch to Postgres',
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5]
+)
+journal_batch_size = Histogram(
+    'task_journal_batch_size',
+    'Number of task state rows written per flush',
+    ['operation'],
+    buckets=[1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+)
+journal_flush_errors = Counter(
+    'task_journal_flush_errors_total',
+    'Task state journal flushes that failed'
+)
+
+# Columns that may be updated through the journal
+UPDATABLE_COLUMNS = ('status', 'assigned_to', 'completed_at', 'result', 'error', 'checkpoint_data')
+
+INSERT_TASK_SQL = '''
+    INSERT INTO tasks (task_id, idempotency_key, status, created_at)
+    VALUES ($1, $2, $3, $4)
+    ON CONFLICT (idempotency_key) DO NOTHING
+    RETURNING task_id
+'''
+
+INSERT_TASKS_BATCH_SQL = '''
+    INSERT INTO tasks (task_id, idempotency_key, status, created_at)
+    SELECT * FROM unnest($1::uuid[], $2::varchar[], $3::varchar[], $4::timestamp[])
+    ON CONFLICT (idempotency_key) DO NOTHING
+    RETURNING task_id
+'''
+
+SELECT_BY_IDEMPOTENCY_KEYS_SQL = '''
+    SELECT task_id, idempotency_key FROM tasks
+    WHERE idempotency_key = ANY($1::varchar[])
+'''
+
+
+class TaskStateJournal:
+    """
+    Coalescing, batched writer for the ``tasks`` table.
+
+    Multiple updates to the same task between flushes are merged so only the
+    latest value of each column is written.
+    """
+
+    def __init__(self,
+                 db_pool: asyncpg.Pool,
+                 max_batch_size: int = 500,
+                 flush_interval_seconds: float = 0.05,
+                 sync_status_updates: bool = False):
+        self.db_pool = db_pool
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.sync_status_updates = sync_status_updates
+
+        # Insert rows carry their own waiter (None for async writes) so a
+        # failed synchronous insert is reported to its caller, not retried
+        self._inserts: List[Tuple[tuple, Optional[asyncio.Future]]] = []
+        self._updates: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self._update_waiters: List[asyncio.Future] = []
+
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    async def start(self):
+        """Start the background flush loop"""
+        self._running = True
+        self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the flush loop and persist anything still buffered"""
+        self._running = False
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            await asyncio.gather(self._flusher_task, return_exceptions=True)
+        await self.flush()
+
+    async def insert_task(self,
+                          task_id: str,
+                          idempotency_key: Optional[str],
+                          status: str,
+                          created_at: datetime,
+                          sync: bool = True) -> str:
+        """
+        Buffer a new task row; with ``sync`` wait until it is persisted.
+
+        Returns:
+            The task_id owning ``idempotency_key`` once persisted (which differs
+            from ``task_id`` for a duplicate submission), or ``task_id`` for
+            asynchronous writes
+        """
+        row = (uuid.UUID(task_id), idempotency_key, status, created_at)
+        waiter = asyncio.get_running_loop().create_future() if sync else None
+        self._inserts.append((row, waiter))
+        self._request_flush_if_full()
+        if waiter:
+            return await waiter
+        return task_id
+
+    async def update_task(self, task_id: str, sync: Optional[bool] = None, **columns: Any):
+        """
+        Buffer a state transition for a task.
+
+        Args:
+            task_id: Task to update
+            sync: Wait for persistence (defaults to ``sync_status_updates``)
+            **columns: Column values, restricted to UPDATABLE_COLUMNS
+        """
+        unknown = set(columns) - set(UPDATABLE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown task columns: {sorted(unknown)}")
+
+        self._updates.setdefault(uuid.UUID(task_id), {}).update(columns)
+        self._request_flush_if_full()
+
+        if self.sync_status_updates if sync is None else sync:
+            waiter = asyncio.get_running_loop().create_future()
+            self._update_waiters.append(waiter)
+            await waiter
+
+    def _request_flush_if_full(self):
+        if self.pending_count >= self.max_batch_size:
+            self._flush_requested.set()
+
+    async def _flush_loop(self):
+        """Flush on size trigger or every flush interval"""
+        while self._running:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(),
+                                           timeout=self.flush_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in task journal flush loop", error=str(e))
+                await asyncio.sleep(self.flush_interval_seconds)
+
+    async def flush(self):
+        """Write all buffered transitions in a single transaction"""
+        async with self._flush_lock:
+            inserts, self._inserts = self._inserts, []
+            updates, self._updates = self._updates, {}
+            update_waiters, self._update_waiters = self._update_waiters, []
+
+            if not inserts and not updates:
+                self._resolve_waiters(update_waiters, None)
+                return
+
+            start_time = time.perf_counter()
+            try:
+                async with self.db_pool.acquire() as conn:
+                    try:
+                        async with conn.transaction():
+                            owners = await self._write_batch(conn, [row for row, _ in inserts], updates)
+                        insert_errors = {}
+                    except asyncpg.PostgresError as e:
+                        # A bad row must not block the rest of the batch
+                        logger.warning("Task journal batch rejected, retrying row by row",
+                                       error=str(e))
+                        owners, insert_errors = await self._write_rows_individually(conn, inserts, updates)
+
+            except Exception as e:
+                # Connection-level failure: report to synchronous callers and
+                # keep asynchronous writes for the next flush
+                journal_flush_errors.inc()
+                logger.error("Task journal flush failed",
+                             inserts=len(inserts),
+                             updates=len(updates),
+                             error=str(e))
+                self._requeue([entry for entry in inserts if entry[1] is None], updates)
+                self._resolve_waiters([w for _, w in inserts if w], e)
+                self._resolve_waiters(update_waiters, e)
+                return
+
+            journal_flush_duration.observe(time.perf_counter() - start_time)
+            journal_batch_size.labels(operation='insert').observe(len(inserts))
+            journal_batch_size.labels(operation='update').observe(len(updates))
+
+            for index, (_, waiter) in enumerate(inserts):
+                if waiter:
+                    self._resolve_waiters([waiter], insert_errors.get(index), owners.get(index))
+            self._resolve_waiters(update_waiters, None)
+
+    async def _write_batch(self,
+                           conn: asyncpg.Connection,
+                           insert_rows: List[tuple],
+                           updates: Dict[uuid.UUID, Dict[str, Any]]) -> Dict[int, str]:
+        """Write one batch and return the owning task_id for each insert row"""
+        owners: Dict[int, str] = {}
+
+        # Inserts go first so updates buffered in the same window find their row
+        if insert_rows:
+            columns = list(zip(*insert_rows))
+            inserted = await conn.fetch(INSERT_TASKS_BATCH_SQL, *[list(c) for c in columns])
+            inserted_ids = {record['task_id'] for record in inserted}
+
+            # Rows skipped by ON CONFLICT lost to an existing idempotency key
+            conflicting_keys = [row[1] for row in insert_rows if row[0] not in inserted_ids]
+            existing = {}
+            if conflicting_keys:
+                records = await conn.fetch(SELECT_BY_IDEMPOTENCY_KEYS_SQL, conflicting_keys)
+                existing = {r['idempotency_key']: str(r['task_id']) for r in records}
+
+            for index, row in enumerate(insert_rows):
+                owners[index] = str(row[0]) if row[0] in inserted_ids else existing.get(row[1], str(row[0]))
+
+        for statement, rows in self._group_updates(updates).items():
+            await conn.executemany(statement, rows)
+
+        return owners
+
+    async def _write_rows_individually(self,
+                                       conn: asyncpg.Connection,
+                                       inserts: List[Tuple[tuple, Optional[asyncio.Future]]],
+                                       updates: Dict[uuid.UUID, Dict[str, Any]]
+                                       ) -> Tuple[Dict[int, str], Dict[int, Exception]]:
+        """Fallback path isolating rows that violate constraints"""
+        owners: Dict[int, str] = {}
+        insert_errors: Dict[int, Exception] = {}
+
+        for index, (row, _) in enumerate(inserts):
+            try:
+                inserted_id = await conn.fetchval(INSERT_TASK_SQL, *row)
+                if inserted_id is None:
+                    inserted_id = await conn.fetchval(
+                        'SELECT task_id FROM tasks WHERE idempotency_key = $1', row[1]
+                    )
+                owners[index] = str(inserted_id)
+            except asyncpg.PostgresError as e:
+                journal_flush_errors.inc()
+                insert_errors[index] = e
+                logger.error("Dropping task insert", task_id=str(row[0]), error=str(e))
+
+        for statement, rows in self._group_updates(updates).items():
+            for row in rows:
+                try:
+                    await conn.execute(statement, *row)
+                except asyncpg.PostgresError as e:
+                    journal_flush_errors.inc()
+                    logger.error("Dropping task update", task_id=str(row[-1]), error=str(e))
+
+        return owners, insert_errors
+
+    def _group_updates(self, updates: Dict[uuid.UUID, Dict[str, Any]]) -> Dict[str, List[tuple]]:
+        """Group coalesced updates by column set so each shape is one executemany"""
+        grouped: Dict[str, List[tuple]] = defaultdict(list)
+
+        for task_id, columns in updates.items():
+            names = [c for c in UPDATABLE_COLUMNS if c in columns]
+            assignments = ", ".join(f"{name} = ${i + 1}" for i, name in enumerate(names))
+            statement = f"UPDATE tasks SET {assignments} WHERE task_id = ${len(names) + 1}"
+            grouped[statement].append(tuple(columns[n] for n in names) + (task_id,))
+
+        return grouped
+
+    def _requeue(self,
+                 inserts: List[Tuple[tuple, Optional[asyncio.Future]]],
+                 updates: Dict[uuid.UUID, Dict[str, Any]]):
+        """Put a failed batch back in front of newer writes"""
+        self._inserts = inserts + self._inserts
+        for task_id, columns in updates.items():
+            merged = dict(columns)
+            merged.update(self._updates.get(task_id, {}))
+            self._updates[task_id] = merged
+
+    @staticmethod
+    def _resolve_waiters(waiters: List[asyncio.Future],
+                         error: Optional[Exception],
+                         result: Any = None):
+        for waiter in waiters:
+            if waiter.done():
+                continue
+            if error:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(result)
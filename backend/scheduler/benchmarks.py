@@ -0,0 +1,326 @@
+"""
+Benchmarks for the DAG scheduler
+
+These run DAGScheduler.execute_dag against an in-process stand-in for the
+agent manager (no Redis, Postgres or gRPC) whose tasks finish after a fixed
+service time, so scheduling overhead is what gets measured. Run with:
+python -m backend.scheduler.benchmarks
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from backend.orchestrator.completion import TaskCompletions, completion_outcome
+from backend.scheduler.dag_scheduler import DAGExecutionContext, DAGNode, DAGScheduler
+
+
+logger = structlog.get_logger()
+
+
+class _SimulatedAgentManager:
+    """Agent manager stand-in completing every task after ``service_time``"""
+
+    def __init__(self, service_time: float):
+        self.service_time = service_time
+        self.pending_tasks: Dict[str, Dict[str, Any]] = {}
+        self.completed_tasks: Dict[str, Any] = {}
+        self.completions = TaskCompletions()
+
+    async def submit_task(self, task_type: str, payload: Dict[str, Any], **kwargs) -> str:
+        task_id = str(uuid.uuid4())
+        self.pending_tasks[task_id] = payload
+        asyncio.get_running_loop().call_later(self.service_time, self._complete, task_id)
+        return task_id
+
+    def _complete(self, task_id: str):
+        result = {"task_id": task_id}
+        del self.pending_tasks[task_id]
+        self.completed_tasks[task_id] = result
+        self.completions.resolve(task_id, result)
+
+    async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        if task_id in self.completed_tasks:
+            return {"status": "completed", "result": self.completed_tasks[task_id]}
+        if task_id in self.pending_tasks:
+            return {"status": "processing"}
+        return None
+
+    async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if task_id in self.completed_tasks:
+            return completion_outcome(self.completed_tasks[task_id])
+        if task_id not in self.pending_tasks:
+            return None
+        return await self.completions.wait(task_id, timeout)
+
+    def is_task_queued(self, task_id: str) -> bool:
+        return False
+
+    async def wait_for_dispatch(self, task_id: str, timeout: Optional[float] = None):
+        return
+
+    def get_least_busy_agent(self, task_type: str):
+        return object()
+
+
+class _PollingDAGScheduler(DAGScheduler):
+    """The scheduler as it was: polls task status at a fixed interval"""
+
+    def __init__(self, *args, poll_interval: float = 1.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.poll_interval = poll_interval
+
+    async def _wait_for_completion(self, task_id: str) -> Optional[Dict[str, Any]]:
+        while True:
+            status = await self.agent_manager.get_task_status(task_id)
+            if status is None or status['status'] in ('completed', 'failed'):
+                return status
+            await asyncio.sleep(self.poll_interval)
+
+
+def _chain_with_fanout(depth: int, width: int) -> List[Dict[str, Any]]:
+    """``depth`` stages of ``width`` parallel tasks, each stage depending on the previous one"""
+    tasks = []
+    previous: List[str] = []
+    for stage in range(depth):
+        current = [f"s{stage}-t{i}" for i in range(width)]
+        for task_id in current:
+            tasks.append({
+                'task_id': task_id,
+                'task_type': 'backend_development',
+                'dependencies': list(previous),
+                'estimated_duration': 1.0
+            })
+        previous = current
+    return tasks
+
+
+async def _measure_makespan(scheduler: DAGScheduler, tasks: List[Dict[str, Any]]) -> float:
+    dag_id = str(uuid.uuid4())
+    await scheduler.create_dag(dag_id, tasks)
+    start = time.perf_counter()
+    summary = await scheduler.execute_dag(dag_id)
+    assert summary['completed_tasks'] == len(tasks), summary
+    return time.perf_counter() - start
+
+
+async def benchmark_deep_dag_makespan(depth: int = 20,
+                                      width: int = 2,
+                                      service_time: float = 0.05,
+                                      poll_interval: float = 1.0) -> Dict[str, float]:
+    """
+    Makespan of a deep DAG with status polling versus completion futures.
+
+    Polling adds up to ``poll_interval`` per stage on the critical path;
+    awaiting the completion future adds only scheduling overhead.
+    """
+    tasks = _chain_with_fanout(depth, width)
+
+    polling = _PollingDAGScheduler(
+        _SimulatedAgentManager(service_time), memory_store=None,
+        max_parallel_tasks=width, poll_interval=poll_interval
+    )
+    awaiting = DAGScheduler(
+        _SimulatedAgentManager(service_time), memory_store=None, max_parallel_tasks=width
+    )
+    polling_makespan = await _measure_makespan(polling, tasks)
+    event_makespan = await _measure_makespan(awaiting, tasks)
+
+    return {
+        "depth": depth,
+        "width": width,
+        "ideal_makespan": depth * service_time,
+        "polling_makespan": polling_makespan,
+        "event_makespan": event_makespan,
+        "speedup": polling_makespan / event_makespan
+    }
+
+
+def _layered_dag(layers: int, width: int, fan_in: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``layers`` x ``width`` tasks, each depending on ``fan_in`` random tasks of the layer above"""
+    rng = random.Random(seed)
+    tasks = []
+    previous: List[str] = []
+    for layer in range(layers):
+        current = [f"l{layer}-t{i}" for i in range(width)]
+        for task_id in current:
+            tasks.append({
+                'task_id': task_id,
+                'task_type': 'backend_development',
+                'dependencies': rng.sample(previous, min(fan_in, len(previous))),
+                'priority': rng.randint(1, 4),
+                'estimated_duration': rng.uniform(10, 120)
+            })
+        previous = current
+    return tasks
+
+
+def _drain_with_rebuilds(nodes: Dict[str, DAGNode], start_nodes) -> int:
+    """The scheduler's old loop: rebuild the whole ready heap after every completion"""
+    sequence = itertools.count()
+    completed = set()
+    queue = [(nodes[n].priority, next(sequence), nodes[n]) for n in start_nodes]
+    heapq.heapify(queue)
+    decisions = 0
+    while queue:
+        _, _, node = heapq.heappop(queue)
+        completed.add(node.task_id)
+        decisions += 1
+        for dep_id in node.dependents:
+            dependent = nodes[dep_id]
+            if all(d in completed for d in dependent.dependencies):
+                heapq.heappush(queue, (dependent.priority, next(sequence), dependent))
+
+        rebuilt = []
+        for _, _, queued in queue:
+            blocking_score = len([d for d in queued.dependents if d not in completed])
+            heapq.heappush(rebuilt, (queued.priority - blocking_score * 0.1, next(sequence), queued))
+        queue = rebuilt
+    return decisions
+
+
+def _drain_incrementally(scheduler: DAGScheduler, dag_id: str) -> int:
+    """The scheduler's own ready-queue maintenance, minus agent dispatch"""
+    nodes = scheduler.dag_nodes[dag_id]
+    plan = scheduler.execution_plans[dag_id]
+    execution = DAGExecutionContext(
+        dag_id, nodes,
+        critical_path=set(plan.critical_path),
+        blocking_counts={node_id: len(node.dependents) for node_id, node in nodes.items()}
+    )
+    for node_id in plan.start_nodes:
+        scheduler._add_to_ready_queue(execution, nodes[node_id])
+    decisions = 0
+    while execution.ready_queue:
+        _, _, node = execution.ready_queue.pop()
+        scheduler._complete_node(execution, node, None)
+        decisions += 1
+    return decisions
+
+
+async def benchmark_reprioritization(layers: int = 100,
+                                     width: int = 100,
+                                     fan_in: int = 3) -> Dict[str, float]:
+    """
+    Time to drain a large DAG's ready queue with dynamic reprioritization.
+
+    Rebuilding the heap after every completion costs O(ready * dependents)
+    per scheduling decision; the indexed queue only touches the entries
+    whose blocking score changed.
+    """
+    tasks = _layered_dag(layers, width, fan_in)
+    rebuild_scheduler = DAGScheduler(None, memory_store=None)
+    incremental_scheduler = DAGScheduler(None, memory_store=None)
+    await rebuild_scheduler.create_dag("rebuild", tasks)
+    await incremental_scheduler.create_dag("incremental", tasks)
+
+    start = time.perf_counter()
+    rebuild_plan = rebuild_scheduler.execution_plans["rebuild"]
+    rebuild_decisions = _drain_with_rebuilds(rebuild_plan.nodes, rebuild_plan.start_nodes)
+    rebuild_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    incremental_decisions = _drain_incrementally(incremental_scheduler, "incremental")
+    incremental_seconds = time.perf_counter() - start
+
+    assert rebuild_decisions == incremental_decisions == len(tasks)
+    return {
+        "nodes": len(tasks),
+        "rebuild_seconds": rebuild_seconds,
+        "incremental_seconds": incremental_seconds,
+        "rebuild_us_per_decision": rebuild_seconds / len(tasks) * 1e6,
+        "incremental_us_per_decision": incremental_seconds / len(tasks) * 1e6,
+        "speedup": rebuild_seconds / incremental_seconds
+    }
+
+
+def _workflow_pipeline() -> List[Dict[str, Any]]:
+    """planner -> coder -> critic -> file_manager -> QA"""
+    stages = ['planning', 'backend_development', 'code_review', 'file_management', 'testing']
+    return [
+        {
+            'task_id': stage,
+            'task_type': stage,
+            'dependencies': [stages[i - 1]] if i else [],
+            'estimated_duration': 60.0
+        }
+        for i, stage in enumerate(stages)
+    ]
+
+
+def _instantiate(shape: List[Dict[str, Any]], instance: int) -> List[Dict[str, Any]]:
+    """A copy of a task list with fresh task ids and its own payloads"""
+    prefix = f"i{instance}-"
+    return [
+        dict(task,
+             task_id=prefix + task['task_id'],
+             dependencies=[prefix + d for d in task['dependencies']],
+             payload={'instance': instance})
+        for task in shape
+    ]
+
+
+async def benchmark_create_dag_throughput(instances: int = 2000) -> Dict[str, Dict[str, float]]:
+    """
+    create_dag calls per second for repeated workflow shapes, with and
+    without the compiled template cache.
+    """
+    shapes = {
+        "pipeline-5": _workflow_pipeline(),
+        "layered-50": _layered_dag(5, 10, 3),
+    }
+    results = {}
+    for name, shape in shapes.items():
+        batches = [_instantiate(shape, i) for i in range(instances)]
+        rates = {}
+        for cached in (False, True):
+            scheduler = DAGScheduler(None, memory_store=None)
+            scheduler.enable_template_cache = cached
+            start = time.perf_counter()
+            for i, tasks in enumerate(batches):
+                await scheduler.create_dag(f"{name}-{i}", tasks)
+            rates[cached] = instances / (time.perf_counter() - start)
+        results[name] = {
+            "uncached_per_second": rates[False],
+            "cached_per_second": rates[True],
+            "speedup": rates[True] / rates[False]
+        }
+    return results
+
+
+async def run_benchmark_suite():
+    """Run the DAG scheduler benchmarks and print a summary"""
+    print("== Deep DAG makespan: polling vs completion futures ==")
+    result = await benchmark_deep_dag_makespan()
+    print(f"depth={result['depth']} width={result['width']} "
+          f"ideal={result['ideal_makespan']:.2f}s "
+          f"polling={result['polling_makespan']:.2f}s "
+          f"futures={result['event_makespan']:.2f}s "
+          f"speedup={result['speedup']:.1f}x")
+
+    print("== Ready queue reprioritization: full rebuild vs indexed queue ==")
+    for layers, width in ((100, 100), (10, 1000)):
+        result = await benchmark_reprioritization(layers=layers, width=width)
+        print(f"nodes={result['nodes']} layers={layers} width={width} "
+              f"rebuild={result['rebuild_seconds']:.2f}s "
+              f"({result['rebuild_us_per_decision']:.0f}us/decision) "
+              f"indexed={result['incremental_seconds']:.2f}s "
+              f"({result['incremental_us_per_decision']:.0f}us/decision) "
+              f"speedup={result['speedup']:.1f}x")
+
+    print("== create_dag throughput: per-DAG analysis vs compiled templates ==")
+    for name, result in (await benchmark_create_dag_throughput()).items():
+        print(f"shape={name} "
+              f"uncached={result['uncached_per_second']:.0f}/s "
+              f"cached={result['cached_per_second']:.0f}/s "
+              f"speedup={result['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark_suite())
@@ -6,13 +6,13 @@ optimizing parallel execution of agent tasks with dependency management.
 """
 
 import asyncio
+import time
 from typing import Dict, List, Set, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
 import networkx as nx
 from collections import defaultdict, deque
-import heapq
 import uuid
 
 import structlog
@@ -20,6 +20,11 @@ from prometheus_client import Counter, Gauge, Histogram
 
 from backend.orchestrator.agent_manager import AgentManager, AgentTask, TaskPriority
 from backend.memory.context_store import SharedMemoryStore
+from backend.scheduler.dag_template import (
+    DAGShape, DAGTemplate, DAGTemplateCache, csr_successors, dag_shape
+)
+from backend.scheduler.fair_share import FairShareScheduler
+from backend.scheduler.priority_queue import IndexedPriorityQueue
 
 
 logger = structlog.get_logger()
@@ -29,6 +34,22 @@ tasks_scheduled = Counter('dag_tasks_scheduled_total', 'Total tasks scheduled')
 tasks_executed = Counter('dag_tasks_executed_total', 'Total tasks executed')
 dag_execution_time = Histogram('dag_execution_seconds', 'DAG execution time')
 parallel_tasks_gauge = Gauge('dag_parallel_tasks', 'Number of tasks executing in parallel')
+context_io_bytes = Counter(
+    'dag_context_io_bytes_total',
+    'Serialized context bytes read from or written to the shared memory store',
+    ['dag_id', 'direction']
+)
+context_io_latency = Histogram(
+    'dag_context_io_seconds',
+    'Latency of one batched context read or write round-trip',
+    ['dag_id', 'direction'],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1]
+)
+context_memo_hits = Counter(
+    'dag_context_memo_hits_total',
+    'Context inputs served from values produced earlier in the same DAG run',
+    ['dag_id']
+)
 
 
 class TaskState(Enum):
@@ -76,6 +97,26 @@ class ExecutionPlan:
     parallelism_factor: float
 
 
+@dataclass
+class DAGExecutionContext:
+    """State of one DAG run, kept apart from every other concurrent run"""
+    dag_id: str
+    nodes: Dict[str, DAGNode]
+    priority: int = 3
+    tenant: Optional[str] = None
+    ready_queue: IndexedPriorityQueue = field(default_factory=IndexedPriorityQueue)
+    critical_path: Set[str] = field(default_factory=set)
+    blocking_counts: Dict[str, int] = field(default_factory=dict)  # node id -> unfinished dependents
+    running: Dict[asyncio.Task, str] = field(default_factory=dict)  # future -> node id
+    slot_holders: Set[str] = field(default_factory=set)  # running node ids holding a slot
+    completed_tasks: Set[str] = field(default_factory=set)
+    failed_tasks: Set[str] = field(default_factory=set)
+    results: Dict[str, Any] = field(default_factory=dict)
+    context_values: Dict[str, Any] = field(default_factory=dict)  # written during this run
+    context_io: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    start_time: datetime = field(default_factory=datetime.utcnow)
+
+
 class DAGScheduler:
     """
     Advanced DAG-based scheduler for parallel task execution.
@@ -87,27 +128,31 @@ class DAGScheduler:
     def __init__(self, 
                  agent_manager: AgentManager,
                  memory_store: SharedMemoryStore,
-                 max_parallel_tasks: int = 10):
+                 max_parallel_tasks: int = 10,
+                 tenant_weights: Optional[Dict[str, float]] = None,
+                 template_cache_size: int = 256):
         self.agent_manager = agent_manager
         self.memory_store = memory_store
         self.max_parallel_tasks = max_parallel_tasks
         
-        # DAG storage
-        self.dags: Dict[str, nx.DiGraph] = {}
+        # DAG storage; DAGs of the same shape share one compiled template
+        self.dag_templates: Dict[str, DAGTemplate] = {}
         self.dag_nodes: Dict[str, Dict[str, DAGNode]] = {}
+        self.template_cache = DAGTemplateCache(template_cache_size)
         
         # Execution tracking
-        self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.executions: Dict[str, DAGExecutionContext] = {}  # dag_id -> active run
         self.execution_plans: Dict[str, ExecutionPlan] = {}
         
-        # Resource management
-        self.resource_pool = asyncio.Semaphore(max_parallel_tasks)
+        # Resource management; slots shared fairly by concurrent DAG runs
+        self.fair_share = FairShareScheduler(max_parallel_tasks, tenant_weights)
         self.agent_reservations: Dict[str, str] = {}  # task_id -> agent_id
         
         # Optimization parameters
         self.enable_speculative_execution = True
         self.enable_task_batching = True
         self.enable_dynamic_reprioritization = True
+        self.enable_template_cache = True
         
         logger.info("DAG Scheduler initialized", max_parallel=max_parallel_tasks)
     
@@ -122,14 +167,11 @@ class DAGScheduler:
         Returns:
             Execution plan for the DAG
         """
-        # Create directed graph
-        dag = nx.DiGraph()
-        nodes = {}
-        
-        # Create nodes
+        # Create nodes; a repeated task_id replaces the earlier definition
+        nodes: Dict[str, DAGNode] = {}
         for task_def in tasks:
             node = DAGNode(
-                task_id=task_def.get('task_id', str(uuid.uuid4())),
+                task_id=task_def['task_id'] if 'task_id' in task_def else str(uuid.uuid4()),
                 task_type=task_def['task_type'],
                 agent_type=task_def.get('agent_type', 'auto'),
                 payload=task_def.get('payload', {}),
@@ -142,67 +184,101 @@ class DAGScheduler:
             )
             
             nodes[node.task_id] = node
-            dag.add_node(node.task_id, data=node)
         
-        # Create edges based on dependencies
-        for task_id, node in nodes.items():
-            for dep_id in node.dependencies:
-                if dep_id in nodes:
-                    dag.add_edge(dep_id, task_id)
-                    nodes[dep_id].dependents.add(task_id)
+        # Key the DAG by its shape: dependencies as positions within the DAG
+        ordered = list(nodes.values())
+        positions = {task_id: i for i, task_id in enumerate(nodes)}
+        shape = dag_shape(
+            [[positions[d] for d in node.dependencies if d in positions] for node in ordered],
+            [node.estimated_duration for node in ordered]
+        )
         
-        # Validate DAG
-        if not nx.is_directed_acyclic_graph(dag):
-            raise ValueError(f"Graph contains cycles - not a valid DAG")
+        # Validate and analyze the shape only the first time it is seen
+        template = self.template_cache.get(shape) if self.enable_template_cache else None
+        cached = template is not None
+        if template is None:
+            template = self._compile_template(shape)
+            if self.enable_template_cache:
+                self.template_cache.put(template)
         
         # Store DAG
-        self.dags[dag_id] = dag
+        plan = self._bind_template(dag_id, template, ordered, nodes)
+        self.dag_templates[dag_id] = template
         self.dag_nodes[dag_id] = nodes
-        
-        # Create execution plan
-        plan = await self._create_execution_plan(dag_id, dag, nodes)
         self.execution_plans[dag_id] = plan
         
         logger.info("DAG created", 
                    dag_id=dag_id,
                    nodes=len(nodes),
-                   edges=dag.number_of_edges())
+                   edges=template.edge_count,
+                   template_cached=cached)
         
         return plan
     
-    async def _create_execution_plan(self, 
-                                   dag_id: str,
-                                   dag: nx.DiGraph,
-                                   nodes: Dict[str, DAGNode]) -> ExecutionPlan:
-        """Create an optimized execution plan"""
+    def _compile_template(self, shape: DAGShape) -> DAGTemplate:
+        """Validate a DAG shape and precompute its execution plan by position"""
+        dag = nx.DiGraph()
+        dag.add_nodes_from(range(len(shape)))
+        dag.add_edges_from(
+            (dep, position) for position, (_, deps) in enumerate(shape) for dep in deps
+        )
+        
+        # Validate DAG
+        if not nx.is_directed_acyclic_graph(dag):
+            raise ValueError(f"Graph contains cycles - not a valid DAG")
+        
+        durations = {position: duration for position, (duration, _) in enumerate(shape)}
+        
         # Find start and end nodes
-        start_nodes = {n for n in dag.nodes() if dag.in_degree(n) == 0}
-        end_nodes = {n for n in dag.nodes() if dag.out_degree(n) == 0}
+        start_nodes = [n for n in dag.nodes() if dag.in_degree(n) == 0]
+        end_nodes = [n for n in dag.nodes() if dag.out_degree(n) == 0]
         
         # Calculate critical path
-        critical_path = self._find_critical_path(dag, nodes)
+        critical_path = self._find_critical_path(dag, durations)
         
         # Estimate total duration
-        estimated_duration = sum(nodes[task_id].estimated_duration 
-                               for task_id in critical_path)
+        estimated_duration = sum(durations[position] for position in critical_path)
         
-        # Calculate parallelism factor
-        max_parallel = self._calculate_max_parallelism(dag)
-        parallelism_factor = max_parallel / max(1, len(nodes))
-        
-        plan = ExecutionPlan(
-            dag_id=dag_id,
-            nodes=nodes,
+        # Calculate parallelism factor using level-based analysis
+        levels = self._assign_levels(dag)
+        max_parallel = max(len(level) for level in levels.values()) if levels else 1
+        parallelism_factor = max_parallel / max(1, len(shape))
+        
+        indptr, indices = csr_successors(shape)
+        return DAGTemplate(
+            shape=shape,
+            indptr=indptr,
+            indices=indices,
             start_nodes=start_nodes,
             end_nodes=end_nodes,
+            levels=levels,
             critical_path=critical_path,
             estimated_duration=estimated_duration,
             parallelism_factor=parallelism_factor
         )
+    
+    def _bind_template(self,
+                       dag_id: str,
+                       template: DAGTemplate,
+                       ordered: List[DAGNode],
+                       nodes: Dict[str, DAGNode]) -> ExecutionPlan:
+        """Create the execution plan of one DAG from its shape's template"""
+        for position, node in enumerate(ordered):
+            node.dependents.update(
+                ordered[successor].task_id for successor in template.successors(position)
+            )
         
-        return plan
+        return ExecutionPlan(
+            dag_id=dag_id,
+            nodes=nodes,
+            start_nodes={ordered[p].task_id for p in template.start_nodes},
+            end_nodes={ordered[p].task_id for p in template.end_nodes},
+            critical_path=[ordered[p].task_id for p in template.critical_path],
+            estimated_duration=template.estimated_duration,
+            parallelism_factor=template.parallelism_factor
+        )
     
-    def _find_critical_path(self, dag: nx.DiGraph, nodes: Dict[str, DAGNode]) -> List[str]:
+    def _find_critical_path(self, dag: nx.DiGraph, durations: Dict[Any, float]) -> List[Any]:
         """Find the critical path (longest path) through the DAG"""
         # Use topological sort for processing order
         topo_order = list(nx.topological_sort(dag))
@@ -220,11 +296,11 @@ class DAGScheduler:
                     for pred in dag.predecessors(node_id)
                 )
             
-            earliest_finish[node_id] = (earliest_start[node_id] + 
-                                      nodes[node_id].estimated_duration)
+            earliest_finish[node_id] = earliest_start[node_id] + durations[node_id]
         
         # Find the critical path by backtracking from end nodes
         critical_path = []
+        end_nodes = [n for n in topo_order if dag.out_degree(n) == 0]
         max_finish_time = max(earliest_finish.values()) if earliest_finish else 0
         
         # Find end node with maximum finish time
@@ -234,7 +310,7 @@ class DAGScheduler:
                 critical_end = node_id
                 break
         
-        if critical_end:
+        if critical_end is not None:
             # Backtrack to find critical path
             path = [critical_end]
             current = critical_end
@@ -242,8 +318,7 @@ class DAGScheduler:
             while dag.in_degree(current) > 0:
                 # Find predecessor on critical path
                 for pred in dag.predecessors(current):
-                    if (earliest_finish[pred] + nodes[current].estimated_duration == 
-                        earliest_finish[current]):
+                    if earliest_finish[pred] + durations[current] == earliest_finish[current]:
                         path.append(pred)
                         current = pred
                         break
@@ -252,14 +327,7 @@ class DAGScheduler:
         
         return critical_path
     
-    def _calculate_max_parallelism(self, dag: nx.DiGraph) -> int:
-        """Calculate maximum possible parallelism in the DAG"""
-        # Use level-based analysis
-        levels = self._assign_levels(dag)
-        max_parallel = max(len(nodes) for nodes in levels.values()) if levels else 1
-        return max_parallel
-    
-    def _assign_levels(self, dag: nx.DiGraph) -> Dict[int, List[str]]:
+    def _assign_levels(self, dag: nx.DiGraph) -> Dict[int, List[Any]]:
         """Assign levels to nodes for parallel execution analysis"""
         levels = defaultdict(list)
         node_levels = {}
@@ -284,123 +352,68 @@ class DAGScheduler:
         
         return dict(levels)
     
-    async def execute_dag(self, dag_id: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def execute_dag(self,
+                          dag_id: str,
+                          context: Dict[str, Any] = None,
+                          priority: int = 3,
+                          tenant: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute a DAG with optimized parallel execution.
         
+        Concurrent runs of different DAGs share ``max_parallel_tasks`` slots
+        in proportion to their priority and tenant weights. A task the agent
+        manager dispatches from its own queue while every slot is taken
+        still runs and holds a slot past the limit; no other task starts
+        until the count is back under it.
+        
         Args:
             dag_id: DAG to execute
             context: Initial context for execution
+            priority: TaskPriority value weighting this run's share of slots
+            tenant: Tenant whose weight, split across its active runs, applies
             
         Returns:
             Execution results
         """
         with dag_execution_time.time():
-            if dag_id not in self.dags:
+            if dag_id not in self.dag_nodes:
                 raise ValueError(f"DAG {dag_id} not found")
+            if dag_id in self.executions:
+                raise ValueError(f"DAG {dag_id} is already executing")
             
-            dag = self.dags[dag_id]
             nodes = self.dag_nodes[dag_id]
             plan = self.execution_plans[dag_id]
             
-            # Initialize context
-            if context:
-                await self._store_context(dag_id, context)
-            
             # Track execution
-            start_time = datetime.utcnow()
-            completed_tasks = set()
-            failed_tasks = set()
-            results = {}
-            
-            # Initialize ready queue with start nodes
-            ready_queue = []
-            for node_id in plan.start_nodes:
-                self._add_to_ready_queue(ready_queue, nodes[node_id])
-            
-            # Main execution loop
-            while ready_queue or self.running_tasks:
-                # Start ready tasks up to parallel limit
-                while ready_queue and len(self.running_tasks) < self.max_parallel_tasks:
-                    _, _, node = heapq.heappop(ready_queue)
-                    
-                    # Check if we can allocate an agent
-                    if await self._can_allocate_agent(node):
-                        # Start task execution
-                        task = asyncio.create_task(
-                            self._execute_task(dag_id, node)
-                        )
-                        self.running_tasks[node.task_id] = task
-                        parallel_tasks_gauge.inc()
-                    else:
-                        # Put back in queue if no agent available
-                        self._add_to_ready_queue(ready_queue, node)
-                        await asyncio.sleep(1)  # Brief wait before retry
-                
-                # Wait for any task to complete
-                if self.running_tasks:
-                    done, pending = await asyncio.wait(
-                        self.running_tasks.values(),
-                        return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Process completed tasks
-                    for task in done:
-                        task_id = None
-                        for tid, t in self.running_tasks.items():
-                            if t == task:
-                                task_id = tid
-                                break
-                        
-                        if task_id:
-                            del self.running_tasks[task_id]
-                            parallel_tasks_gauge.dec()
-                            
-                            node = nodes[task_id]
-                            
-                            try:
-                                result = await task
-                                node.state = TaskState.COMPLETED
-                                node.result = result
-                                completed_tasks.add(task_id)
-                                results[task_id] = result
-                                
-                                # Check dependent tasks
-                                for dep_id in node.dependents:
-                                    dep_node = nodes[dep_id]
-                                    if self._is_task_ready(dep_node, completed_tasks):
-                                        dep_node.state = TaskState.READY
-                                        self._add_to_ready_queue(ready_queue, dep_node)
-                                
-                                logger.info("Task completed", task_id=task_id)
-                                
-                            except Exception as e:
-                                node.state = TaskState.FAILED
-                                node.error = str(e)
-                                failed_tasks.add(task_id)
-                                
-                                logger.error("Task failed", 
-                                           task_id=task_id,
-                                           error=str(e))
-                                
-                                # Handle failure based on strategy
-                                await self._handle_task_failure(
-                                    dag_id, node, ready_queue, nodes
-                                )
+            execution = DAGExecutionContext(
+                dag_id, nodes, priority=priority, tenant=tenant,
+                critical_path=set(plan.critical_path),
+                blocking_counts={
+                    node_id: len(node.dependents) for node_id, node in nodes.items()
+                }
+            )
+            self.executions[dag_id] = execution
+            self.fair_share.register(dag_id, priority, tenant)
+            try:
+                # Initialize context
+                if context:
+                    await self._store_context(execution, context)
                 
-                # Dynamic reprioritization if enabled
-                if self.enable_dynamic_reprioritization and ready_queue:
-                    ready_queue = self._reprioritize_queue(
-                        ready_queue, nodes, completed_tasks
-                    )
+                # Initialize ready queue with start nodes
+                for node_id in plan.start_nodes:
+                    self._add_to_ready_queue(execution, nodes[node_id])
                 
-                # Brief sleep to prevent tight loop
-                if not ready_queue and self.running_tasks:
-                    await asyncio.sleep(0.1)
+                await self._run_execution(execution)
+            finally:
+                await self._cancel_running(execution)
+                self.fair_share.unregister(dag_id)
+                del self.executions[dag_id]
             
             # Calculate execution metrics
             end_time = datetime.utcnow()
-            execution_time = (end_time - start_time).total_seconds()
+            execution_time = (end_time - execution.start_time).total_seconds()
+            completed_tasks = execution.completed_tasks
+            failed_tasks = execution.failed_tasks
             
             execution_summary = {
                 'dag_id': dag_id,
@@ -411,7 +424,8 @@ class DAGScheduler:
                 'execution_time': execution_time,
                 'estimated_time': plan.estimated_duration,
                 'efficiency': plan.estimated_duration / execution_time if execution_time > 0 else 0,
-                'results': results,
+                'results': execution.results,
+                'context_io': dict(execution.context_io),
                 'failures': {
                     task_id: nodes[task_id].error 
                     for task_id in failed_tasks
@@ -426,77 +440,230 @@ class DAGScheduler:
             
             return execution_summary
     
-    async def _execute_task(self, dag_id: str, node: DAGNode) -> Any:
-        """Execute a single task"""
-        async with self.resource_pool:
-            try:
-                tasks_executed.inc()
+    async def _run_execution(self, execution: DAGExecutionContext):
+        """Main execution loop of one DAG run"""
+        dag_id = execution.dag_id
+        nodes = execution.nodes
+        slot_request: Optional[asyncio.Task] = None
+        
+        try:
+            while execution.ready_queue or execution.running:
+                # Ask for a slot while tasks are ready; wait for it or any completion
+                if execution.ready_queue and slot_request is None:
+                    slot_request = asyncio.create_task(self.fair_share.acquire(dag_id))
+                waiting = set(execution.running)
+                if slot_request:
+                    waiting.add(slot_request)
                 
-                # Load context
-                context = await self._load_task_context(dag_id, node)
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
                 
-                # Record start time
-                start_time = datetime.utcnow()
-                node.state = TaskState.RUNNING
+                # Start the best ready task in the granted slot
+                if slot_request in done:
+                    slot_request = None
+                    await self._start_next_task(execution)
                 
-                # Submit to agent manager
-                task_id = await self.agent_manager.submit_task(
-                    task_type=node.task_type,
-                    payload=node.payload,
-                    priority=TaskPriority(node.priority),
-                    context_keys=node.context_inputs
-                )
-                
-                # Wait for completion
-                while True:
-                    status = await self.agent_manager.get_task_status(task_id)
+                # Process completed tasks
+                for task in done:
+                    task_id = execution.running.pop(task, None)
+                    if task_id is None:
+                        continue
+                    parallel_tasks_gauge.dec()
+                    node = nodes[task_id]
                     
-                    if status['status'] == 'completed':
-                        result = status['result']
-                        break
-                    elif status['status'] == 'failed':
-                        raise Exception(f"Agent task failed: {status.get('error')}")
+                    if task.cancelled():
+                        node.state = TaskState.CANCELLED
+                        continue
                     
-                    await asyncio.sleep(1)
-                
-                # Record duration
-                end_time = datetime.utcnow()
-                node.actual_duration = (end_time - start_time).total_seconds()
-                
-                # Store outputs in context
-                if node.context_outputs:
-                    await self._store_task_outputs(dag_id, node, result)
-                
-                return result
-                
-            except Exception as e:
-                node.retries += 1
-                if node.retries < node.max_retries:
-                    # Retry logic
-                    await asyncio.sleep(2 ** node.retries)  # Exponential backoff
-                    return await self._execute_task(dag_id, node)
+                    try:
+                        self._complete_node(execution, node, task.result())
+                        logger.info("Task completed", task_id=task_id)
+                        
+                    except Exception as e:
+                        node.state = TaskState.FAILED
+                        node.error = str(e)
+                        execution.failed_tasks.add(task_id)
+                        
+                        logger.error("Task failed", 
+                                   task_id=task_id,
+                                   error=str(e))
+                        
+                        # Handle failure based on strategy
+                        await self._handle_task_failure(execution, node)
+        finally:
+            if slot_request is not None:
+                if slot_request.done() and not slot_request.cancelled():
+                    self.fair_share.release()
                 else:
+                    slot_request.cancel()
+    
+    async def _start_next_task(self, execution: DAGExecutionContext):
+        """Run the highest-priority ready task in a slot already granted to the run"""
+        if not execution.ready_queue:
+            # Cancelled while the slot was being granted
+            self.fair_share.release()
+            return
+        
+        _, _, node = execution.ready_queue.pop()
+        
+        # Check if we can allocate an agent
+        if not await self._can_allocate_agent(node):
+            # Put back in queue if no agent available
+            self.fair_share.release()
+            self._add_to_ready_queue(execution, node)
+            await asyncio.sleep(1)  # Brief wait before retry
+            return
+        
+        # Start task execution; the slot goes back when the task is done,
+        # even if it is cancelled before it first runs
+        execution.slot_holders.add(node.task_id)
+        task = asyncio.create_task(self._execute_task(execution, node))
+        task.add_done_callback(lambda _: self._release_slot(execution, node.task_id))
+        execution.running[task] = node.task_id
+        parallel_tasks_gauge.inc()
+    
+    def _release_slot(self, execution: DAGExecutionContext, task_id: str):
+        """Give back the slot of a running task, if it holds one"""
+        if task_id in execution.slot_holders:
+            execution.slot_holders.discard(task_id)
+            self.fair_share.release()
+    
+    async def _execute_task(self, execution: DAGExecutionContext, node: DAGNode) -> Any:
+        """Execute a single task in its granted slot, retrying with backoff"""
+        while True:
+            try:
+                return await self._run_task_attempt(execution, node)
+            except Exception:
+                node.retries += 1
+                if node.retries >= node.max_retries:
                     raise
+            
+            # Give the slot to other work during backoff
+            self._release_slot(execution, node.task_id)
+            await asyncio.sleep(2 ** node.retries)  # Exponential backoff
+            await self.fair_share.acquire(execution.dag_id)
+            execution.slot_holders.add(node.task_id)
+    
+    async def _cancel_running(self, execution: DAGExecutionContext):
+        """Cancel and await the tasks a finished or cancelled run left behind"""
+        if not execution.running:
+            return
+        
+        for task in execution.running:
+            task.cancel()
+        await asyncio.gather(*execution.running, return_exceptions=True)
+        
+        for task_id in execution.running.values():
+            execution.nodes[task_id].state = TaskState.CANCELLED
+            parallel_tasks_gauge.dec()
+        execution.running.clear()
+    
+    async def _run_task_attempt(self, execution: DAGExecutionContext, node: DAGNode) -> Any:
+        """Submit a task to the agent manager and await its outcome"""
+        tasks_executed.inc()
+        
+        # Load context
+        context = await self._load_task_context(execution, node)
+        
+        # Record start time
+        start_time = datetime.utcnow()
+        node.state = TaskState.RUNNING
+        
+        # Submit to agent manager
+        task_id = await self.agent_manager.submit_task(
+            task_type=node.task_type,
+            payload=node.payload,
+            priority=TaskPriority(node.priority),
+            context_keys=node.context_inputs
+        )
+        
+        # Hold the slot only while the task runs, not while the manager queues it
+        await self._wait_for_dispatch(execution, node, task_id)
+        
+        # Wait for completion
+        status = await self._wait_for_completion(task_id)
+        if status is None:
+            raise Exception(f"Agent task {task_id} is unknown to the agent manager")
+        if status['status'] != 'completed':
+            raise Exception(f"Agent task {status['status']}: {status.get('error')}")
+        result = status['result']
+        
+        # Record duration
+        end_time = datetime.utcnow()
+        node.actual_duration = (end_time - start_time).total_seconds()
+        
+        # Store outputs in context
+        if node.context_outputs:
+            await self._store_task_outputs(execution, node, result)
+        
+        return result
+    
+    async def _wait_for_dispatch(self, execution: DAGExecutionContext, node: DAGNode, task_id: str):
+        """Give up a task's slot while it is queued in the agent manager, reclaiming it on dispatch"""
+        if not self.agent_manager.is_task_queued(task_id):
+            return
+        
+        self._release_slot(execution, node.task_id)
+        await self.agent_manager.wait_for_dispatch(task_id)
+        # The task is already running, so it cannot wait for a free slot
+        self.fair_share.claim(execution.dag_id)
+        execution.slot_holders.add(node.task_id)
+    
+    async def _wait_for_completion(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Await the agent manager's completion notification for a task"""
+        return await self.agent_manager.wait_for_task(task_id)
     
     def _is_task_ready(self, node: DAGNode, completed_tasks: Set[str]) -> bool:
         """Check if a task is ready to execute"""
         return all(dep_id in completed_tasks for dep_id in node.dependencies)
     
-    def _add_to_ready_queue(self, queue: List, node: DAGNode):
-        """Add task to ready queue with priority"""
-        # Priority calculation: lower number = higher priority
+    def _complete_node(self, execution: DAGExecutionContext, node: DAGNode, result: Any):
+        """Record a finished task, queue newly ready dependents and update blocking scores"""
+        node.state = TaskState.COMPLETED
+        node.result = result
+        execution.completed_tasks.add(node.task_id)
+        execution.results[node.task_id] = result
+        
+        # Check dependent tasks
+        for dep_id in node.dependents:
+            dep_node = execution.nodes[dep_id]
+            if self._is_task_ready(dep_node, execution.completed_tasks):
+                dep_node.state = TaskState.READY
+                self._add_to_ready_queue(execution, dep_node)
+        
+        # One fewer unfinished dependent for each upstream task; only queued
+        # ones need their priority adjusted
+        for upstream_id in node.dependencies:
+            if upstream_id not in execution.blocking_counts:
+                continue
+            execution.blocking_counts[upstream_id] -= 1
+            if self.enable_dynamic_reprioritization and upstream_id in execution.ready_queue:
+                execution.ready_queue.update(
+                    upstream_id,
+                    self._priority_score(execution, execution.nodes[upstream_id])
+                )
+    
+    def _priority_score(self, execution: DAGExecutionContext, node: DAGNode) -> float:
+        """Priority of a ready task: lower number = higher priority"""
         # Consider: task priority, critical path membership, estimated duration
         priority_score = node.priority
         
         # Boost priority for critical path tasks
-        if hasattr(node, '_on_critical_path') and node._on_critical_path:
+        if node.task_id in execution.critical_path:
             priority_score -= 1
         
         # Boost priority for shorter tasks (better parallelism)
         if node.estimated_duration < 30:
             priority_score -= 0.5
         
-        heapq.heappush(queue, (priority_score, datetime.utcnow(), node))
+        # Boost priority for tasks that unlock many others
+        if self.enable_dynamic_reprioritization:
+            priority_score -= execution.blocking_counts.get(node.task_id, 0) * 0.1
+        
+        return priority_score
+    
+    def _add_to_ready_queue(self, execution: DAGExecutionContext, node: DAGNode):
+        """Add task to ready queue with priority"""
+        execution.ready_queue.push(node.task_id, self._priority_score(execution, node), node)
         tasks_scheduled.inc()
     
     async def _can_allocate_agent(self, node: DAGNode) -> bool:
@@ -509,12 +676,10 @@ class DAGScheduler:
         # Auto selection
         return True
     
-    async def _handle_task_failure(self, 
-                                 dag_id: str,
-                                 failed_node: DAGNode,
-                                 ready_queue: List,
-                                 nodes: Dict[str, DAGNode]):
+    async def _handle_task_failure(self, execution: DAGExecutionContext, failed_node: DAGNode):
         """Handle task failure with various strategies"""
+        nodes = execution.nodes
+        
         # Strategy 1: Skip non-critical dependents
         if failed_node.constraints.get('allow_failure', False):
             for dep_id in failed_node.dependents:
@@ -524,10 +689,8 @@ class DAGScheduler:
                     # Remove failed dependency
                     dep_node.dependencies.discard(failed_node.task_id)
                     # Check if now ready
-                    completed = {n for n, node in nodes.items() 
-                               if node.state == TaskState.COMPLETED}
-                    if self._is_task_ready(dep_node, completed):
-                        self._add_to_ready_queue(ready_queue, dep_node)
+                    if self._is_task_ready(dep_node, execution.completed_tasks):
+                        self._add_to_ready_queue(execution, dep_node)
         
         # Strategy 2: Trigger compensating actions
         if 'compensation_task' in failed_node.constraints:
@@ -541,72 +704,93 @@ class DAGScheduler:
                 priority=1  # High priority
             )
             nodes[comp_node.task_id] = comp_node
-            self._add_to_ready_queue(ready_queue, comp_node)
+            self._add_to_ready_queue(execution, comp_node)
     
-    def _reprioritize_queue(self, 
-                          queue: List,
-                          nodes: Dict[str, DAGNode],
-                          completed_tasks: Set[str]) -> List:
-        """Dynamically reprioritize tasks based on current state"""
-        # Extract all items
-        items = []
-        while queue:
-            items.append(heapq.heappop(queue))
-        
-        # Recalculate priorities
-        new_queue = []
-        for _, _, node in items:
-            # Boost priority for tasks that unlock many others
-            blocking_score = len([
-                dep_id for dep_id in node.dependents
-                if dep_id not in completed_tasks
-            ])
-            
-            # Adjust priority
-            new_priority = node.priority - (blocking_score * 0.1)
-            
-            heapq.heappush(new_queue, (new_priority, datetime.utcnow(), node))
-        
-        return new_queue
-    
-    async def _store_context(self, dag_id: str, context: Dict[str, Any]):
+    async def _store_context(self, execution: DAGExecutionContext, context: Dict[str, Any]):
         """Store initial context for DAG execution"""
-        for key, value in context.items():
-            await self.memory_store.set(f"dag:{dag_id}:{key}", value, ttl=3600)
+        execution.context_values.update(context)
+        await self._write_context(execution, context)
     
-    async def _load_task_context(self, dag_id: str, node: DAGNode) -> Dict[str, Any]:
-        """Load context for task execution"""
+    async def _load_task_context(self,
+                                 execution: DAGExecutionContext,
+                                 node: DAGNode) -> Dict[str, Any]:
+        """Load context for task execution in at most one round-trip"""
         context = {}
+        missing = []
         
+        # Values written earlier in this run never need to go through Redis
         for key in node.context_inputs:
-            # Try DAG-specific context first
-            value = await self.memory_store.get(f"dag:{dag_id}:{key}")
+            if key in execution.context_values:
+                context[key] = execution.context_values[key]
+            else:
+                missing.append(key)
+        
+        memo_hits = len(node.context_inputs) - len(missing)
+        if memo_hits:
+            context_memo_hits.labels(dag_id=execution.dag_id).inc(memo_hits)
+            execution.context_io['memo_hits'] += memo_hits
+        if not missing:
+            return context
+        
+        # DAG-specific and global keys fetched together
+        dag_keys = [f"dag:{execution.dag_id}:{key}" for key in missing]
+        sizes: Dict[str, int] = {}
+        start = time.perf_counter()
+        values = await self.memory_store.get_multiple(dag_keys + missing, sizes=sizes)
+        self._record_context_io(execution, 'read', time.perf_counter() - start,
+                                sum(sizes.values()))
+        
+        for key, dag_key in zip(missing, dag_keys):
+            # Try DAG-specific context first, then fall back to global context
+            value = values.get(dag_key)
             if value is None:
-                # Fall back to global context
-                value = await self.memory_store.get(key)
+                value = values.get(key)
             
             if value is not None:
                 context[key] = value
         
         return context
     
-    async def _store_task_outputs(self, dag_id: str, node: DAGNode, result: Any):
+    async def _store_task_outputs(self, execution: DAGExecutionContext, node: DAGNode, result: Any):
         """Store task outputs in context"""
-        for key in node.context_outputs:
-            if key in result:
-                await self.memory_store.set(
-                    f"dag:{dag_id}:{key}",
-                    result[key],
-                    ttl=3600
-                )
+        outputs = {key: result[key] for key in node.context_outputs if key in result}
+        execution.context_values.update(outputs)
+        await self._write_context(execution, outputs)
+    
+    async def _write_context(self, execution: DAGExecutionContext, values: Dict[str, Any]):
+        """Write DAG-scoped context values in one pipelined round-trip"""
+        if not values:
+            return
+        
+        sizes: Dict[str, int] = {}
+        start = time.perf_counter()
+        await self.memory_store.set_multiple(
+            {f"dag:{execution.dag_id}:{key}": value for key, value in values.items()},
+            ttl=3600,
+            sizes=sizes
+        )
+        self._record_context_io(execution, 'write', time.perf_counter() - start,
+                                sum(sizes.values()))
+    
+    def _record_context_io(self,
+                           execution: DAGExecutionContext,
+                           direction: str,
+                           seconds: float,
+                           size: int):
+        context_io_latency.labels(dag_id=execution.dag_id, direction=direction).observe(seconds)
+        context_io_bytes.labels(dag_id=execution.dag_id, direction=direction).inc(size)
+        execution.context_io[f'{direction}_round_trips'] += 1
+        execution.context_io[f'{direction}_bytes'] += size
+        execution.context_io[f'{direction}_seconds'] += seconds
     
     def visualize_dag(self, dag_id: str) -> str:
         """Generate a visual representation of the DAG"""
-        if dag_id not in self.dags:
+        if dag_id not in self.dag_nodes:
             return "DAG not found"
         
-        dag = self.dags[dag_id]
+        template = self.dag_templates[dag_id]
         nodes = self.dag_nodes[dag_id]
+        task_ids = list(nodes)
         
         # Generate DOT format for Graphviz
         dot_lines = ["digraph G {"]
@@ -628,8 +812,8 @@ class DAGScheduler:
             dot_lines.append(f'  "{node_id}" [label="{label}", fillcolor={color}, style=filled];')
         
         # Add edges
-        for edge in dag.edges():
-            dot_lines.append(f'  "{edge[0]}" -> "{edge[1]}";')
+        for dep, dependent in template.edges():
+            dot_lines.append(f'  "{task_ids[dep]}" -> "{task_ids[dependent]}";')
         
         dot_lines.append("}")
         
@@ -662,17 +846,18 @@ class DAGScheduler:
             'total_tasks': len(nodes),
             'status_breakdown': dict(status_counts),
             'running_tasks': running_tasks,
-            'is_active': len(self.running_tasks) > 0
+            'is_active': dag_id in self.executions
         }
     
     async def cancel_dag(self, dag_id: str):
         """Cancel DAG execution"""
         if dag_id in self.dag_nodes:
-            # Cancel all running tasks
-            for task_id, task in list(self.running_tasks.items()):
-                if task_id in self.dag_nodes[dag_id]:
+            # Cancel all running tasks; the run's loop then winds down
+            execution = self.executions.get(dag_id)
+            if execution:
+                execution.ready_queue.clear()
+                for task in execution.running:
                     task.cancel()
-                    del self.running_tasks[task_id]
             
             # Update node states
             for node in self.dag_nodes[dag_id].values():
@@ -0,0 +1,121 @@
+"""
+Compiled DAG templates for repeated workflow shapes
+
+Most DAGs submitted to the scheduler are instances of a few workflow shapes
+(planner -> coder -> critic -> file_manager -> QA and the like). A shape is
+the per-position dependency structure and estimated durations of a task
+list, independent of task ids and payloads. Each shape is validated and
+analyzed once into a DAGTemplate holding position-indexed topology (CSR
+successor arrays, levels, critical path); later instances only bind their
+nodes to it.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from prometheus_client import Counter, Gauge
+
+
+# Metrics
+template_cache_hits = Counter(
+    'dag_template_cache_hits_total',
+    'DAGs created from an already compiled template'
+)
+template_cache_misses = Counter(
+    'dag_template_cache_misses_total',
+    'DAGs whose shape had to be validated and analyzed'
+)
+template_cache_size = Gauge(
+    'dag_template_cache_entries',
+    'Compiled DAG templates currently cached'
+)
+
+
+# (estimated duration, sorted positions of in-DAG dependencies) per task
+DAGShape = Tuple[Tuple[float, Tuple[int, ...]], ...]
+
+
+def dag_shape(dependencies: Sequence[Sequence[int]], durations: Sequence[float]) -> DAGShape:
+    """Shape key of a task list given each task's dependency positions"""
+    return tuple(
+        (float(duration), tuple(sorted(deps)))
+        for deps, duration in zip(dependencies, durations)
+    )
+
+
+@dataclass
+class DAGTemplate:
+    """Validated, analyzed topology shared by every DAG of one shape"""
+    shape: DAGShape
+    indptr: List[int]   # successors of position i: indices[indptr[i]:indptr[i + 1]]
+    indices: List[int]
+    start_nodes: List[int]
+    end_nodes: List[int]
+    levels: Dict[int, List[int]]
+    critical_path: List[int]
+    estimated_duration: float
+    parallelism_factor: float
+
+    @property
+    def size(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def successors(self, position: int) -> List[int]:
+        return self.indices[self.indptr[position]:self.indptr[position + 1]]
+
+    def edges(self):
+        """Iterate ``(dependency, dependent)`` position pairs"""
+        for position in range(self.size):
+            for successor in self.successors(position):
+                yield position, successor
+
+
+def csr_successors(shape: DAGShape) -> Tuple[List[int], List[int]]:
+    """Successor lists of a shape in compressed sparse row form"""
+    successors: List[List[int]] = [[] for _ in shape]
+    for position, (_, deps) in enumerate(shape):
+        for dep in deps:
+            successors[dep].append(position)
+
+    indptr = [0]
+    indices: List[int] = []
+    for targets in successors:
+        indices.extend(targets)
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+class DAGTemplateCache:
+    """Bounded LRU of compiled templates keyed by shape"""
+
+    def __init__(self, max_templates: int = 256):
+        self.max_templates = max_templates
+        self._templates: "OrderedDict[Hashable, DAGTemplate]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def get(self, shape: DAGShape) -> Optional[DAGTemplate]:
+        template = self._templates.get(shape)
+        if template is None:
+            template_cache_misses.inc()
+            return None
+        self._templates.move_to_end(shape)
+        template_cache_hits.inc()
+        return template
+
+    def put(self, template: DAGTemplate):
+        self._templates[template.shape] = template
+        self._templates.move_to_end(template.shape)
+        while len(self._templates) > self.max_templates:
+            self._templates.popitem(last=False)
+        template_cache_size.set(len(self._templates))
+
+    def clear(self):
+        self._templates.clear()
+        template_cache_size.set(0)
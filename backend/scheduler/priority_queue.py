@@ -0,0 +1,113 @@
+"""
+Addressable priority queue for DAG ready tasks
+
+A binary min-heap that also tracks each key's position, so a queued entry's
+priority can be changed or the entry removed in O(log n) instead of
+rebuilding the heap. Ties are broken by insertion order, so values are never
+compared.
+"""
+
+import itertools
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class IndexedPriorityQueue:
+    """Min-priority queue keyed by a hashable key, with update and remove"""
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []  # [priority, sequence, key, value]
+        self._index: Dict[Hashable, int] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def push(self, key: Hashable, priority: Any, value: Any = None):
+        """Insert a key, or re-prioritize it if already queued"""
+        if key in self._index:
+            self.update(key, priority)
+            return
+        self._heap.append([priority, next(self._sequence), key, value])
+        self._index[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, key: Hashable, priority: Any):
+        """Change a queued key's priority in either direction"""
+        position = self._index[key]
+        entry = self._heap[position]
+        previous, entry[0] = entry[0], priority
+        if priority < previous:
+            self._sift_up(position)
+        elif previous < priority:
+            self._sift_down(position)
+
+    def priority(self, key: Hashable) -> Any:
+        return self._heap[self._index[key]][0]
+
+    def peek(self) -> Optional[Tuple[Hashable, Any, Any]]:
+        if not self._heap:
+            return None
+        priority, _, key, value = self._heap[0]
+        return key, priority, value
+
+    def pop(self) -> Tuple[Hashable, Any, Any]:
+        """Remove and return ``(key, priority, value)`` with the lowest priority"""
+        if not self._heap:
+            raise IndexError("pop from an empty priority queue")
+        return self._take(0)
+
+    def remove(self, key: Hashable) -> Any:
+        """Remove a queued key and return its value"""
+        return self._take(self._index[key])[2]
+
+    def clear(self):
+        self._heap.clear()
+        self._index.clear()
+
+    def _take(self, position: int) -> Tuple[Hashable, Any, Any]:
+        last = self._heap.pop()
+        if position < len(self._heap):
+            removed, self._heap[position] = self._heap[position], last
+            self._index[last[2]] = position
+            self._sift_down(position)
+            self._sift_up(position)
+        else:
+            removed = last
+        del self._index[removed[2]]
+        return removed[2], removed[0], removed[3]
+
+    def _less(self, i: int, j: int) -> bool:
+        a, b = self._heap[i], self._heap[j]
+        return (a[0], a[1]) < (b[0], b[1])
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._index[heap[i][2]] = i
+        self._index[heap[j][2]] = j
+
+    def _sift_up(self, position: int):
+        while position > 0:
+            parent = (position - 1) // 2
+            if not self._less(position, parent):
+                break
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int):
+        size = len(self._heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and self._less(child, smallest):
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
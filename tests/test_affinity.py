@@ -0,0 +1,109 @@
+"""
+Tests for affinity placement and work stealing.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from backend.orchestrator.affinity import AffinityScheduler
+from backend.orchestrator.benchmarks import benchmark_affinity_scheduling
+
+
+@dataclass
+class FakeTask:
+    task_id: str
+    task_type: str = "code_review"
+    context_keys: List[str] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
+    parent_task_id: Optional[str] = None
+
+
+class TestAffinityPlacement:
+    """Warm agent lookup from context keys, parents and dependencies."""
+
+    def test_related_tasks_prefer_the_agent_holding_their_context(self):
+        affinity = AffinityScheduler()
+        affinity.record_placement(FakeTask("root", context_keys=["repo", "spec"]), "agent-a")
+        affinity.record_placement(FakeTask("other", context_keys=["docs"]), "agent-b")
+
+        assert affinity.preferred_agent(FakeTask("child", parent_task_id="root")) == "agent-a"
+        assert affinity.preferred_agent(FakeTask("join", dependencies=["root", "other"],
+                                                 context_keys=["docs"])) == "agent-b"
+        assert affinity.preferred_agent(FakeTask("unrelated", context_keys=["new"])) is None
+
+    def test_pin_overrides_until_unpinned(self):
+        affinity = AffinityScheduler()
+        task = FakeTask("t", context_keys=["repo"])
+        affinity.record_placement(FakeTask("root", context_keys=["repo"]), "agent-a")
+        affinity.pin(task, "agent-b")
+
+        # Refused admission attempts keep the pin
+        assert affinity.preferred_agent(task) == "agent-b"
+        assert affinity.preferred_agent(task) == "agent-b"
+        affinity.unpin("t")
+        assert affinity.preferred_agent(task) == "agent-a"
+
+    def test_tracked_keys_are_bounded(self):
+        affinity = AffinityScheduler(max_tracked_keys=10)
+        for i in range(100):
+            affinity.record_placement(FakeTask(f"t{i}", context_keys=[f"k{i}"]), "agent-a")
+
+        assert len(affinity._warm) == 10
+        assert affinity.preferred_agent(FakeTask("late", context_keys=["k99"])) == "agent-a"
+        assert affinity.preferred_agent(FakeTask("early", context_keys=["k0"])) is None
+
+
+class TestLocalQueues:
+    """Bounded local queues, own-queue-first service and stealing."""
+
+    def test_owner_serves_its_queue_in_order(self):
+        affinity = AffinityScheduler(max_local_queue=2)
+        first, second, third = FakeTask("1"), FakeTask("2"), FakeTask("3")
+
+        assert affinity.defer("agent-a", first)
+        assert affinity.defer("agent-a", second)
+        assert not affinity.defer("agent-a", third)
+        assert affinity.next_task("agent-a", lambda task: True) is first
+
+    def test_idle_agent_steals_newest_servable_task_from_longest_queue(self):
+        affinity = AffinityScheduler()
+        affinity.defer("agent-a", FakeTask("a1"))
+        for task in (FakeTask("b1"), FakeTask("b2"), FakeTask("b3", task_type="testing")):
+            affinity.defer("agent-b", task)
+
+        stolen = affinity.next_task("agent-c", lambda task: task.task_type == "code_review")
+
+        assert stolen.task_id == "b2"
+        assert affinity.local_queue_lengths() == {"agent-a": 1, "agent-b": 2}
+
+    def test_removed_agent_hands_back_its_queue(self):
+        affinity = AffinityScheduler()
+        affinity.record_placement(FakeTask("root", context_keys=["repo"]), "agent-a")
+        affinity.defer("agent-a", FakeTask("waiting"))
+        expired = FakeTask("expired")
+        affinity.defer("agent-a", expired)
+
+        assert affinity.remove(expired)
+        assert not affinity.remove(expired)
+        assert [task.task_id for task in affinity.remove_agent("agent-a")] == ["waiting"]
+        assert affinity.preferred_agent(FakeTask("child", parent_task_id="root")) is None
+
+
+    def test_drained_agent_keeps_its_warm_keys(self):
+        affinity = AffinityScheduler()
+        affinity.record_placement(FakeTask("root", context_keys=["repo"]), "agent-a")
+        affinity.defer("agent-a", FakeTask("waiting"))
+
+        assert [task.task_id for task in affinity.drain_agent("agent-a")] == ["waiting"]
+        assert affinity.local_queue_lengths() == {}
+        assert affinity.preferred_agent(FakeTask("child", parent_task_id="root")) == "agent-a"
+
+
+class TestAffinityBenchmark:
+    """Affinity scheduling against least busy on a shared-context workload."""
+
+    def test_affinity_raises_hit_rate_without_hurting_median_latency(self):
+        result, = benchmark_affinity_scheduling(num_families=500, utilization_levels=(0.7,))
+
+        assert result["affinity_hit_rate"] > 2 * result["least_busy_hit_rate"]
+        assert result["affinity_p50"] <= result["least_busy_p50"]
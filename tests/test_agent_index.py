@@ -0,0 +1,129 @@
+"""
+Tests for the indexed agent registry.
+"""
+
+import random
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Optional, Set
+
+from backend.orchestrator.agent_index import AgentIndex, least_busy_key, performance_key
+
+ROUTING_RULES = {"code_review": ["reviewer"], "testing": ["tester", "reviewer"]}
+
+
+@dataclass
+class FakeAgent:
+    agent_id: str
+    agent_type: str = "reviewer"
+    capabilities: Set[str] = field(default_factory=lambda: {"code_review", "testing"})
+    status: str = "available"
+    max_concurrent_tasks: int = 2
+    active_tasks: Set[str] = field(default_factory=set)
+    performance_score: float = 1.0
+    current_capacity: float = 1.0
+    error_rate: float = 0.0
+    tasks_completed: int = 0
+    circuit_breaker: Optional[Any] = None
+
+
+def is_schedulable(agent):
+    return agent.status == "available" and len(agent.active_tasks) < agent.max_concurrent_tasks
+
+
+def make_index(*agents, key=least_busy_key):
+    index = AgentIndex(ROUTING_RULES, is_schedulable, key)
+    for agent in agents:
+        index.add(agent)
+    return index
+
+
+class TestAgentIndex:
+    """Selection order and maintenance of the per-task-type heaps."""
+
+    def test_selects_least_busy_and_tracks_updates(self):
+        a, b = FakeAgent("a"), FakeAgent("b")
+        index = make_index(a, b)
+
+        first = index.select("code_review")
+        first.active_tasks.add("t1")
+        index.update(first)
+
+        assert index.select("code_review") is (b if first is a else a)
+
+    def test_full_or_offline_agents_are_skipped_until_updated(self):
+        agent = FakeAgent("a", max_concurrent_tasks=1)
+        index = make_index(agent)
+
+        agent.active_tasks.add("t1")
+        index.update(agent)
+        assert index.select("code_review") is None
+
+        agent.active_tasks.clear()
+        agent.status = "offline"
+        index.update(agent)
+        assert index.select("code_review") is None
+
+        agent.status = "available"
+        index.update(agent)
+        assert index.select("code_review") is agent
+
+    def test_open_circuit_breaker_is_skipped_but_kept(self):
+        breaker = SimpleNamespace(is_open=True)
+        a = FakeAgent("a", circuit_breaker=breaker)
+        b = FakeAgent("b", active_tasks={"t1"})
+        index = make_index(a, b)
+
+        assert index.select("code_review") is b
+        breaker.is_open = False
+        assert index.select("code_review") is a
+
+    def test_routing_rules_and_removal(self):
+        reviewer = FakeAgent("r")
+        tester = FakeAgent("t", agent_type="tester")
+        index = make_index(reviewer, tester)
+
+        assert [a.agent_id for a in index.eligible("code_review")] == ["r"]
+        index.remove("r")
+        assert index.select("code_review") is None
+        assert index.select("testing") is tester
+
+    def test_idle_counts_follow_load_status_and_removal(self):
+        a = FakeAgent("a")
+        b = FakeAgent("b", agent_type="tester", capabilities={"testing"})
+        index = make_index(a, b)
+        assert index.has_idle("code_review") and index.has_idle("testing")
+
+        a.active_tasks.add("t1")
+        index.update(a)
+        assert not index.has_idle("code_review")
+        assert index.has_idle("testing")
+
+        b.status = "offline"
+        index.update(b)
+        assert not index.has_idle("testing")
+
+        a.active_tasks.clear()
+        index.update(a)
+        index.remove("a")
+        assert not index.has_idle("code_review")
+
+    def test_matches_linear_scan_under_churn(self):
+        rng = random.Random(3)
+        agents = [FakeAgent(f"a{i}", max_concurrent_tasks=rng.randint(1, 4),
+                            performance_score=rng.random()) for i in range(50)]
+        index = make_index(*agents, key=performance_key)
+
+        for step in range(2000):
+            agent = rng.choice(agents)
+            if agent.active_tasks and rng.random() < 0.5:
+                agent.active_tasks.pop()
+            elif len(agent.active_tasks) < agent.max_concurrent_tasks:
+                agent.active_tasks.add(f"t{step}")
+            agent.performance_score = rng.random()
+            index.update(agent)
+
+            candidates = [a for a in agents if is_schedulable(a)]
+            expected = min(map(performance_key, candidates)) if candidates else None
+            selected = index.select("code_review")
+            assert (performance_key(selected) if selected else None) == expected
@@ -0,0 +1,125 @@
+"""
+Tests for running per-agent-type load aggregates.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Optional, Set
+
+from backend.orchestrator.agent_index import AgentIndex
+from backend.orchestrator.aggregates import AgentTypeAggregates
+
+ROUTING_RULES = {
+    "code_review": ["reviewer"],
+    "testing": ["tester", "reviewer"],
+    "planning": ["planner"],
+}
+AGENT_TYPES = ["reviewer", "tester", "planner"]
+
+
+@dataclass
+class FakeAgent:
+    agent_id: str
+    agent_type: str
+    max_concurrent_tasks: int
+    capabilities: Set[str] = field(default_factory=lambda: set(ROUTING_RULES))
+    status: str = "available"
+    active_tasks: Set[str] = field(default_factory=set)
+    circuit_breaker: Optional[Any] = None
+
+
+def recompute(agents, pending):
+    """What the autoscaler used to derive by scanning every agent and pending task"""
+    expected = {}
+    for agent_type in AGENT_TYPES:
+        of_type = [a for a in agents.values() if a.agent_type == agent_type]
+        active = sum(len(a.active_tasks) for a in of_type)
+        capacity = sum(a.max_concurrent_tasks for a in of_type)
+        task_types = {t for t, types in ROUTING_RULES.items() if agent_type in types}
+        expected[agent_type] = (
+            len(of_type),
+            active / capacity if capacity > 0 else 0.0,
+            sum(1 for task_type in pending.values() if task_type in task_types),
+        )
+    return expected
+
+
+def observed(aggregates):
+    return {
+        agent_type: (aggregates.agents_of(agent_type),
+                     aggregates.utilization(agent_type),
+                     aggregates.pending_for(agent_type))
+        for agent_type in AGENT_TYPES
+    }
+
+
+class TestAgentTypeAggregates:
+    """Counters fed through the agent index and pending task events."""
+
+    def test_counts_follow_register_assign_complete_and_unregister(self):
+        aggregates = AgentTypeAggregates(ROUTING_RULES)
+        index = AgentIndex(ROUTING_RULES, lambda a: a.status == "available", observer=aggregates)
+        a, b = FakeAgent("a", "reviewer", 2), FakeAgent("b", "reviewer", 4)
+        index.add(a)
+        index.add(b)
+        aggregates.task_added("testing")
+
+        a.active_tasks.add("t1")
+        index.update(a)
+        assert aggregates.agents_of("reviewer") == 2
+        assert aggregates.utilization("reviewer") == 1 / 6
+        assert aggregates.pending_for("reviewer") == 1
+        assert aggregates.pending_for("tester") == 1
+        assert aggregates.pending_for("planner") == 0
+
+        a.active_tasks.clear()
+        index.update(a)
+        aggregates.task_removed("testing")
+        index.remove("b")
+        index.remove("b")
+        assert observed(aggregates)["reviewer"] == (1, 0.0, 0)
+
+    def test_counters_match_full_recomputation_under_random_churn(self):
+        rng = random.Random(19)
+        aggregates = AgentTypeAggregates(ROUTING_RULES)
+        index = AgentIndex(ROUTING_RULES, lambda a: a.status == "available", observer=aggregates)
+        agents, pending = {}, {}
+
+        for step in range(3000):
+            action = rng.random()
+            if action < 0.1 or not agents:
+                agent = FakeAgent(f"agent-{step}", rng.choice(AGENT_TYPES), rng.randint(1, 8))
+                agents[agent.agent_id] = agent
+                index.add(agent)
+            elif action < 0.15:
+                agent_id = rng.choice(list(agents))
+                index.remove(agent_id)
+                for task_id in agents.pop(agent_id).active_tasks:
+                    pending.pop(task_id, None)
+                    aggregates.task_removed(task_id.split(":")[0])
+            elif action < 0.45:
+                task_type = rng.choice(list(ROUTING_RULES))
+                task_id = f"{task_type}:{step}"
+                pending[task_id] = task_type
+                aggregates.task_added(task_type)
+                agent = index.select(task_type)
+                if agent and len(agent.active_tasks) < agent.max_concurrent_tasks:
+                    agent.active_tasks.add(task_id)
+                    index.update(agent)
+            elif action < 0.8:
+                busy = [a for a in agents.values() if a.active_tasks]
+                if busy:
+                    agent = rng.choice(busy)
+                    task_id = rng.choice(sorted(agent.active_tasks))
+                    agent.active_tasks.remove(task_id)
+                    index.update(agent)
+                    aggregates.task_removed(pending.pop(task_id))
+            else:
+                agent = rng.choice(list(agents.values()))
+                agent.status = rng.choice(["available", "offline", "draining"])
+                index.update(agent)
+
+            if step % 50 == 0:
+                assert observed(aggregates) == recompute(agents, pending)
+
+        assert observed(aggregates) == recompute(agents, pending)
@@ -0,0 +1,228 @@
+"""
+Tests for incremental task checkpointing.
+"""
+
+import itertools
+import random
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.orchestrator import checkpointing
+from backend.orchestrator.checkpointing import (
+    DELETE_SUPERSEDED_SQL,
+    DELETE_TASKS_SQL,
+    INSERT_CHECKPOINTS_SQL,
+    CheckpointManager,
+    apply_delta,
+    decode_record,
+    diff_state,
+    encode_record,
+)
+
+
+def make_pool():
+    """
+    Fake asyncpg pool keeping checkpoint rows in a list.
+
+    Supports the batched insert, superseded and discarded record cleanup and
+    chain select.
+    """
+    rows = []
+    ids = itertools.count(1)
+
+    async def execute(statement, *args):
+        if statement == INSERT_CHECKPOINTS_SQL:
+            for task_id, is_base, data in zip(*args):
+                rows.append({'checkpoint_id': next(ids), 'task_id': task_id,
+                             'is_base': is_base, 'data': data})
+        elif statement == DELETE_SUPERSEDED_SQL:
+            for task_id in args[0]:
+                base_id = max(r['checkpoint_id'] for r in rows if r['task_id'] == task_id and r['is_base'])
+                rows[:] = [r for r in rows if r['task_id'] != task_id or r['checkpoint_id'] >= base_id]
+        elif statement == DELETE_TASKS_SQL:
+            rows[:] = [r for r in rows if r['task_id'] not in args[0]]
+
+    async def fetch(statement, task_id):
+        chain = [r for r in rows if r['task_id'] == task_id]
+        base_ids = [r['checkpoint_id'] for r in chain if r['is_base']]
+        if not base_ids:
+            return []
+        return [r for r in chain if r['checkpoint_id'] >= max(base_ids)]
+
+    conn = MagicMock()
+    conn.execute = AsyncMock(side_effect=execute)
+    conn.fetch = AsyncMock(side_effect=fetch)
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    conn.transaction = transaction
+    pool = MagicMock()
+    pool.acquire = acquire
+    return pool, conn, rows
+
+
+def random_state(rng, depth=0):
+    state = {}
+    for i in range(rng.randint(1, 6)):
+        if depth < 2 and rng.random() < 0.3:
+            state[f"k{i}"] = random_state(rng, depth + 1)
+        else:
+            state[f"k{i}"] = rng.choice([rng.randint(0, 100), f"s{rng.randint(0, 9)}", [1, 2], None])
+    return state
+
+
+class TestDeltaEncoding:
+    """Deltas and the compressed record format."""
+
+    def test_delta_round_trip_on_random_states(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            old, new = random_state(rng), random_state(rng)
+            snapshot = repr(old)
+
+            assert apply_delta(old, diff_state(old, new)) == new
+            assert repr(old) == snapshot
+
+    def test_nested_change_only_carries_the_changed_leaf(self):
+        old = {"progress": 0.1, "files": {"a.py": "x" * 1000, "b.py": "y"}}
+        new = {"progress": 0.2, "files": {"a.py": "x" * 1000, "b.py": "z"}}
+
+        assert diff_state(old, new) == [["s", ["progress"], 0.2], ["s", ["files", "b.py"], "z"]]
+
+    def test_records_decode_with_either_codec(self):
+        value = {"step": 3, "log": ["a"] * 50}
+
+        assert decode_record(encode_record(value)) == value
+        with patch.object(checkpointing, "zstandard", None):
+            record = encode_record(value)
+            assert record[:1] == b"z"
+            assert decode_record(record) == value
+
+    @pytest.mark.skipif(checkpointing.zstandard is None, reason="zstandard not installed")
+    def test_zstd_records_round_trip(self):
+        value = {"step": 3, "blob": b"\x00" * 100, "log": ["a"] * 50}
+
+        record = encode_record(value)
+
+        assert record[:1] == b"Z"
+        assert decode_record(record) == value
+
+
+class TestCheckpointManager:
+    """Single-timer passes, batching and rehydration."""
+
+    @pytest.mark.asyncio
+    async def test_one_fetch_per_agent_and_one_insert_per_pass(self):
+        pool, conn, rows = make_pool()
+        fetch = AsyncMock(side_effect=lambda agent_id, task_ids: {t: {"agent": agent_id} for t in task_ids})
+        manager = CheckpointManager(fetch, pool)
+        task_ids = [str(uuid.uuid4()) for _ in range(10)]
+        for i, task_id in enumerate(task_ids):
+            manager.track(task_id, f"agent-{i % 2}")
+
+        await manager.checkpoint_once()
+
+        assert fetch.await_count == 2
+        inserts = [c for c in conn.execute.await_args_list if c.args[0] == INSERT_CHECKPOINTS_SQL]
+        assert len(inserts) == 1
+        assert len(rows) == 10 and all(r['is_base'] for r in rows)
+
+    @pytest.mark.asyncio
+    async def test_unchanged_tasks_write_nothing_and_changes_write_deltas(self):
+        pool, conn, rows = make_pool()
+        state = {"progress": 0, "files": {"a.py": "x" * 500}}
+        manager = CheckpointManager(AsyncMock(side_effect=lambda a, ids: {ids[0]: dict(state)}), pool)
+        task_id = str(uuid.uuid4())
+        manager.track(task_id, "agent")
+
+        await manager.checkpoint_once()
+        await manager.checkpoint_once()
+        state["progress"] = 1
+        await manager.checkpoint_once()
+
+        assert [r['is_base'] for r in rows] == [True, False]
+        assert len(rows[1]['data']) < len(rows[0]['data'])
+
+    @pytest.mark.asyncio
+    async def test_rehydrates_from_base_plus_deltas_and_rebases_periodically(self):
+        pool, _, rows = make_pool()
+        states = iter({"step": i, "done": list(range(i))} for i in range(1, 100))
+        current = {}
+
+        async def fetch(agent_id, task_ids):
+            current.update(next(states))
+            return {task_ids[0]: dict(current)}
+
+        manager = CheckpointManager(fetch, pool, full_every=3)
+        task_id = str(uuid.uuid4())
+        manager.track(task_id, "agent")
+        for _ in range(6):
+            await manager.checkpoint_once()
+
+        # Base at step 5 superseded the first base and its deltas
+        assert [r['is_base'] for r in rows] == [True, False]
+        assert manager.untrack(task_id) == {"step": 6, "done": [0, 1, 2, 3, 4, 5]}
+        assert await manager.load(task_id) == {"step": 6, "done": [0, 1, 2, 3, 4, 5]}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_forces_a_new_base(self):
+        failing_pool, failing_conn, _ = make_pool()
+        failing_conn.execute.side_effect = ConnectionError("db down")
+        pool, _, rows = make_pool()
+        steps = iter(range(10))
+        manager = CheckpointManager(
+            AsyncMock(side_effect=lambda a, ids: {ids[0]: {"step": next(steps)}}), failing_pool
+        )
+        task_id = str(uuid.uuid4())
+        manager.track(task_id, "agent")
+
+        await manager.checkpoint_once()
+        manager.db_pool = pool
+        await manager.checkpoint_once()
+
+        assert [r['is_base'] for r in rows] == [True]
+        assert await manager.load(str(uuid.UUID(task_id))) == {"step": 1}
+
+    @pytest.mark.asyncio
+    async def test_task_moved_during_fetch_is_not_recorded(self):
+        pool, _, rows = make_pool()
+        task_id = str(uuid.uuid4())
+
+        async def fetch(agent_id, task_ids):
+            manager.track(task_id, "other-agent")
+            return {task_id: {"n": 1}}
+
+        manager = CheckpointManager(fetch, pool)
+        manager.track(task_id, "agent")
+        await manager.checkpoint_once()
+
+        assert rows == []
+        assert manager.latest(task_id) is None
+
+    @pytest.mark.asyncio
+    async def test_discarded_tasks_lose_their_records_at_the_next_pass(self):
+        pool, _, rows = make_pool()
+        manager = CheckpointManager(
+            AsyncMock(side_effect=lambda a, ids: {t: {"n": 1} for t in ids}), pool
+        )
+        done, failed = str(uuid.uuid4()), str(uuid.uuid4())
+        manager.track(done, "agent")
+        manager.track(failed, "agent")
+        await manager.checkpoint_once()
+
+        manager.discard(done)
+        manager.untrack(failed)
+        await manager.checkpoint_once()
+
+        assert {str(r['task_id']) for r in rows} == {failed}
+        assert await manager.load(done) is None
+        assert await manager.load(failed) == {"n": 1}
@@ -0,0 +1,73 @@
+"""
+Tests for task completion notifications.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.orchestrator.completion import TaskCompletions, completion_outcome
+
+
+class TestCompletionOutcome:
+    """Terminal status derived from stored results."""
+
+    def test_classifies_results(self):
+        assert completion_outcome({"files": 3}) == {
+            "status": "completed", "result": {"files": 3}, "error": None
+        }
+        assert completion_outcome({"error": "boom", "status": "failed"})["status"] == "failed"
+        cancelled = completion_outcome({"status": "cancelled", "reason": "deadline"})
+        assert (cancelled["status"], cancelled["error"]) == ("cancelled", "deadline")
+
+
+class TestTaskCompletions:
+    """Shared per-task futures resolved by the manager."""
+
+    @pytest.mark.asyncio
+    async def test_all_waiters_wake_on_resolve(self):
+        completions = TaskCompletions()
+        waiters = [asyncio.create_task(completions.wait("t1")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        completions.resolve("t1", {"ok": True})
+        outcomes = await asyncio.gather(*waiters)
+
+        assert all(o == {"status": "completed", "result": {"ok": True}, "error": None} for o in outcomes)
+        assert len(completions) == 0
+
+    @pytest.mark.asyncio
+    async def test_one_waiter_timing_out_leaves_the_others_waiting(self):
+        completions = TaskCompletions()
+        patient = asyncio.create_task(completions.wait("t1"))
+
+        with pytest.raises(asyncio.TimeoutError):
+            await completions.wait("t1", timeout=0.01)
+        completions.resolve("t1", {"error": "boom"})
+
+        assert (await patient)["status"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_releases_waiters(self):
+        completions = TaskCompletions()
+        waiter = asyncio.create_task(completions.wait("t1"))
+        await asyncio.sleep(0)
+
+        completions.cancel_all()
+
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        completions.resolve("t1", {})
+
+    @pytest.mark.asyncio
+    async def test_dispatch_waiters_wake_on_dispatch_or_finish(self):
+        completions = TaskCompletions()
+        dispatched = asyncio.create_task(completions.wait_dispatched("t1"))
+        cancelled = asyncio.create_task(completions.wait_dispatched("t2"))
+        await asyncio.sleep(0)
+
+        completions.dispatched("t1")
+        completions.resolve("t2", {"status": "cancelled", "reason": "deadline"})
+
+        await asyncio.gather(dispatched, cancelled)
+        assert len(completions) == 0
@@ -0,0 +1,106 @@
+"""
+Tests for the local context cache in front of the shared memory store.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.memory.context_store import LocalContextCache
+
+
+def make_store(data):
+    store = MagicMock()
+
+    async def get_multiple(keys):
+        await asyncio.sleep(0)
+        return {k: data[k] for k in keys if k in data}
+
+    store.get_multiple = AsyncMock(side_effect=get_multiple)
+    store.set = AsyncMock(return_value=True)
+    return store
+
+
+class TestLocalContextCache:
+    """Batching, expiry and sharing of context reads."""
+
+    @pytest.mark.asyncio
+    async def test_misses_are_fetched_in_one_call_and_then_cached(self):
+        store = make_store({"a": 1, "b": 2})
+        cache = LocalContextCache(store)
+
+        assert await cache.get_multiple(["a", "b", "missing"]) == {"a": 1, "b": 2}
+        assert await cache.get_multiple(["a", "b"]) == {"a": 1, "b": 2}
+
+        store.get_multiple.assert_awaited_once_with(["a", "b", "missing"])
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_are_not_cached(self):
+        data = {}
+        store = make_store(data)
+        cache = LocalContextCache(store)
+
+        assert await cache.get_multiple(["late"]) == {}
+        data["late"] = "value"
+
+        assert await cache.get_multiple(["late"]) == {"late": "value"}
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        store = make_store({"a": 1})
+        cache = LocalContextCache(store, ttl_seconds=2)
+
+        with patch("backend.memory.context_store.time.monotonic", return_value=10.0):
+            await cache.get_multiple(["a"])
+        with patch("backend.memory.context_store.time.monotonic", return_value=13.0):
+            await cache.get_multiple(["a"])
+
+        assert store.get_multiple.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_siblings_share_one_fetch(self):
+        store = make_store({"shared": "ctx"})
+        cache = LocalContextCache(store)
+
+        results = await asyncio.gather(*[cache.get_multiple(["shared"]) for _ in range(5)])
+
+        assert results == [{"shared": "ctx"}] * 5
+        assert store.get_multiple.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_set_invalidates_local_entry(self):
+        data = {"a": 1}
+        store = make_store(data)
+        cache = LocalContextCache(store)
+        await cache.get_multiple(["a"])
+
+        await cache.set("a", 2)
+        data["a"] = 2
+
+        assert await cache.get_multiple(["a"]) == {"a": 2}
+        store.set.assert_awaited_once_with("a", 2, ttl=None)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetch_does_not_strand_sharing_readers(self):
+        store = make_store({"shared": "ctx"})
+        never = asyncio.Event()
+        fetch = store.get_multiple.side_effect
+
+        async def first_fetch_hangs(keys):
+            if store.get_multiple.await_count == 1:
+                await never.wait()
+            return await fetch(keys)
+
+        store.get_multiple.side_effect = first_fetch_hangs
+        cache = LocalContextCache(store)
+
+        first = asyncio.create_task(cache.get_multiple(["shared"]))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_multiple(["shared"]))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await asyncio.wait_for(second, timeout=1.0) == {"shared": "ctx"}
+        assert first.cancelled()
+        assert store.get_multiple.await_count == 2
@@ -0,0 +1,340 @@
+"""
+Tests for concurrent DAG execution in the DAG scheduler.
+"""
+
+import asyncio
+import random
+import uuid
+
+import pytest
+
+from backend.orchestrator.completion import TaskCompletions
+from backend.scheduler.dag_scheduler import DAGScheduler, TaskState
+
+
+class FakeAgentManager:
+    """Completes each task after a short random delay, tracking concurrency
+
+    With ``agents`` set, tasks beyond that many queue until an agent frees up.
+    """
+
+    def __init__(self, seed=5, agents=None):
+        self.rng = random.Random(seed)
+        self.agents = agents
+        self.completions = TaskCompletions()
+        self.payloads = {}
+        self.queued = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.on_complete = None
+
+    async def submit_task(self, task_type, payload, **kwargs):
+        task_id = str(uuid.uuid4())
+        self.payloads[task_id] = payload
+        self.queued.append(task_id)
+        self._dispatch()
+        return task_id
+
+    def _dispatch(self):
+        while self.queued and (self.agents is None or self.in_flight < self.agents):
+            task_id = self.queued.pop(0)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.completions.dispatched(task_id)
+            asyncio.get_running_loop().call_later(self.rng.uniform(0, 0.005), self._complete, task_id)
+
+    def _complete(self, task_id):
+        if self.on_complete:
+            self.on_complete(task_id)
+        self.in_flight -= 1
+        self.completions.resolve(task_id, {"echo": self.payloads.pop(task_id)})
+        self._dispatch()
+
+    def is_task_queued(self, task_id):
+        return task_id in self.queued
+
+    async def wait_for_dispatch(self, task_id, timeout=None):
+        if self.is_task_queued(task_id):
+            await self.completions.wait_dispatched(task_id, timeout)
+
+    async def wait_for_task(self, task_id, timeout=None):
+        return await self.completions.wait(task_id, timeout)
+
+    def get_least_busy_agent(self, task_type):
+        return object()
+
+
+def diamond(dag_index):
+    """a -> (b, c) -> d, with payloads naming their DAG"""
+    ids = {name: f"dag{dag_index}-{name}" for name in "abcd"}
+    deps = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+    return [
+        {
+            'task_id': ids[name],
+            'task_type': 'testing',
+            'payload': {'dag': dag_index, 'node': name},
+            'dependencies': [ids[d] for d in deps[name]],
+        }
+        for name in "abcd"
+    ]
+
+
+class TestConcurrentDAGs:
+    """Isolated per-run state and a shared slot limit."""
+
+    @pytest.mark.asyncio
+    async def test_hundred_dags_run_concurrently_without_interference(self):
+        manager = FakeAgentManager()
+        scheduler = DAGScheduler(manager, memory_store=None, max_parallel_tasks=16)
+        for i in range(100):
+            await scheduler.create_dag(f"dag{i}", diamond(i))
+
+        summaries = await asyncio.gather(*(
+            scheduler.execute_dag(f"dag{i}", priority=1 + i % 4, tenant=f"tenant{i % 3}")
+            for i in range(100)
+        ))
+
+        # Nothing queues in this manager, so no dispatch claims a slot past the limit
+        assert manager.peak_in_flight <= 16
+        for i, summary in enumerate(summaries):
+            assert summary['status'] == 'completed'
+            assert summary['completed_tasks'] == 4
+            assert set(summary['results']) == {f"dag{i}-{name}" for name in "abcd"}
+            assert all(r["echo"]["dag"] == i for r in summary['results'].values())
+        assert scheduler.executions == {}
+        assert scheduler.fair_share.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_dag_does_not_disturb_others(self):
+        manager = FakeAgentManager()
+        scheduler = DAGScheduler(manager, memory_store=None, max_parallel_tasks=2)
+        await scheduler.create_dag("keep", diamond(0))
+        await scheduler.create_dag("cancel", diamond(1))
+
+        runs = [asyncio.create_task(scheduler.execute_dag(dag_id)) for dag_id in ("keep", "cancel")]
+        await asyncio.sleep(0)
+        await scheduler.cancel_dag("cancel")
+        kept, cancelled = await asyncio.gather(*runs)
+
+        assert kept['completed_tasks'] == 4
+        assert cancelled['completed_tasks'] < 4
+        assert all(node.state == TaskState.CANCELLED
+                   for node in scheduler.dag_nodes["cancel"].values()
+                   if node.state != TaskState.COMPLETED)
+        assert scheduler.fair_share.in_use == 0
+
+
+    @pytest.mark.asyncio
+    async def test_task_cancelled_before_it_runs_returns_its_slot(self):
+        manager = FakeAgentManager()
+        scheduler = DAGScheduler(manager, memory_store=None, max_parallel_tasks=2)
+        await scheduler.create_dag("cancel", diamond(0))
+        original = scheduler._start_next_task
+
+        async def start_then_cancel(execution):
+            await original(execution)
+            await scheduler.cancel_dag("cancel")
+
+        scheduler._start_next_task = start_then_cancel
+        summary = await scheduler.execute_dag("cancel")
+
+        assert summary['completed_tasks'] == 0
+        assert scheduler.fair_share.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_caller_cancels_running_tasks(self):
+        manager = FakeAgentManager()
+        manager._complete = lambda task_id: None  # Tasks never finish
+        scheduler = DAGScheduler(manager, memory_store=None, max_parallel_tasks=2)
+        await scheduler.create_dag("stuck", diamond(0))
+
+        run = asyncio.create_task(scheduler.execute_dag("stuck"))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        running = list(scheduler.executions["stuck"].running)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+
+        assert running and all(task.cancelled() for task in running)
+        assert scheduler.dag_nodes["stuck"]["dag0-a"].state == TaskState.CANCELLED
+        assert scheduler.executions == {}
+        assert scheduler.fair_share.in_use == 0
+
+
+class TestQueuedTaskSlots:
+    """Slots held from dispatch to completion, not while queued in the manager."""
+
+    @pytest.mark.asyncio
+    async def test_tasks_queued_in_the_manager_hold_no_slot(self):
+        manager = FakeAgentManager(agents=1)
+        scheduler = DAGScheduler(manager, memory_store=None, max_parallel_tasks=3)
+        await scheduler.create_dag("wide", [
+            {'task_id': f't{i}', 'task_type': 'testing'} for i in range(4)
+        ])
+        slots_in_use = []
+        manager.on_complete = lambda task_id: slots_in_use.append(scheduler.fair_share.in_use)
+
+        summary = await scheduler.execute_dag("wide")
+
+        assert summary['completed_tasks'] == 4
+        assert manager.peak_in_flight == 1
+        # Only the task running on the single agent holds a slot
+        assert slots_in_use and max(slots_in_use) == 1
+        assert scheduler.fair_share.in_use == 0
+
+
+class TestReadyQueuePriorities:
+    """Ready tasks ordered by priority, critical path and blocking score."""
+
+    @pytest.mark.asyncio
+    async def test_task_unlocking_more_work_starts_first(self):
+        scheduler = DAGScheduler(FakeAgentManager(), memory_store=None)
+        await scheduler.create_dag("fan", [
+            {'task_id': 'narrow', 'task_type': 'testing', 'estimated_duration': 60.0},
+            {'task_id': 'wide', 'task_type': 'testing', 'estimated_duration': 60.0},
+            {'task_id': 'n1', 'task_type': 'testing', 'dependencies': ['narrow']},
+            *({'task_id': f'w{i}', 'task_type': 'testing', 'dependencies': ['wide']}
+              for i in range(3)),
+            # Holds the critical path so it does not decide the order above
+            {'task_id': 'long', 'task_type': 'testing', 'priority': 4, 'estimated_duration': 600.0},
+        ])
+        started = []
+        original = scheduler._start_next_task
+
+        async def record(execution):
+            started.append(execution.ready_queue.peek()[0])
+            await original(execution)
+
+        scheduler._start_next_task = record
+        scheduler.fair_share.capacity = 1
+        summary = await scheduler.execute_dag("fan")
+
+        assert summary['completed_tasks'] == 7
+        assert started[:3] == ['wide', 'narrow', 'long']
+
+
+class FakeMemoryStore:
+    """Dict-backed store counting batched round-trips"""
+
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.reads = []
+        self.writes = []
+
+    async def get_multiple(self, keys, sizes=None):
+        self.reads.append(list(keys))
+        found = {k: self.data[k] for k in keys if k in self.data}
+        if sizes is not None:
+            sizes.update({k: 8 for k in found})
+        return found
+
+    async def set_multiple(self, data, ttl=None, sizes=None):
+        self.writes.append(dict(data))
+        self.data.update(data)
+        if sizes is not None:
+            sizes.update({k: 8 for k in data})
+        return True
+
+
+class TestContextIO:
+    """Batched context reads and writes with per-run memoization."""
+
+    @pytest.mark.asyncio
+    async def test_upstream_outputs_are_memoized_and_misses_batched(self):
+        store = FakeMemoryStore({"region": "eu", "dag:ctx:tier": "gold", "tier": "silver"})
+        scheduler = DAGScheduler(FakeAgentManager(), memory_store=store)
+        await scheduler.create_dag("ctx", [
+            {'task_id': 'a', 'task_type': 'testing', 'context_outputs': ['echo']},
+            {'task_id': 'b', 'task_type': 'testing', 'dependencies': ['a'],
+             'context_inputs': ['echo', 'seed', 'region', 'tier', 'absent']},
+        ])
+        loaded = {}
+        original = scheduler._load_task_context
+
+        async def record(execution, node):
+            loaded[node.task_id] = await original(execution, node)
+            return loaded[node.task_id]
+
+        scheduler._load_task_context = record
+        summary = await scheduler.execute_dag("ctx", context={"seed": 7})
+
+        assert loaded['b'] == {"echo": {}, "seed": 7, "region": "eu", "tier": "gold"}
+        # One write for the initial context, one for a's output, one read for b's misses
+        assert [sorted(w) for w in store.writes] == [["dag:ctx:seed"], ["dag:ctx:echo"]]
+        assert store.reads == [["dag:ctx:region", "dag:ctx:tier", "dag:ctx:absent",
+                                "region", "tier", "absent"]]
+        io = summary['context_io']
+        assert (io['memo_hits'], io['read_round_trips'], io['write_round_trips']) == (2, 1, 2)
+        assert io['read_bytes'] == 24
+
+
+def random_dag(rng, size, prefix):
+    return [
+        {
+            'task_id': f"{prefix}{i}",
+            'task_type': 'testing',
+            'dependencies': [f"{prefix}{d}" for d in rng.sample(range(i), min(i, rng.randint(0, 3)))],
+            'estimated_duration': float(rng.choice([10, 30, 60])),
+        }
+        for i in range(size)
+    ]
+
+
+class TestDAGTemplates:
+    """Shape-keyed compiled templates reused across DAG instances."""
+
+    @pytest.mark.asyncio
+    async def test_same_shape_reuses_template_and_binds_own_nodes(self):
+        scheduler = DAGScheduler(FakeAgentManager(), memory_store=None)
+        first = await scheduler.create_dag("one", diamond(1))
+        second = await scheduler.create_dag("two", diamond(2))
+
+        assert len(scheduler.template_cache) == 1
+        assert scheduler.dag_templates["one"] is scheduler.dag_templates["two"]
+        assert second.start_nodes == {"dag2-a"}
+        assert second.end_nodes == {"dag2-d"}
+        assert [t.replace("dag2", "dag1") for t in second.critical_path] == first.critical_path
+        assert scheduler.dag_nodes["two"]["dag2-a"].dependents == {"dag2-b", "dag2-c"}
+        assert scheduler.dag_nodes["two"]["dag2-b"].payload == {'dag': 2, 'node': 'b'}
+
+        summary = await scheduler.execute_dag("two")
+        assert summary['completed_tasks'] == 4
+
+    @pytest.mark.asyncio
+    async def test_cached_plans_match_freshly_analyzed_ones(self):
+        rng = random.Random(3)
+        cached = DAGScheduler(FakeAgentManager(), memory_store=None)
+        fresh = DAGScheduler(FakeAgentManager(), memory_store=None)
+        fresh.enable_template_cache = False
+        shapes = [random_dag(rng, rng.randint(1, 30), "") for _ in range(5)]
+
+        for i in range(20):
+            tasks = [dict(t, task_id=f"{i}-{t['task_id']}",
+                          dependencies=[f"{i}-{d}" for d in t['dependencies']])
+                     for t in shapes[i % 5]]
+            got = await cached.create_dag(str(i), tasks)
+            want = await fresh.create_dag(str(i), tasks)
+            assert (got.start_nodes, got.end_nodes, got.critical_path) == \
+                (want.start_nodes, want.end_nodes, want.critical_path)
+            assert (got.estimated_duration, got.parallelism_factor) == \
+                (want.estimated_duration, want.parallelism_factor)
+            assert {k: n.dependents for k, n in cached.dag_nodes[str(i)].items()} == \
+                {k: n.dependents for k, n in fresh.dag_nodes[str(i)].items()}
+
+        assert len(cached.template_cache) == 5
+        assert len(fresh.template_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_cycles_are_rejected_and_not_cached(self):
+        scheduler = DAGScheduler(FakeAgentManager(), memory_store=None)
+        cyclic = [
+            {'task_id': 'a', 'task_type': 'testing', 'dependencies': ['b']},
+            {'task_id': 'b', 'task_type': 'testing', 'dependencies': ['a']},
+        ]
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await scheduler.create_dag("cyclic", cyclic)
+        assert len(scheduler.template_cache) == 0
+        assert "cyclic" not in scheduler.dag_nodes
@@ -0,0 +1,93 @@
+"""
+Tests for deadline-aware ordering and the deadline monitor.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from backend.orchestrator.deadlines import DeadlineMonitor, deadline_aware_key
+from backend.orchestrator.dispatch_queue import PriorityDispatchQueue
+
+
+@dataclass
+class FakeTask:
+    priority: int
+    name: str
+    enqueued_at: datetime
+    deadline: Optional[datetime] = None
+
+
+AGING = {1: 0.0, 3: 60.0, 5: 900.0}
+
+
+class TestDeadlineAwareKey:
+    """Virtual-deadline ordering with priority aging."""
+
+    @pytest.mark.asyncio
+    async def test_aged_background_task_overtakes_new_critical_work(self):
+        now = datetime.utcnow()
+        queue = PriorityDispatchQueue(priorities=[1, 3, 5], key=deadline_aware_key(AGING))
+        await queue.put(FakeTask(1, "critical-new", now))
+        await queue.put(FakeTask(5, "background-old", now - timedelta(seconds=901)))
+        await queue.put(FakeTask(5, "background-new", now))
+
+        order = [(await queue.get()).name for _ in range(3)]
+
+        assert order == ["background-old", "critical-new", "background-new"]
+
+    @pytest.mark.asyncio
+    async def test_earliest_deadline_first_across_priorities(self):
+        now = datetime.utcnow()
+        queue = PriorityDispatchQueue(priorities=[1, 3, 5], key=deadline_aware_key(AGING))
+        await queue.put(FakeTask(3, "normal", now))
+        await queue.put(FakeTask(5, "background-due-late", now, now + timedelta(seconds=30)))
+        await queue.put(FakeTask(5, "background-due-soon", now, now + timedelta(seconds=5)))
+
+        order = [(await queue.get()).name for _ in range(3)]
+
+        assert order == ["background-due-soon", "background-due-late", "normal"]
+
+
+class TestDeadlineMonitor:
+    """Escalation, expiry and miss-rate accounting."""
+
+    @pytest.mark.asyncio
+    async def test_escalates_then_expires_in_deadline_order(self):
+        events = []
+
+        async def escalate(task_id):
+            events.append(("escalate", task_id))
+
+        async def expire(task_id):
+            events.append(("expire", task_id))
+
+        monitor = DeadlineMonitor(escalate, expire, escalation_seconds=0.05)
+        await monitor.start()
+        try:
+            now = datetime.utcnow()
+            monitor.track("later", now + timedelta(seconds=0.2))
+            monitor.track("sooner", now + timedelta(seconds=0.1))
+            await asyncio.sleep(0.4)
+        finally:
+            await monitor.stop()
+
+        assert events == [
+            ("escalate", "sooner"), ("expire", "sooner"),
+            ("escalate", "later"), ("expire", "later"),
+        ]
+        assert monitor.pending_count == 0
+
+    def test_miss_rate_counts_missed_and_expired(self):
+        monitor = DeadlineMonitor(None, None)
+        deadline = datetime.utcnow()
+
+        assert monitor.record_completion(deadline, deadline - timedelta(seconds=1))
+        assert not monitor.record_completion(deadline, deadline + timedelta(seconds=1))
+        monitor.record_expired()
+        monitor.record_completion(deadline, deadline)
+
+        assert monitor.miss_rate == 0.5
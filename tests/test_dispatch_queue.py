@@ -0,0 +1,170 @@
+"""
+Tests for the orchestrator priority dispatch queue.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+
+import pytest
+
+from backend.orchestrator.dispatch_queue import PriorityDispatchQueue
+
+
+@dataclass
+class FakeTask:
+    priority: int
+    name: str = ""
+
+
+class TestPriorityDispatchQueue:
+    """Ordering, blocking and backpressure behaviour of the ready queue."""
+
+    @pytest.mark.asyncio
+    async def test_highest_priority_first_and_fifo_within_priority(self):
+        queue = PriorityDispatchQueue(priorities=[1, 2, 3])
+        await queue.put(FakeTask(3, "low-a"))
+        await queue.put(FakeTask(1, "critical"))
+        await queue.put(FakeTask(3, "low-b"))
+        await queue.put(FakeTask(2, "high"))
+
+        order = [(await queue.get()).name for _ in range(4)]
+
+        assert order == ["critical", "high", "low-a", "low-b"]
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_get_blocks_until_task_arrives(self):
+        queue = PriorityDispatchQueue(priorities=[1, 2, 3])
+        getter = asyncio.create_task(queue.get())
+
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+
+        await queue.put(FakeTask(2, "wake"))
+        task = await asyncio.wait_for(getter, timeout=1.0)
+
+        assert task.name == "wake"
+
+    @pytest.mark.asyncio
+    async def test_lane_capacity_and_put_timeout(self):
+        queue = PriorityDispatchQueue(priorities=[1, 2], maxsize_per_priority=1)
+        await queue.put(FakeTask(2))
+
+        assert queue.full(2)
+        assert not queue.full(1)
+        assert queue.maxsize == 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await queue.put(FakeTask(2), timeout=0.01)
+
+    @pytest.mark.asyncio
+    async def test_put_waits_for_space(self):
+        queue = PriorityDispatchQueue(priorities=[1], maxsize_per_priority=1)
+        await queue.put(FakeTask(1, "first"))
+        putter = asyncio.create_task(queue.put(FakeTask(1, "second"), timeout=1.0))
+
+        await asyncio.sleep(0.01)
+        assert (await queue.get()).name == "first"
+        await putter
+
+        assert queue.qsize_by_priority() == {1: 1}
+
+    @pytest.mark.asyncio
+    async def test_admission_skips_partitions_without_capacity(self):
+        queue = PriorityDispatchQueue(priorities=[1, 2], partition=lambda t: t.name.split("-")[0])
+        await queue.put(FakeTask(1, "review-urgent"))
+        await queue.put(FakeTask(2, "test-normal"))
+        capacity = {"review": 0, "test": 1}
+
+        def admit(task):
+            kind = task.name.split("-")[0]
+            if capacity[kind] == 0:
+                return None
+            capacity[kind] -= 1
+            return f"agent-{kind}"
+
+        task, grant = await queue.get_admitted(admit)
+
+        assert (task.name, grant) == ("test-normal", "agent-test")
+        assert queue.qsize_by_partition() == {"review": 1}
+
+    @pytest.mark.asyncio
+    async def test_admission_waits_for_capacity_signal(self):
+        queue = PriorityDispatchQueue(priorities=[1], partition=lambda t: t.name)
+        await queue.put(FakeTask(1, "review"))
+        free_slots = [0]
+
+        def admit(task):
+            if free_slots[0] == 0:
+                return None
+            free_slots[0] -= 1
+            return "agent"
+
+        getter = asyncio.create_task(queue.get_admitted(admit))
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+
+        free_slots[0] = 1
+        await queue.notify_capacity()
+        task, grant = await asyncio.wait_for(getter, timeout=1.0)
+
+        assert (task.name, grant) == ("review", "agent")
+        assert queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_remove_and_reprioritize_queued_tasks(self):
+        queue = PriorityDispatchQueue(priorities=[1, 2, 3])
+        tasks = [FakeTask(3, "low-a"), FakeTask(3, "low-b"), FakeTask(2, "high")]
+        for task in tasks:
+            await queue.put(task)
+
+        assert await queue.reprioritize(tasks[1], 1)
+        assert await queue.remove(tasks[2])
+        assert not await queue.remove(tasks[2])
+
+        assert queue.qsize_by_priority() == {1: 1, 2: 0, 3: 1}
+        assert [(await queue.get()).name for _ in range(2)] == ["low-b", "low-a"]
+
+    @pytest.mark.asyncio
+    async def test_rekey_reorders_queued_tasks_after_their_inputs_change(self):
+        tails = {"short": 1.0, "long": 2.0}
+        queue = PriorityDispatchQueue(
+            priorities=[1, 2, 3], key=lambda task: (task.priority, -tails[task.name])
+        )
+        tasks = [FakeTask(2, "short"), FakeTask(2, "long")]
+        for task in tasks:
+            await queue.put(task)
+
+        tails["short"] = 10.0
+        assert await queue.rekey([tasks[0], FakeTask(2, "unqueued")]) == 1
+
+        assert [(await queue.get()).name for _ in range(2)] == ["short", "long"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_rekeys_and_removals_keep_order_and_counts(self):
+        rng = random.Random(7)
+        tails = {}
+        queue = PriorityDispatchQueue(
+            priorities=[1, 2, 3], key=lambda task: (task.priority, -tails[task.name]),
+            partition=lambda task: task.name[0]
+        )
+        tasks = [FakeTask(rng.choice([1, 2, 3]), f"{'ab'[i % 2]}{i}") for i in range(60)]
+        for task in tasks:
+            tails[task.name] = rng.random()
+            await queue.put(task)
+
+        for _ in range(500):
+            task = rng.choice(tasks)
+            tails[task.name] = rng.random() * 10
+            await queue.rekey([task])
+        removed = tasks[::3]
+        for task in removed:
+            assert await queue.remove(task)
+
+        remaining = [task for task in tasks if task not in removed]
+        assert queue.qsize() == len(remaining)
+        assert queue.qsize_by_partition() == {"a": 20, "b": 20}
+        expected = sorted(remaining, key=lambda task: (task.priority, -tails[task.name]))
+        assert [await queue.get() for _ in remaining] == expected
+        assert queue.empty()
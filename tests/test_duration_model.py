@@ -0,0 +1,70 @@
+"""
+Tests for learned task duration estimates.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend.orchestrator.duration_model import P2Quantile, TaskDurationEstimator
+
+
+class TestP2Quantile:
+    """Streaming quantile accuracy."""
+
+    @pytest.mark.parametrize("quantile", [0.5, 0.95, 0.99])
+    def test_tracks_exact_quantile_of_skewed_stream(self, quantile):
+        rng = random.Random(3)
+        samples = [rng.lognormvariate(0, 1) for _ in range(20000)]
+        sketch = P2Quantile(quantile)
+        for sample in samples:
+            sketch.add(sample)
+
+        assert sketch.value() == pytest.approx(np.quantile(samples, quantile), rel=0.05)
+
+    def test_small_samples_use_exact_order_statistic(self):
+        sketch = P2Quantile(0.5)
+        assert sketch.value() is None
+        for sample in [5, 1, 3]:
+            sketch.add(sample)
+
+        assert sketch.value() == 3
+
+
+class TestTaskDurationEstimator:
+    """Per-type averages and fallbacks."""
+
+    def test_estimate_scales_learned_rate_by_complexity(self):
+        estimator = TaskDurationEstimator(alpha=0.5, default_seconds=30)
+        estimator.observe("testing", 10, complexity=2.0)
+        estimator.observe("testing", 20, complexity=2.0)
+
+        assert estimator.estimate("testing") == pytest.approx(7.5)
+        assert estimator.estimate("testing", complexity=4.0) == pytest.approx(30)
+
+    def test_unknown_types_fall_back_to_overall_then_default(self):
+        estimator = TaskDurationEstimator(default_seconds=30)
+        assert estimator.estimate("documentation", complexity=2.0) == 60
+
+        estimator.observe("testing", 4)
+        assert estimator.estimate("documentation") == 4
+
+    def test_agent_type_stream_preferred_once_observed(self):
+        estimator = TaskDurationEstimator(alpha=1.0)
+        estimator.observe("testing", 2, agent_type="tester")
+        estimator.observe("testing", 8, agent_type="code_generator")
+
+        assert estimator.estimate("testing", agent_type="tester") == 2
+        assert estimator.estimate("testing", agent_type="code_generator") == 8
+        assert estimator.estimate("testing", agent_type="planner") == 8
+
+    def test_quantile_requires_enough_samples(self):
+        estimator = TaskDurationEstimator(quantiles=(0.99,))
+        for duration in range(1, 101):
+            estimator.observe("testing", duration, agent_type="tester")
+
+        assert estimator.quantile("testing", 0.99, agent_type="tester", min_samples=200) is None
+        assert estimator.quantile("testing", 0.99, complexity=2.0, min_samples=100) == pytest.approx(198, rel=0.05)
+        with pytest.raises(ValueError):
+            estimator.quantile("testing", 0.5)
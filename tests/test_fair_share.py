@@ -0,0 +1,113 @@
+"""
+Tests for weighted fair sharing of DAG task slots.
+"""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from backend.scheduler.fair_share import FairShareScheduler
+
+
+async def contend(scheduler, runs, grants):
+    """Keep every run waiting for a slot and count who gets the next ``grants``"""
+    served = Counter()
+    waiters = []
+
+    async def worker(run_id):
+        while True:
+            await scheduler.acquire(run_id)
+            try:
+                served[run_id] += 1
+                await asyncio.sleep(0)
+            finally:
+                scheduler.release()
+
+    for run_id in runs:
+        for _ in range(3):
+            waiters.append(asyncio.create_task(worker(run_id)))
+    while sum(served.values()) < grants:
+        await asyncio.sleep(0)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    return served
+
+
+class TestFairShareScheduler:
+    """Slot grants in proportion to run weights."""
+
+    @pytest.mark.asyncio
+    async def test_slots_follow_priority_weights(self):
+        scheduler = FairShareScheduler(capacity=1)
+        scheduler.register("critical", priority=1)
+        scheduler.register("low", priority=4)
+
+        served = await contend(scheduler, ["critical", "low"], 900)
+
+        assert 7 <= served["critical"] / served["low"] <= 9
+        assert scheduler.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_tenant_share_is_split_across_its_runs(self):
+        scheduler = FairShareScheduler(capacity=2, tenant_weights={"a": 1.0, "b": 1.0})
+        scheduler.register("a-1", tenant="a")
+        scheduler.register("a-2", tenant="a")
+        scheduler.register("b-1", tenant="b")
+
+        served = await contend(scheduler, ["a-1", "a-2", "b-1"], 1200)
+
+        assert 0.9 <= (served["a-1"] + served["a-2"]) / served["b-1"] <= 1.1
+
+    @pytest.mark.asyncio
+    async def test_slot_granted_to_a_cancelled_waiter_is_passed_on(self):
+        scheduler = FairShareScheduler(capacity=1)
+        scheduler.register("a")
+        scheduler.register("b")
+        await scheduler.acquire("a")
+        first, second = (asyncio.create_task(scheduler.acquire("b")) for _ in range(2))
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        await asyncio.wait_for(second, timeout=1)
+
+        assert first.cancelled() and scheduler.in_use == 1
+        scheduler.release()
+        scheduler.unregister("b")
+        assert scheduler.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_claimed_slots_hold_back_grants_until_under_capacity(self):
+        scheduler = FairShareScheduler(capacity=1)
+        scheduler.register("a")
+        scheduler.register("b")
+        await scheduler.acquire("a")
+        scheduler.claim("b")
+        assert scheduler.in_use == 2
+
+        waiter = asyncio.create_task(scheduler.acquire("a"))
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.sleep(0)
+        assert not waiter.done() and scheduler.in_use == 1
+
+        scheduler.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert scheduler.in_use == 1 and scheduler.granted("b") == 1
+        scheduler.release()
+
+    @pytest.mark.asyncio
+    async def test_new_run_starts_level_with_the_least_served(self):
+        scheduler = FairShareScheduler(capacity=1)
+        scheduler.register("old")
+        for _ in range(50):
+            await scheduler.acquire("old")
+            scheduler.release()
+        scheduler.register("new")
+
+        served = await contend(scheduler, ["old", "new"], 100)
+
+        assert 0.8 <= served["new"] / served["old"] <= 1.25
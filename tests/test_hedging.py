@@ -0,0 +1,91 @@
+"""
+Tests for speculative execution of straggler tasks.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.orchestrator.hedging import run_hedged
+
+
+async def attempt(delay, result=None, error=None):
+    await asyncio.sleep(delay)
+    if error:
+        raise error
+    return result
+
+
+class AbandonRecorder:
+    """Records abandon callbacks as (label, still_running)."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, label, still_running):
+        self.calls.append((label, still_running))
+
+
+class TestRunHedged:
+    """First-success-wins execution with at most one hedge."""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_never_hedged(self):
+        abandon = AbandonRecorder()
+        started = []
+
+        outcome = await run_hedged(
+            "primary", attempt(0.01, "done"), timeout=1.0, abandon=abandon,
+            hedge_after=0.2, start_hedge=lambda: started.append(1)
+        )
+
+        assert (outcome.result, outcome.winner, outcome.hedged) == ("done", "primary", False)
+        assert started == [] and abandon.calls == []
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_straggler_is_cancelled(self):
+        abandon = AbandonRecorder()
+
+        outcome = await run_hedged(
+            "primary", attempt(5, "slow"), timeout=10, abandon=abandon,
+            hedge_after=0.02, start_hedge=lambda: ("hedge", attempt(0.01, "fast"))
+        )
+
+        assert (outcome.result, outcome.winner, outcome.hedged) == ("fast", "hedge", True)
+        assert abandon.calls == [("primary", True)]
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_leaves_primary_to_win(self):
+        abandon = AbandonRecorder()
+
+        outcome = await run_hedged(
+            "primary", attempt(0.1, "primary-result"), timeout=10, abandon=abandon,
+            hedge_after=0.02, start_hedge=lambda: ("hedge", attempt(0, error=RuntimeError("boom")))
+        )
+
+        assert (outcome.winner, outcome.losers) == ("primary", ["hedge"])
+        assert abandon.calls == [("hedge", False)]
+
+    @pytest.mark.asyncio
+    async def test_timeout_abandons_only_the_hedge(self):
+        abandon = AbandonRecorder()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await run_hedged(
+                "primary", attempt(5), timeout=0.1, abandon=abandon,
+                hedge_after=0.02, start_hedge=lambda: ("hedge", attempt(5))
+            )
+
+        assert abandon.calls == [("hedge", True)]
+
+    @pytest.mark.asyncio
+    async def test_primary_error_surfaces_when_no_hedge_can_start(self):
+        abandon = AbandonRecorder()
+
+        with pytest.raises(RuntimeError, match="agent failed"):
+            await run_hedged(
+                "primary", attempt(0.05, error=RuntimeError("agent failed")), timeout=1.0,
+                abandon=abandon, hedge_after=0.01, start_hedge=lambda: None
+            )
+
+        assert abandon.calls == []
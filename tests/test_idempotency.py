@@ -0,0 +1,82 @@
+"""
+Tests for the in-process idempotency-key cache.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.orchestrator.idempotency import IdempotencyCache
+
+
+class TestIdempotencyCache:
+    """Hits, expiry, bounds and in-flight deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_completed_key_is_served_from_cache(self):
+        cache = IdempotencyCache()
+        assert await cache.lookup("key") is None
+
+        cache.begin("key")
+        cache.complete("key", "task-1")
+
+        assert await cache.lookup("key") == "task-1"
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        cache = IdempotencyCache(ttl_seconds=10)
+        with patch("backend.orchestrator.idempotency.time.monotonic", return_value=100.0):
+            cache.put("key", "task-1")
+        with patch("backend.orchestrator.idempotency.time.monotonic", return_value=111.0):
+            assert await cache.lookup("key") is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = IdempotencyCache(max_entries=2)
+        cache.put("a", "task-a")
+        cache.put("b", "task-b")
+        await cache.lookup("a")
+        cache.put("c", "task-c")
+
+        assert await cache.lookup("b") is None
+        assert await cache.lookup("a") == "task-a"
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicate_waits_for_in_flight_submission(self):
+        cache = IdempotencyCache()
+        cache.begin("key")
+
+        duplicate = asyncio.create_task(cache.lookup("key"))
+        await asyncio.sleep(0)
+        assert not duplicate.done()
+
+        cache.complete("key", "task-1")
+        assert await asyncio.wait_for(duplicate, timeout=1.0) == "task-1"
+
+    @pytest.mark.asyncio
+    async def test_failed_submission_propagates_to_duplicates(self):
+        cache = IdempotencyCache()
+        cache.begin("key")
+        duplicate = asyncio.create_task(cache.lookup("key"))
+        await asyncio.sleep(0)
+
+        cache.abort("key", ConnectionError("db down"))
+
+        with pytest.raises(ConnectionError):
+            await duplicate
+        assert await cache.lookup("key") is None
+
+    @pytest.mark.asyncio
+    async def test_released_key_lets_duplicates_submit_themselves(self):
+        cache = IdempotencyCache()
+        cache.begin("key")
+        duplicate = asyncio.create_task(cache.lookup("key"))
+        await asyncio.sleep(0)
+
+        cache.release("key")
+
+        assert await asyncio.wait_for(duplicate, timeout=1.0) is None
+        assert await cache.lookup("key") is None
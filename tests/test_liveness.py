@@ -0,0 +1,157 @@
+"""
+Tests for heartbeat-driven agent liveness.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.orchestrator.liveness import LivenessMonitor, TimerWheel
+
+
+def advance(wheel, ticks):
+    expired = []
+    for _ in range(ticks):
+        expired.extend(wheel.advance())
+    return expired
+
+
+class TestTimerWheel:
+    """Arming, re-arming and expiry on the hashed wheel."""
+
+    def test_key_expires_on_its_tick(self):
+        wheel = TimerWheel(tick_seconds=1.0, num_slots=8)
+        wheel.arm("a", 3)
+
+        assert advance(wheel, 2) == []
+        assert wheel.advance() == ["a"]
+        assert "a" not in wheel
+
+    def test_rearm_postpones_and_cancel_removes(self):
+        wheel = TimerWheel(tick_seconds=1.0, num_slots=8)
+        wheel.arm("a", 3)
+        wheel.arm("b", 3)
+        advance(wheel, 2)
+        wheel.arm("a", 3)
+        wheel.cancel("b")
+
+        assert advance(wheel, 2) == []
+        assert wheel.advance() == ["a"]
+
+    def test_delays_longer_than_one_rotation(self):
+        wheel = TimerWheel(tick_seconds=0.5, num_slots=4)
+        wheel.arm("a", 7)
+
+        assert advance(wheel, 13) == []
+        assert wheel.advance() == ["a"]
+
+    def test_stale_entries_are_dropped_when_scanned(self):
+        wheel = TimerWheel(tick_seconds=1.0, num_slots=16)
+        for delay in range(1, 10):
+            wheel.arm("a", delay)
+
+        advance(wheel, 16)
+        assert sum(len(slot) for slot in wheel._slots) == 0
+
+
+class TestLivenessMonitor:
+    """Only lapsed agents are probed, concurrently and bounded."""
+
+    def make_monitor(self, probe, **kwargs):
+        events = []
+
+        async def on_alive(agent_id):
+            events.append(("alive", agent_id))
+
+        async def on_dead(agent_id):
+            events.append(("dead", agent_id))
+
+        kwargs.setdefault("heartbeat_timeout", 3)
+        monitor = LivenessMonitor(probe, on_alive, on_dead, tick_seconds=1.0, **kwargs)
+        return monitor, events
+
+    async def settle(self, monitor):
+        await asyncio.gather(*list(monitor._probes))
+
+    @pytest.mark.asyncio
+    async def test_heartbeating_agents_are_never_probed(self):
+        probed = []
+
+        async def probe(agent_id):
+            probed.append(agent_id)
+            return False
+
+        monitor, events = self.make_monitor(probe)
+        monitor.watch("healthy")
+        monitor.watch("silent")
+        for _ in range(5):
+            monitor.heartbeat("healthy")
+            monitor.tick()
+        await self.settle(monitor)
+
+        assert probed == ["silent"]
+        assert events == [("dead", "silent")]
+        assert monitor.heartbeat("silent") is True
+        assert monitor.dead_agents == set()
+
+    @pytest.mark.asyncio
+    async def test_lapsed_but_responsive_agent_stays_alive(self):
+        async def probe(agent_id):
+            return True
+
+        monitor, events = self.make_monitor(probe)
+        monitor.watch("quiet")
+        for _ in range(3):
+            monitor.tick()
+        await self.settle(monitor)
+
+        assert events == [("alive", "quiet")]
+
+    @pytest.mark.asyncio
+    async def test_hung_agents_are_probed_concurrently_with_a_bound(self):
+        in_flight = 0
+        peak = 0
+
+        async def probe(agent_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(10)
+            finally:
+                in_flight -= 1
+
+        monitor, events = self.make_monitor(probe, probe_timeout=0.05, max_concurrent_probes=8)
+        for i in range(32):
+            monitor.watch(f"agent-{i}")
+
+        start = time.perf_counter()
+        for _ in range(3):
+            monitor.tick()
+        await self.settle(monitor)
+        elapsed = time.perf_counter() - start
+
+        # Four waves of probe_timeout instead of 32 serial timeouts
+        assert peak == 8
+        assert len(events) == 32 and all(kind == "dead" for kind, _ in events)
+        assert elapsed < 32 * 0.05 / 2
+
+    @pytest.mark.asyncio
+    async def test_forgotten_agent_is_not_reported(self):
+        release = asyncio.Event()
+
+        async def probe(agent_id):
+            await release.wait()
+            return False
+
+        monitor, events = self.make_monitor(probe)
+        monitor.watch("leaving")
+        for _ in range(3):
+            monitor.tick()
+        await asyncio.sleep(0)
+        monitor.forget("leaving")
+        release.set()
+        await self.settle(monitor)
+
+        assert events == []
@@ -0,0 +1,55 @@
+"""
+Tests for the addressable priority queue used for DAG ready tasks.
+"""
+
+import random
+
+import pytest
+
+from backend.scheduler.priority_queue import IndexedPriorityQueue
+
+
+class TestIndexedPriorityQueue:
+    """Heap order maintained across pushes, updates and removals."""
+
+    def test_matches_a_sorted_reference_under_random_operations(self):
+        rng = random.Random(11)
+        queue = IndexedPriorityQueue()
+        reference = {}  # key -> (priority, insertion order)
+        order = 0
+
+        for _ in range(5000):
+            op = rng.random()
+            if op < 0.4 or not reference:
+                key = rng.randrange(300)
+                priority = rng.randint(0, 20)
+                queue.push(key, priority, value=f"v{key}")
+                if key in reference:
+                    reference[key] = (priority, reference[key][1])
+                else:
+                    reference[key] = (priority, order)
+                    order += 1
+            elif op < 0.6:
+                key = rng.choice(list(reference))
+                priority = rng.randint(0, 20)
+                queue.update(key, priority)
+                reference[key] = (priority, reference[key][1])
+            elif op < 0.75:
+                key = rng.choice(list(reference))
+                assert queue.remove(key) == f"v{key}"
+                del reference[key]
+            else:
+                expected = min(reference, key=reference.__getitem__)
+                key, priority, value = queue.pop()
+                assert (key, priority, value) == (expected, reference[expected][0], f"v{expected}")
+                del reference[key]
+            assert len(queue) == len(reference)
+
+    def test_equal_priorities_pop_in_insertion_order_without_comparing_values(self):
+        queue = IndexedPriorityQueue()
+        for key in "abc":
+            queue.push(key, 1.0, value=object())
+
+        assert [queue.pop()[0] for _ in range(3)] == ["a", "b", "c"]
+        with pytest.raises(IndexError):
+            queue.pop()
@@ -0,0 +1,100 @@
+"""
+Tests for bounded task result retention.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.orchestrator.retention import RESULT_KEY_PREFIX, ResultRetentionStore
+
+
+def make_store():
+    """Fake SharedMemoryStore backed by a dict."""
+    data = {}
+    store = MagicMock()
+
+    async def set_multiple(values, ttl=None):
+        data.update(values)
+        return True
+
+    async def get_multiple(keys):
+        return {k: data[k] for k in keys if k in data}
+
+    async def exists(key):
+        return key in data
+
+    store.set_multiple = AsyncMock(side_effect=set_multiple)
+    store.get_multiple = AsyncMock(side_effect=get_multiple)
+    store.exists = AsyncMock(side_effect=exists)
+    return store, data
+
+
+class TestResultRetentionStore:
+    """Eviction, spill and lookup fallback of finished task results."""
+
+    @pytest.mark.asyncio
+    async def test_oldest_results_spill_when_window_is_full(self):
+        store, data = make_store()
+        retention = ResultRetentionStore(store, max_entries=2)
+
+        for i in range(3):
+            retention.put(f"t{i}", {"value": i})
+        await retention.spill()
+
+        assert len(retention) == 2
+        assert data == {RESULT_KEY_PREFIX + "t0": {"value": 0}}
+        assert "t0" in retention
+        assert retention.total_recorded == 3
+
+    @pytest.mark.asyncio
+    async def test_lookup_falls_back_to_store(self):
+        store, data = make_store()
+        data[RESULT_KEY_PREFIX + "old"] = None
+        retention = ResultRetentionStore(store)
+
+        assert await retention.lookup("old") == (True, None)
+        assert await retention.lookup("unknown") == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_expired_results_are_evicted(self):
+        store, data = make_store()
+        retention = ResultRetentionStore(store, max_age_seconds=10)
+
+        with patch("backend.orchestrator.retention.time.monotonic", return_value=100.0):
+            retention.put("old", "a")
+        with patch("backend.orchestrator.retention.time.monotonic", return_value=105.0):
+            retention.put("new", "b")
+        with patch("backend.orchestrator.retention.time.monotonic", return_value=111.0):
+            retention.evict_expired()
+        await retention.spill()
+
+        assert retention.get("old") is None
+        assert retention.get("new") == "b"
+        assert RESULT_KEY_PREFIX + "old" in data
+
+    @pytest.mark.asyncio
+    async def test_spilled_index_is_bounded_and_store_answers_membership(self):
+        store, _ = make_store()
+        retention = ResultRetentionStore(store, max_entries=1, spilled_index_size=1)
+
+        for i in range(3):
+            retention.put(f"t{i}", i)
+            await retention.spill()
+
+        assert "t0" not in retention
+        assert await retention.is_finished("t0")
+        assert not await retention.is_finished("never-ran")
+
+    @pytest.mark.asyncio
+    async def test_store_failure_does_not_rebuffer(self):
+        store, _ = make_store()
+        store.set_multiple = AsyncMock(return_value=False)
+        retention = ResultRetentionStore(store, max_entries=1)
+
+        retention.put("t0", 0)
+        retention.put("t1", 1)
+        await retention.spill()
+
+        assert retention.get("t0") is None
+        assert "t0" in retention
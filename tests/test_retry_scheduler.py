@@ -0,0 +1,78 @@
+"""
+Tests for the delayed retry scheduler.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from backend.orchestrator.retry_scheduler import RetryScheduler
+
+
+class AsyncRecorder:
+    """Async requeue callback that records what it was given."""
+
+    def __init__(self, fail_on=()):
+        self.items = []
+        self.fail_on = set(fail_on)
+        self._changed = asyncio.Event()
+
+    async def __call__(self, item):
+        if item in self.fail_on:
+            raise RuntimeError("requeue failed")
+        self.items.append(item)
+        self._changed.set()
+
+    async def wait_for(self, count):
+        while len(self.items) < count:
+            self._changed.clear()
+            await self._changed.wait()
+
+
+class TestRetryScheduler:
+    """Backoff bounds and timer-driven requeueing."""
+
+    def test_backoff_is_jittered_within_cap(self):
+        scheduler = RetryScheduler(AsyncRecorder(), base_delay_seconds=1.0,
+                                   max_delay_seconds=8.0, rng=random.Random(1))
+
+        delays = [scheduler.backoff_delay(attempt) for attempt in range(1, 10) for _ in range(50)]
+
+        assert all(0 <= d <= 8.0 for d in delays)
+        assert max(scheduler.backoff_delay(1) for _ in range(50)) <= 2.0
+        assert len(set(delays)) > 1
+
+    @pytest.mark.asyncio
+    async def test_schedule_returns_immediately_and_requeues_in_due_order(self):
+        requeued = AsyncRecorder()
+        scheduler = RetryScheduler(requeued)
+        await scheduler.start()
+
+        try:
+            scheduler.schedule_after("late", 0.05)
+            scheduler.schedule_after("early", 0.01)
+            assert scheduler.pending_count == 2
+            assert requeued.items == []
+
+            await asyncio.wait_for(requeued.wait_for(2), timeout=1.0)
+        finally:
+            await scheduler.stop()
+
+        assert requeued.items == ["early", "late"]
+        assert scheduler.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_requeue_failure_does_not_stop_timer(self):
+        requeued = AsyncRecorder(fail_on={"bad"})
+        scheduler = RetryScheduler(requeued)
+        await scheduler.start()
+
+        try:
+            scheduler.schedule_after("bad", 0)
+            scheduler.schedule_after("good", 0.01)
+            await asyncio.wait_for(requeued.wait_for(1), timeout=1.0)
+        finally:
+            await scheduler.stop()
+
+        assert requeued.items == ["good"]
@@ -0,0 +1,252 @@
+"""
+Tests for sharded orchestrator routing and cross-shard dependencies.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from backend.orchestrator.sharding import (
+    ConsistentHashRing, ShardRouter, ShardWorker, ShardedAgentManager, _merge_statistics,
+)
+from backend.orchestrator.task_dag import TaskDAG
+
+
+class FakeResults(dict):
+    """Finished results with the retention store's lookup API."""
+
+    async def lookup(self, task_id):
+        return task_id in self, self.get(task_id)
+
+
+class FakeShardManager:
+    """Completes each task as soon as it is ready, unless its payload holds it."""
+
+    def __init__(self, shard_id=0):
+        self.shard_id = shard_id
+        self.task_dag = TaskDAG()
+        self.pending_tasks = {}
+        self.completed_tasks = FakeResults()
+        self.agents = {}
+        self._listeners = []
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def add_task_finished_listener(self, listener):
+        self._listeners.append(listener)
+
+    async def submit_task(self, task_type, payload, dependencies=None, task_id=None, **kwargs):
+        self.pending_tasks[task_id] = payload
+        self.task_dag.add_task(task_id)
+        for dep_id in dependencies or []:
+            if dep_id in self.task_dag or dep_id not in self.completed_tasks:
+                self.task_dag.add_dependency(dep_id, task_id)
+        if self.task_dag.is_ready(task_id):
+            self._run(task_id)
+        return task_id
+
+    async def mark_external_task_finished(self, task_id, succeeded):
+        if task_id not in self.task_dag or task_id in self.pending_tasks:
+            return
+        for ready_id in self.task_dag.mark_finished(task_id, succeeded):
+            self._run(ready_id)
+
+    async def register_agent(self, agent_type, capabilities, **kwargs):
+        agent_id = str(uuid.uuid4())
+        self.agents[agent_id] = agent_type
+        return agent_id
+
+    async def get_task_status(self, task_id):
+        if task_id in self.completed_tasks:
+            return {"task_id": task_id, "status": "completed", "shard": self.shard_id}
+        if task_id in self.pending_tasks:
+            return {"task_id": task_id, "status": "pending", "shard": self.shard_id}
+        return None
+
+    def get_system_statistics(self):
+        return {
+            "tasks": {"pending": len(self.pending_tasks), "completed": len(self.completed_tasks)},
+            "performance": {"critical_path_length": self.shard_id, "load_shedding_active": False},
+        }
+
+    def finish(self, task_id, succeeded=True):
+        del self.pending_tasks[task_id]
+        self.completed_tasks[task_id] = {"shard": self.shard_id} if succeeded else {"error": "failed"}
+        ready = self.task_dag.mark_finished(task_id, succeeded)
+        for listener in self._listeners:
+            listener(task_id, succeeded)
+        for ready_id in ready:
+            self._run(ready_id)
+
+    def _run(self, task_id):
+        if task_id in self.pending_tasks and not self.pending_tasks[task_id].get("hold"):
+            self.finish(task_id)
+
+
+class TestConsistentHashRing:
+    """Key placement on the hash ring."""
+
+    def test_keys_spread_across_shards(self):
+        ring = ConsistentHashRing(range(4))
+        counts = [0] * 4
+        for i in range(4000):
+            counts[ring.shard_for(f"task-{i}")] += 1
+
+        assert min(counts) > 700
+
+    def test_adding_a_shard_only_moves_its_share_of_keys(self):
+        keys = [f"task-{i}" for i in range(4000)]
+        ring = ConsistentHashRing(range(4))
+        before = {key: ring.shard_for(key) for key in keys}
+
+        ring.add_shard(4)
+        moved = [key for key in keys if ring.shard_for(key) != before[key]]
+
+        assert all(ring.shard_for(key) == 4 for key in moved)
+        assert len(moved) < len(keys) * 0.3
+
+
+class TestShardRouter:
+    """Task, DAG and agent placement."""
+
+    def test_dependency_chain_follows_its_root(self):
+        router = ShardRouter(8)
+        root_shard = router.route("root")
+
+        assert router.route("child", ["root"]) == root_shard
+        assert router.route("grandchild", ["child"]) == root_shard
+        assert router.root_of("grandchild") == "root"
+
+    def test_task_id_keying_ignores_dependencies(self):
+        router = ShardRouter(8, shard_key="task_id")
+        router.route("root")
+
+        assert router.route("child", ["root"]) == router.ring.shard_for("child")
+
+    def test_remote_dependencies_grouped_by_owner(self):
+        router = ShardRouter(2, shard_key="task_id")
+        roots = [f"root-{i}" for i in range(20)]
+        for root in roots:
+            router.route(root)
+        local = next(r for r in roots if router.shard_of(r) == 0)
+        remote = next(r for r in roots if router.shard_of(r) == 1)
+
+        assert router.remote_dependencies(0, [local, remote, "forgotten"]) == {
+            1: [remote], None: ["forgotten"]
+        }
+
+    def test_agents_balanced_per_type(self):
+        router = ShardRouter(3)
+        placed = []
+        for i in range(6):
+            agent_type = "tester" if i % 2 else "planner"
+            shard = router.assign_agent(agent_type)
+            router.add_agent(f"agent-{i}", agent_type, shard)
+            placed.append((agent_type, shard))
+
+        assert sorted(s for t, s in placed if t == "tester") == [0, 1, 2]
+        assert sorted(s for t, s in placed if t == "planner") == [0, 1, 2]
+        assert router.remove_agent("agent-1") == placed[1][1]
+
+
+class TestShardWorker:
+    """Serving router messages against a shard's manager."""
+
+    @pytest.mark.asyncio
+    async def test_watched_task_reports_when_it_finishes(self):
+        sent = []
+        manager = FakeShardManager()
+        worker = ShardWorker(0, manager, sent.extend)
+        await manager.submit_task("testing", {"hold": True}, task_id="upstream")
+
+        worker.handle(("watch", "upstream", 3))
+        await worker.drain()
+        assert sent == []
+
+        manager.finish("upstream")
+        await worker.drain()
+        assert sent == [("finished", "upstream", True, [3])]
+
+    @pytest.mark.asyncio
+    async def test_watch_on_finished_task_reports_immediately(self):
+        sent = []
+        manager = FakeShardManager()
+        worker = ShardWorker(0, manager, sent.extend)
+        await manager.submit_task("testing", {}, task_id="upstream")
+        manager.completed_tasks["failed"] = {"error": "boom"}
+
+        worker.handle(("watch", "upstream", 1))
+        worker.handle(("watch", "failed", 2))
+        worker.handle(("watch", "unknown", 2))
+        await worker.drain()
+
+        assert sorted(sent) == [("finished", "failed", False, [2]), ("finished", "upstream", True, [1])]
+
+    @pytest.mark.asyncio
+    async def test_calls_reply_and_reject_unserved_methods(self):
+        sent = []
+        worker = ShardWorker(0, FakeShardManager(), sent.extend)
+
+        worker.handle(("call", 1, "submit_task", ("testing", {}), {"task_id": "t1"}))
+        worker.handle(("call", 2, "finish", ("t1",), {}))
+        await worker.drain()
+
+        assert sent[0] == ("reply", 1, True, "t1")
+        assert sent[1][:3] == ("reply", 2, False)
+        assert isinstance(sent[1][3], ValueError)
+
+
+class TestMergeStatistics:
+    """Combining per-shard statistics."""
+
+    def test_miss_rate_recomputed_from_summed_counts(self):
+        shard_stats = [
+            {"performance": {"deadline_miss_rate": 0.75, "deadlines_met": 1, "deadlines_missed": 3}},
+            {"performance": {"deadline_miss_rate": 0.5, "deadlines_met": 4, "deadlines_missed": 4}},
+            {"performance": {"deadline_miss_rate": 0.0, "deadlines_met": 0, "deadlines_missed": 0}},
+        ]
+
+        performance = _merge_statistics(shard_stats)["performance"]
+
+        assert performance["deadlines_met"] == 5
+        assert performance["deadlines_missed"] == 7
+        assert performance["deadline_miss_rate"] == pytest.approx(7 / 12)
+
+
+def fake_shard_manager(shard_id):
+    return FakeShardManager(shard_id)
+
+
+class TestShardedAgentManager:
+    """End to end over worker processes."""
+
+    @pytest.mark.asyncio
+    async def test_cross_shard_dependency_unblocks_dependant(self):
+        manager = ShardedAgentManager(fake_shard_manager, num_shards=2, shard_key="dag_root")
+        await asyncio.wait_for(manager.initialize(), timeout=60)
+        try:
+            roots = [await manager.submit_task("testing", {}) for _ in range(20)]
+            on_first = next(r for r in roots if manager.router.shard_of(r) == 0)
+            on_second = next(r for r in roots if manager.router.shard_of(r) == 1)
+
+            join_id = await manager.submit_task("testing", {}, dependencies=[on_first, on_second])
+            assert manager.router.shard_of(join_id) == 0
+
+            for _ in range(200):
+                status = await manager.get_task_status(join_id)
+                if status["status"] == "completed":
+                    break
+                await asyncio.sleep(0.05)
+            assert status == {"task_id": join_id, "status": "completed", "shard": 0}
+
+            stats = await manager.get_system_statistics()
+            assert stats["tasks"]["completed"] == 21
+            assert stats["performance"]["critical_path_length"] == 1
+            assert sum(stats["shards"]["completed_by_shard"]) == 21
+        finally:
+            await asyncio.wait_for(manager.shutdown(), timeout=60)
@@ -0,0 +1,100 @@
+"""
+Tests for the batched dispatch stage.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.orchestrator.batching import TaskBatcher
+
+
+class RecordingDispatch:
+    """Fake batched RPC that echoes results for every task it receives."""
+
+    def __init__(self, drop=(), error=None):
+        self.calls = []
+        self.drop = set(drop)
+        self.error = error
+
+    async def __call__(self, agent_id, task_type, requests):
+        self.calls.append((agent_id, task_type, [r['task_id'] for r in requests]))
+        if self.error:
+            raise self.error
+        return {r['task_id']: {'task_id': r['task_id'], 'success': True}
+                for r in requests if r['task_id'] not in self.drop}
+
+
+def request(task_id):
+    return {'task_id': task_id, 'task_type': 'code_review', 'payload': {}}
+
+
+class TestTaskBatcher:
+    """Grouping, flushing and demultiplexing of batched dispatches."""
+
+    @pytest.mark.asyncio
+    async def test_same_agent_and_type_share_one_call(self):
+        dispatch = RecordingDispatch()
+        batcher = TaskBatcher(dispatch, window_seconds=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit("agent-1", "code_review", request("t1")),
+            batcher.submit("agent-1", "code_review", request("t2")),
+            batcher.submit("agent-2", "code_review", request("t3")),
+        )
+
+        assert [r['task_id'] for r in results] == ["t1", "t2", "t3"]
+        assert sorted(dispatch.calls) == [
+            ("agent-1", "code_review", ["t1", "t2"]),
+            ("agent-2", "code_review", ["t3"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting_for_window(self):
+        dispatch = RecordingDispatch()
+        batcher = TaskBatcher(dispatch, max_batch_size=2, window_seconds=10)
+
+        await asyncio.wait_for(asyncio.gather(
+            batcher.submit("agent-1", "code_review", request("t1")),
+            batcher.submit("agent-1", "code_review", request("t2")),
+        ), timeout=1.0)
+
+        assert dispatch.calls == [("agent-1", "code_review", ["t1", "t2"])]
+
+    @pytest.mark.asyncio
+    async def test_missing_result_fails_only_that_task(self):
+        batcher = TaskBatcher(RecordingDispatch(drop={"t2"}), window_seconds=0.001)
+
+        results = await asyncio.gather(
+            batcher.submit("agent-1", "code_review", request("t1")),
+            batcher.submit("agent-1", "code_review", request("t2")),
+            return_exceptions=True,
+        )
+
+        assert results[0]['task_id'] == "t1"
+        assert isinstance(results[1], RuntimeError)
+
+    @pytest.mark.asyncio
+    async def test_rpc_error_fails_every_task_in_batch(self):
+        batcher = TaskBatcher(RecordingDispatch(error=ConnectionError("agent down")),
+                              window_seconds=0.001)
+
+        results = await asyncio.gather(
+            batcher.submit("agent-1", "code_review", request("t1")),
+            batcher.submit("agent-1", "code_review", request("t2")),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_timed_out_caller_is_dropped_from_batch(self):
+        dispatch = RecordingDispatch()
+        batcher = TaskBatcher(dispatch, window_seconds=0.02)
+
+        waiting = asyncio.create_task(batcher.submit("agent-1", "code_review", request("t2")))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit("agent-1", "code_review", request("t1")), timeout=0.001)
+        await waiting
+
+        assert dispatch.calls == [("agent-1", "code_review", ["t2"])]
@@ -0,0 +1,136 @@
+"""
+Tests for the task dependency DAG.
+"""
+
+import random
+
+import networkx as nx
+import pytest
+
+from backend.orchestrator.task_dag import TaskDAG
+
+
+def build_dag(edges, durations=None):
+    dag = TaskDAG()
+    nodes = {n for edge in edges for n in edge}
+    for node in sorted(nodes):
+        dag.add_task(node, (durations or {}).get(node, 1.0))
+    for from_task, to_task in edges:
+        dag.add_dependency(from_task, to_task)
+    return dag
+
+
+class TestTaskDAGReadiness:
+    """Incremental readiness tracking."""
+
+    def test_task_becomes_ready_when_last_dependency_succeeds(self):
+        dag = build_dag([("a", "c"), ("b", "c")])
+        assert dag.ready == {"a", "b"}
+
+        assert dag.mark_finished("a") == []
+        assert dag.mark_finished("b") == ["c"]
+        assert dag.is_ready("c")
+
+    def test_failed_dependency_keeps_dependants_blocked(self):
+        dag = build_dag([("a", "b")])
+
+        assert dag.mark_finished("a", succeeded=False) == []
+        assert not dag.is_ready("b")
+        assert dag.should_cancel_descendants("a") == {"b"}
+
+    def test_dependency_on_finished_task_is_satisfied(self):
+        dag = build_dag([])
+        dag.add_task("a")
+        dag.mark_finished("a")
+        dag.add_task("b")
+        dag.add_dependency("a", "b")
+
+        assert dag.is_ready("b")
+
+    def test_cycle_is_rejected(self):
+        dag = build_dag([("a", "b"), ("b", "c")])
+
+        with pytest.raises(ValueError):
+            dag.add_dependency("c", "a")
+        assert dag.descendants("a") == {"b", "c"}
+
+
+class TestTaskDAGPaths:
+    """Levels and critical path maintained as the DAG grows."""
+
+    def test_levels_and_critical_path(self):
+        dag = build_dag([("a", "b"), ("b", "d"), ("a", "c"), ("c", "d")],
+                        durations={"a": 1, "b": 5, "c": 2, "d": 1})
+
+        assert dag.get_parallelizable_tasks() == [{"a"}, {"b", "c"}, {"d"}]
+        assert dag.get_critical_path() == (["a", "b", "d"], 7)
+        assert dag.earliest_start("d") == 6
+
+    def test_critical_path_matches_full_recomputation(self):
+        rng = random.Random(7)
+        nodes = [f"t{i}" for i in range(200)]
+        durations = {n: rng.uniform(0.5, 5) for n in nodes}
+        edges = [(nodes[i], nodes[j]) for j in range(len(nodes)) for i in range(j)
+                 if rng.random() < 0.02]
+        dag = build_dag(edges, durations)
+        for node in nodes:
+            dag.add_task(node, durations[node])
+
+        graph = nx.DiGraph(edges)
+        graph.add_nodes_from(nodes)
+        for u, v in graph.edges:
+            graph[u][v]["weight"] = durations[u]
+        path = nx.dag_longest_path(graph)
+        expected = nx.dag_longest_path_length(graph) + durations[path[-1]]
+
+        assert dag.get_critical_path_length() == pytest.approx(expected)
+
+    def test_slack_is_zero_on_the_critical_path(self):
+        dag = build_dag([("a", "b"), ("b", "d"), ("a", "c"), ("c", "d")],
+                        durations={"a": 1, "b": 5, "c": 2, "d": 1})
+
+        assert [dag.tail_length(n) for n in "abcd"] == [7, 6, 3, 1]
+        assert [dag.slack(n) for n in "abd"] == [0, 0, 0]
+        assert dag.latest_start("c") == 4
+        assert dag.slack("c") == 3
+
+    def test_tail_grows_when_work_is_added_downstream(self):
+        dag = build_dag([("a", "b")], durations={"a": 1, "b": 1})
+        dag.add_dependency("b", "late")
+        dag.add_task("late", 10)
+
+        assert dag.tail_length("a") == 12
+        assert dag.slack("a") == 0
+
+    def test_adding_work_reports_ancestors_whose_tail_grew(self):
+        dag = build_dag([("a", "b"), ("x", "y")])
+
+        assert sorted(dag.add_dependency("b", "c")) == ["a", "b"]
+        assert sorted(dag.add_task("c", 5)) == ["a", "b"]
+        assert dag.add_dependency("b", "c") == []
+
+
+class TestTaskDAGCollection:
+    """Garbage collection of finished nodes."""
+
+    def test_upstream_node_kept_until_last_dependant_finishes(self):
+        dag = build_dag([("parent", "a"), ("parent", "b")])
+        dag.mark_finished("parent")
+        assert dag.collect_finished("parent") == []
+
+        dag.mark_finished("a")
+        assert dag.collect_finished("a") == ["a"]
+        assert "parent" in dag
+
+        dag.mark_finished("b")
+        assert sorted(dag.collect_finished("b")) == ["b", "parent"]
+        assert len(dag) == 0
+        assert dag.task_durations == {}
+        assert dag.get_critical_path() == ([], 0)
+
+    def test_unfinished_task_is_never_collected(self):
+        dag = build_dag([])
+        dag.add_task("running")
+
+        assert dag.collect_finished("running") == []
+        assert "running" in dag
@@ -0,0 +1,135 @@
+"""
+Tests for the write-behind task state journal.
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.orchestrator.task_journal import INSERT_TASKS_BATCH_SQL, TaskStateJournal
+
+
+def make_pool(existing_keys=None):
+    """
+    Fake asyncpg pool whose connection records writes.
+
+    ``existing_keys`` maps idempotency keys to task ids already in the table;
+    batch inserts for those keys are skipped as ON CONFLICT would.
+    """
+    existing_keys = existing_keys or {}
+
+    async def fetch(statement, *args):
+        if statement == INSERT_TASKS_BATCH_SQL:
+            task_ids, keys = args[0], args[1]
+            return [{'task_id': t} for t, k in zip(task_ids, keys) if k not in existing_keys]
+        return [{'task_id': uuid.UUID(existing_keys[k]), 'idempotency_key': k}
+                for k in args[0] if k in existing_keys]
+
+    conn = MagicMock()
+    conn.executemany = AsyncMock()
+    conn.execute = AsyncMock()
+    conn.fetch = AsyncMock(side_effect=fetch)
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    @asynccontextmanager
+    async def acquire():
+        yield conn
+
+    conn.transaction = transaction
+    pool = MagicMock()
+    pool.acquire = acquire
+    return pool, conn
+
+
+class TestTaskStateJournal:
+    """Batching, coalescing and durability modes of the journal."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced_per_task(self):
+        pool, conn = make_pool()
+        journal = TaskStateJournal(pool)
+        task_id = str(uuid.uuid4())
+
+        await journal.update_task(task_id, sync=False, status='assigned')
+        await journal.update_task(task_id, sync=False, status='completed', error=None)
+        await journal.flush()
+
+        assert conn.executemany.await_count == 1
+        statement, rows = conn.executemany.await_args.args
+        assert statement == "UPDATE tasks SET status = $1, error = $2 WHERE task_id = $3"
+        assert rows == [('completed', None, uuid.UUID(task_id))]
+
+    @pytest.mark.asyncio
+    async def test_inserts_flush_before_updates_in_one_batch(self):
+        pool, conn = make_pool()
+        journal = TaskStateJournal(pool)
+        task_ids = [str(uuid.uuid4()) for _ in range(3)]
+
+        for task_id in task_ids:
+            await journal.insert_task(task_id, None, 'pending', datetime.utcnow(), sync=False)
+        await journal.update_task(task_ids[0], sync=False, status='assigned')
+        await journal.flush()
+
+        # One unnest statement carries all rows, column by column
+        statement, *columns = conn.fetch.await_args_list[0].args
+        assert statement == INSERT_TASKS_BATCH_SQL
+        assert columns[0] == [uuid.UUID(t) for t in task_ids]
+        assert "UPDATE tasks" in conn.executemany.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_sync_insert_waits_for_size_triggered_flush(self):
+        pool, conn = make_pool()
+        journal = TaskStateJournal(pool, max_batch_size=2, flush_interval_seconds=10)
+        await journal.start()
+
+        try:
+            writes = [
+                journal.insert_task(str(uuid.uuid4()), f"key-{i}", 'pending', datetime.utcnow())
+                for i in range(2)
+            ]
+            await asyncio.wait_for(asyncio.gather(*writes), timeout=1.0)
+        finally:
+            await journal.stop()
+
+        assert conn.fetch.await_count == 1
+        assert journal.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_duplicate_idempotency_key_resolves_to_existing_task(self):
+        existing_id = str(uuid.uuid4())
+        pool, conn = make_pool(existing_keys={'dup-key': existing_id})
+        journal = TaskStateJournal(pool, max_batch_size=2, flush_interval_seconds=10)
+        await journal.start()
+
+        try:
+            new_id = str(uuid.uuid4())
+            other_id = str(uuid.uuid4())
+            owners = await asyncio.wait_for(asyncio.gather(
+                journal.insert_task(new_id, 'dup-key', 'pending', datetime.utcnow()),
+                journal.insert_task(other_id, 'fresh-key', 'pending', datetime.utcnow()),
+            ), timeout=1.0)
+        finally:
+            await journal.stop()
+
+        assert owners == [existing_id, other_id]
+
+    @pytest.mark.asyncio
+    async def test_connection_failure_keeps_async_writes(self):
+        pool, conn = make_pool()
+        conn.executemany.side_effect = [ConnectionError("db down"), None]
+        journal = TaskStateJournal(pool)
+        task_id = str(uuid.uuid4())
+
+        await journal.update_task(task_id, sync=False, status='assigned')
+        await journal.flush()
+        assert journal.pending_count == 1
+
+        await journal.flush()
+        assert journal.pending_count == 0